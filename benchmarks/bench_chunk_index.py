@@ -0,0 +1,72 @@
+"""
+Chunk Index Benchmark
+======================
+Tìm chunk theo heading: glob + đọc từng file chunk cho đến khi gặp heading,
+so với ChunkIndex (chunks.json + chunks.store, 1 lần tra dict + 1 lần seek).
+
+Usage:
+    python -m benchmarks.bench_chunk_index [--chunks 3000] [--lookups 200]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from function1.parsers.ir import Block, BlockType, Run, Section
+from function1.processors.chunk_writer import ChunkIndex, ChunkWriter
+
+SENTENCE = "Kết quả thực nghiệm cho thấy phương pháp đề xuất ổn định. "
+
+
+def make_chunks(count: int):
+    return [Section(title=f"Mục {i}", level=2, metadata={"page": i // 3}, blocks=[
+        Block(type=BlockType.PARAGRAPH, runs=[Run(SENTENCE * 60)])
+    ]) for i in range(count)]
+
+
+def scan(folder: Path, title: str) -> str:
+    """Cách cũ: đọc lần lượt các file chunk, so dòng tiêu đề"""
+    header = f"## {title}\n"
+    for path in sorted(folder.glob("chunk_*.md")):
+        text = path.read_text(encoding="utf-8")
+        if text.startswith(header):
+            return text
+    raise KeyError(title)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chunks", type=int, default=3000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    titles = [f"Mục {rng.randrange(args.chunks)}" for _ in range(args.lookups)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        with ChunkWriter(tmp, store=True) as writer:
+            for chunk in make_chunks(args.chunks):
+                writer.write(chunk)
+        
+        print(f"📊 {args.chunks} chunks, {args.lookups} lookups")
+        start = time.perf_counter()
+        expected = [scan(folder, title) for title in titles]
+        scanned = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        index = ChunkIndex(tmp)
+        loaded = time.perf_counter() - start
+        found = [index.read(title) for title in titles]
+        indexed = time.perf_counter() - start
+        
+        assert found == expected
+        print(f"{'glob + read':<14} {scanned:8.3f}s  {scanned * 1e3 / args.lookups:8.3f} ms/lookup")
+        print(f"{'ChunkIndex':<14} {indexed:8.3f}s  {(indexed - loaded) * 1e3 / args.lookups:8.3f} "
+              f"ms/lookup (+ {loaded * 1e3:.1f} ms to load index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Chunk Packing Benchmark
+========================
+Document có nhiều mục ngắn xen vài mục dài (split_level=2): so sánh phân bố
+kích thước chunk khi mỗi heading 1 chunk và khi gom theo --pack-target.
+
+Usage:
+    python -m benchmarks.bench_chunk_packing [--sections 2000] [--target 4000]
+"""
+
+import argparse
+import random
+import time
+
+from function1.parsers.ir import Block, BlockType, Document, Run, Section
+from function1.processors.splitter import Splitter
+
+SENTENCE = "Kết quả thực nghiệm cho thấy phương pháp đề xuất ổn định. "
+
+
+def make_document(sections: int, seed: int = 0) -> Document:
+    """Mỗi chương 10 mục; 80% mục chỉ 1-3 câu, còn lại 20-150 câu"""
+    rng = random.Random(seed)
+    chapters = []
+    for c in range(sections // 10):
+        blocks = []
+        for m in range(10):
+            blocks.append(Block(type=BlockType.HEADING, level=2, runs=[Run(f"Mục {c + 1}.{m + 1}")]))
+            count = rng.randint(1, 3) if rng.random() < 0.8 else rng.randint(20, 150)
+            blocks.append(Block(type=BlockType.PARAGRAPH, runs=[Run(SENTENCE * count)]))
+        chapters.append(Section(title=f"Chương {c + 1}", level=1, blocks=blocks))
+    return Document(sections=chapters)
+
+
+def distribution(sizes):
+    sizes = sorted(sizes)
+    return (len(sizes), sizes[0], sizes[len(sizes) // 2], sizes[len(sizes) * 9 // 10], sizes[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--target", type=int, default=4000)
+    parser.add_argument("--max-chars", type=int, default=6000)
+    args = parser.parse_args()
+    
+    document = make_document(args.sections)
+    print(f"📊 {args.sections} sections, target {args.target}, max {args.max_chars} chars")
+    print(f"{'mode':<12} {'chunks':>7} {'min':>6} {'median':>7} {'p90':>6} {'max':>6} {'time':>8}")
+    for target in (0, args.target):
+        splitter = Splitter(split_level=2, max_chars=args.max_chars, pack_target=target)
+        start = time.perf_counter()
+        chunks = splitter.split(document)
+        elapsed = time.perf_counter() - start
+        stats = distribution([len(chunk.to_markdown()) for chunk in chunks])
+        label = f"pack {target}" if target else "per heading"
+        print(f"{label:<12} {stats[0]:>7} {stats[1]:>6} {stats[2]:>7} {stats[3]:>6} "
+              f"{stats[4]:>6} {elapsed:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
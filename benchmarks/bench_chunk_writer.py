@@ -0,0 +1,69 @@
+"""
+Chunk Writer Benchmark
+=======================
+Ghi N chunks: save_chunk tuần tự (ghi lại mọi file) so với ChunkWriter lần
+đầu, chạy lại không đổi gì, và chạy lại khi 1% chunk thay đổi.
+
+Usage:
+    python -m benchmarks.bench_chunk_writer [--chunks 3000] [--workers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from function1.parsers.ir import Block, BlockType, Run, Section
+from function1.processors.chunk_writer import ChunkWriter
+from function1.processors.splitter import Splitter
+
+SENTENCE = "Kết quả thực nghiệm cho thấy phương pháp đề xuất ổn định. "
+
+
+def make_chunks(count: int, edited=()):
+    return [Section(title=f"Mục {i}", level=2, blocks=[
+        Block(type=BlockType.PARAGRAPH, runs=[Run(SENTENCE * 60 + ("(sửa)" if i in edited else ""))])
+    ]) for i in range(count)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chunks", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    chunks = make_chunks(args.chunks)
+    edited = make_chunks(args.chunks, edited=set(range(0, args.chunks, 100)))
+    splitter = Splitter()
+    
+    def save_each(folder):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i, chunk in enumerate(chunks, 1):
+                splitter.save_chunk(chunk, folder, i)
+    
+    def write(folder, sections):
+        with ChunkWriter(folder, workers=args.workers) as writer:
+            for chunk in sections:
+                writer.write(chunk)
+        return writer.counts
+    
+    print(f"📊 {args.chunks} chunks, {args.workers} workers")
+    with tempfile.TemporaryDirectory() as old, tempfile.TemporaryDirectory() as new:
+        elapsed, _ = timed(lambda: save_each(old))
+        print(f"{'save_chunk loop':<22} {elapsed:7.3f}s  (rewrites every file)")
+        for label, sections in (("ChunkWriter first run", chunks),
+                                ("ChunkWriter rerun", chunks),
+                                ("ChunkWriter 1% edited", edited)):
+            elapsed, counts = timed(lambda: write(new, sections))
+            print(f"{label:<22} {elapsed:7.3f}s  {counts}")
+
+
+if __name__ == "__main__":
+    main()
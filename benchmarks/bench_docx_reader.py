@@ -0,0 +1,51 @@
+"""
+DOCX Reader Benchmark
+======================
+So sánh DOCXParser reader="python-docx" và reader="stream" trên DOCX lớn.
+
+Usage:
+    python -m benchmarks.bench_docx_reader [--pages 300] [--tables-every 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_docx
+from function1.parsers.docx_parser import DOCXParser
+
+
+def best_time(path: str, reader: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = DOCXParser(reader=reader).parse(path)
+        best = min(best, time.perf_counter() - start)
+    return best, document
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--tables-every", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_docx(os.path.join(tmp, "thesis.docx"), pages=args.pages,
+                         tables_every=args.tables_every)
+        size = os.path.getsize(path)
+        results = {reader: best_time(path, reader, args.repeat)
+                   for reader in ("python-docx", "stream")}
+    
+    baseline, reference = results["python-docx"]
+    print(f"📊 {args.pages} pages, {size / 1e6:.1f} MB, "
+          f"{reference.get_total_blocks()} blocks")
+    for reader, (elapsed, document) in results.items():
+        same = "same IR" if document == reference else "IR DIFFERS"
+        print(f"{reader:<12} {elapsed:7.3f}s  {baseline / elapsed:5.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+DOCX Style Lookup Benchmark
+============================
+So sánh tra para.style / run.font của python-docx cho từng paragraph với
+StyleResolver (tính mỗi style 1 lần, memoize).
+
+Usage:
+    python -m benchmarks.bench_docx_styles [--pages 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import docx
+
+from benchmarks.synthetic import make_docx
+from function1.parsers.docx_styles import StyleResolver
+
+
+def python_docx_lookups(document) -> int:
+    """Cách cũ: para.style.name (dò styles part mỗi lần) và run.font.*"""
+    count = 0
+    for para in document.paragraphs:
+        _ = para.style.name if para.style else ""
+        for run in para.runs:
+            _ = (run.bold, run.italic, run.font.name, run.font.size)
+            count += 1
+    return count
+
+
+def resolver_lookups(document) -> int:
+    """StyleResolver: định dạng hiệu lực (gồm cả kế thừa) với 1 lần tra dict"""
+    styles = StyleResolver.from_docx(document)
+    count = 0
+    for para in document.paragraphs:
+        fmt = styles.paragraph(para._p)
+        for run in para.runs:
+            _ = styles.run(run._r, fmt)
+            count += 1
+    return count
+
+
+def best_time(run, document, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = run(document)
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_docx(os.path.join(tmp, "thesis.docx"), pages=args.pages)
+        document = docx.Document(path)
+    
+    baseline, runs = best_time(python_docx_lookups, document, args.repeat)
+    resolved, _ = best_time(resolver_lookups, document, args.repeat)
+    print(f"📊 {len(document.paragraphs)} paragraphs, {runs} runs")
+    print(f"{'python-docx':<14} {baseline:7.3f}s")
+    print(f"{'StyleResolver':<14} {resolved:7.3f}s  {baseline / resolved:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
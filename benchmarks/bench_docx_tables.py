@@ -0,0 +1,102 @@
+"""
+DOCX Tables Benchmark
+======================
+So sánh cách cũ (paragraphs rồi docx.tables, ô lấy qua row.cells) với duyệt
+w:body 1 lượt và dựng lưới bảng trực tiếp từ XML, trên DOCX có nhiều bảng
+lớn có ô gộp.
+
+Usage:
+    python -m benchmarks.bench_docx_tables [--tables 200] [--rows 60] [--cols 8] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_docx
+from function1.parsers.docx_parser import DOCXParser
+from function1.parsers.docx_styles import StyleResolver
+from function1.parsers.ir import (
+    Block, BlockType, Run, SectionBuilder, TableRow, TableCell
+)
+
+
+def two_pass(parser: DOCXParser, docx) -> list:
+    """Cách cũ: 2 lượt, mọi bảng dồn vào section cuối, row.cells cho từng hàng"""
+    styles = StyleResolver.from_docx(docx)
+    builder = SectionBuilder()
+    sections = []
+    for para in docx.paragraphs:
+        text = para.text.strip()
+        if not text:
+            continue
+        fmt = styles.paragraph(para._p)
+        finished = parser._add_paragraph(builder, fmt, text,
+                                         lambda: parser._parse_runs(para, styles, fmt))
+        if finished:
+            sections.append(finished)
+    
+    for table in docx.tables:
+        rows = [
+            TableRow(cells=[TableCell(content=[Run(text=cell.text.strip())])
+                            for cell in row.cells],
+                     is_header=(i == 0))
+            for i, row in enumerate(table.rows)
+        ]
+        builder.add(Block(type=BlockType.TABLE, rows=rows))
+    
+    sections.append(builder.finish())
+    return sections
+
+
+def best_time(run, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def table_texts(sections) -> list:
+    return [[cell.content[0].text for row in block.rows for cell in row.cells]
+            for section in sections for block in section.blocks
+            if block.type == BlockType.TABLE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--cols", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_docx(os.path.join(tmp, "tables.docx"), pages=args.tables,
+                         paragraphs_per_page=5, tables_every=1, table_rows=args.rows,
+                         table_cols=args.cols, merged=True)
+        size = os.path.getsize(path)
+        
+        docx_parser = DOCXParser()
+        runs = {
+            "two-pass + row.cells": lambda: two_pass(docx_parser,
+                                                     docx_parser._open(path)),
+            "single-pass": lambda: list(docx_parser.iter_sections(path)),
+            "single-pass stream": lambda: list(
+                DOCXParser(reader="stream").iter_sections(path)),
+        }
+        results = {name: best_time(run, args.repeat) for name, run in runs.items()}
+    
+    print(f"📊 {args.tables} tables x {args.rows}x{args.cols} (merged cells), "
+          f"{size / 1e6:.1f} MB")
+    baseline, reference = results["two-pass + row.cells"]
+    for name, (elapsed, sections) in results.items():
+        same = "same cells" if table_texts(sections) == table_texts(reference) else "CELLS DIFFER"
+        print(f"{name:<22} {elapsed:7.3f}s  {baseline / elapsed:5.1f}x  "
+              f"{len(sections)} sections  {same}")
+
+
+if __name__ == "__main__":
+    main()
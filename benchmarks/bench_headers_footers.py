@@ -0,0 +1,58 @@
+"""
+Header/Footer Stripping Benchmark
+==================================
+Số dòng/token header-footer bị bỏ và chi phí thêm của strip_repeats.
+
+Usage:
+    python -m benchmarks.bench_headers_footers [--pages 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.pdf_parser import PDFParser
+from function3.extractors import ContentExtractor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages,
+                             running_headers=True)
+        
+        best = {False: float("inf"), True: float("inf")}
+        parsers = {}
+        documents = {}
+        for _ in range(args.repeat):
+            for strip in best:
+                parsers[strip] = PDFParser(strip_repeats=strip)
+                start = time.perf_counter()
+                documents[strip] = parsers[strip].parse(path)
+                best[strip] = min(best[strip], time.perf_counter() - start)
+        
+        content = ContentExtractor().extract(path)
+        raw_chars = len(ContentExtractor(strip_repeats=False).extract(path)["full_text"])
+    
+    stripped = parsers[True].stripped
+    print(f"📊 {args.pages} pages")
+    print(f"{'strip':<6} {'time':>8} {'blocks':>8}")
+    for strip, elapsed in best.items():
+        print(f"{str(strip):<6} {elapsed:7.3f}s {documents[strip].get_total_blocks():>8}")
+    print(f"overhead: {(best[True] / best[False] - 1) * 100:+.1f}%")
+    print(f"PDFParser: {stripped['lines']} lines, {stripped['chars']} chars, "
+          f"~{stripped['tokens']} tokens removed")
+    
+    removed = content["stripped"]
+    print(f"ContentExtractor: {removed['lines']} blocks, ~{removed['tokens']} tokens removed "
+          f"({removed['chars'] / raw_chars * 100:.1f}% of prompt text)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Heading Classifier Overhead Benchmark
+======================================
+Chi phí của 2-pass adaptive heading detection so với ngưỡng cố định.
+
+Usage:
+    python -m benchmarks.bench_heading_classifier [--pages 300] [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.heading_classifier import FontStats, HeadingClassifier
+from function1.parsers.pdf_parser import PDFParser, ELEM_LINE
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def best_times(funcs, repeat: int):
+    """Chạy xen kẽ các funcs (giảm nhiễu do máy), trả về thời gian tốt nhất"""
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            best[i] = min(best[i], best_time(func, 1))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages)
+        
+        fixed, adaptive = best_times([
+            lambda: PDFParser(headings="fixed").parse(path),
+            lambda: PDFParser(headings="adaptive").parse(path),
+        ], args.repeat)
+        
+        # Riêng phần thống kê + fit trên elements đã trích xuất
+        pdf = PDFParser()
+        doc = pdf._open(path)
+        pages = list(pdf._iter_page_elements(doc, path, list(range(doc.page_count))))
+        doc.close()
+        
+        def fit():
+            stats = FontStats()
+            for elements in pages:
+                for element in elements:
+                    if element[0] == ELEM_LINE:
+                        stats.add(element[2], element[3], len(element[4]))
+            return HeadingClassifier.fit(stats)
+        
+        fit_time = best_time(fit, args.repeat)
+        classifier = fit()
+    
+    print(f"📊 {args.pages} pages")
+    print(f"fixed      {fixed:6.3f}s")
+    print(f"adaptive   {adaptive:6.3f}s  ({(adaptive / fixed - 1) * 100:+.1f}%)")
+    print(f"stats+fit  {fit_time:6.3f}s  ({fit_time / fixed * 100:.1f}% of parse)")
+    print(f"levels: {dict((k / 2, v) for k, v in classifier.size_levels.items())}, "
+          f"body={classifier.body_key / 2}pt")
+
+
+if __name__ == "__main__":
+    main()
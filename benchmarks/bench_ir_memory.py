@@ -0,0 +1,102 @@
+"""
+IR Memory Benchmark
+====================
+So sánh bộ nhớ của IR hiện tại (slotted Block/Run) với các dataclasses cũ.
+
+Mô phỏng output của PDFParser.parse: mỗi dòng text là 1 PARAGRAPH block
+với vài runs, cộng một ít headings.
+
+Usage:
+    python -m benchmarks.bench_ir_memory [--pages 400] [--lines 40]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from function1.parsers.ir import Block, BlockType, Run, Section
+
+
+# ===== LEGACY IR (trước khi dùng __slots__) =====
+
+@dataclass
+class LegacyRun:
+    text: str
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    font_name: Optional[str] = None
+    font_size: Optional[int] = None
+
+
+@dataclass
+class LegacyBlock:
+    type: BlockType
+    content: Any = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    level: int = 0
+    runs: List[LegacyRun] = field(default_factory=list)
+    alignment: str = "left"
+    items: List[Any] = field(default_factory=list)
+    ordered: bool = False
+    rows: List[Any] = field(default_factory=list)
+    image_path: Optional[str] = None
+    caption: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def build_ir(block_cls, run_cls, pages: int, lines: int) -> List[Section]:
+    """Tạo IR giả lập: 1 section / 20 trang, `lines` blocks / trang"""
+    sections = []
+    section = None
+    # Mỗi span từ parser mang 1 string font_name riêng (không dùng chung)
+    font = lambda: "".join(["Times ", "New Roman"])
+    for page in range(pages):
+        if page % 20 == 0:
+            section = Section(title=f"Chương {page // 20 + 1}", level=1)
+            sections.append(section)
+        for line in range(lines):
+            runs = [
+                run_cls(text=f"Dòng {line} trang {page} ", font_name=font(),
+                        font_size=13),
+                run_cls(text="nội dung in đậm", bold=True, font_name=font(),
+                        font_size=13),
+            ]
+            section.blocks.append(block_cls(type=BlockType.PARAGRAPH, runs=runs))
+    return sections
+
+
+def measure(label: str, block_cls, run_cls, pages: int, lines: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    ir = build_ir(block_cls, run_cls, pages, lines)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    blocks = sum(len(s.blocks) for s in ir)
+    print(f"{label:<10} {blocks:>9,} blocks  {current / 1024 / 1024:8.1f} MiB  "
+          f"{current / blocks:6.0f} B/block  {elapsed:6.2f}s")
+    del ir
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+    
+    print(f"📊 IR memory: {args.pages} pages x {args.lines} lines")
+    legacy = measure("legacy", LegacyBlock, LegacyRun, args.pages, args.lines)
+    slotted = measure("slotted", Block, Run, args.pages, args.lines)
+    print(f"\n✅ Saved {(1 - slotted / legacy) * 100:.0f}% memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+JSONL Export Benchmark
+=======================
+So sánh ghi JSONL kiểu gom (parse cả document, build list records rồi ghi)
+với JSONLExporter stream (parse → split → ghi từng chunk): thời gian và peak
+bộ nhớ cấp phát thêm (tracemalloc) khi số trang tăng.
+
+Usage:
+    python -m benchmarks.bench_jsonl_export [--pages 500 1000 2000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_docx
+from function1.exporters.jsonl_exporter import JSONLExporter, chunk_record
+from function1.parsers.docx_parser import DOCXParser
+from function1.processors.splitter import Splitter
+
+
+def export_collected(source: str, path: str) -> None:
+    """Parse cả document, giữ mọi record trong bộ nhớ rồi mới ghi"""
+    document = DOCXParser(reader="stream").parse(source)
+    chunks = Splitter(split_level=2).split(document)
+    records = [chunk_record(chunk, i, "a.docx") for i, chunk in enumerate(chunks, 1)]
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def export_streamed(source: str, path: str) -> None:
+    """Ghi từng chunk ngay khi parser/splitter tạo ra"""
+    sections = DOCXParser(reader="stream").iter_sections(source)
+    with open(path, "w", encoding="utf-8") as f:
+        JSONLExporter(f, "a.docx").write_all(Splitter(split_level=2).iter_split(sections))
+
+
+def measure(export, source: str, path: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    export(source, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[500, 1000, 2000])
+    args = parser.parse_args()
+    
+    print(f"{'pages':>6} {'records':>8} {'collected':>18} {'streamed':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "a.jsonl")
+        for pages in args.pages:
+            source = make_docx(os.path.join(tmp, f"{pages}.docx"), pages=pages)
+            collected = measure(export_collected, source, out)
+            streamed = measure(export_streamed, source, out)
+            with open(out, encoding="utf-8") as f:
+                records = sum(1 for _ in f)
+            print(f"{pages:>6} {records:>8} {collected[0]:7.2f}s {collected[1]:7.2f} MB "
+                  f"{streamed[0]:7.2f}s {streamed[1]:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+LaTeX Export Benchmark
+=======================
+IR lớn tổng hợp (đoạn văn nhiều runs, list, bảng): so sánh escape kiểu cũ
+(10 lượt str.replace) với escape_latex 1 lượt, và export kiểu cũ (list các
+dòng rồi join) với write_section ghi thẳng vào file: thời gian và peak bộ
+nhớ cấp phát thêm (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_latex_export [--sections 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from function1.exporters.latex_exporter import LaTeXExporter, escape_latex
+from function1.parsers.ir import Block, BlockType, ListItem, Run, Section, TableCell, TableRow
+
+WORDS = ("luận văn phương pháp đánh giá kết quả thực nghiệm cho thấy mô hình "
+         "chi phí 15% & lợi nhuận $2 tham số x_i {a} #3").split()
+
+OLD_REPLACEMENTS = {
+    '\\': '\\textbackslash{}', '&': '\\&', '%': '\\%', '$': '\\$', '#': '\\#',
+    '_': '\\_', '{': '\\{', '}': '\\}', '~': '\\textasciitilde{}',
+    '^': '\\textasciicircum{}',
+}
+
+
+def replace_escape(text: str) -> str:
+    """Cách cũ: 10 lượt str.replace"""
+    for char, replacement in OLD_REPLACEMENTS.items():
+        text = text.replace(char, replacement)
+    return text
+
+
+class JoinedExporter(LaTeXExporter):
+    """Cách cũ: escape nhiều lượt, section thành list các dòng rồi join"""
+    
+    def _escape_latex(self, text: str) -> str:
+        return replace_escape(text) if text else ""
+    
+    def _runs_to_latex(self, runs):
+        parts = []
+        for run in runs:
+            text = self._escape_latex(run.text)
+            if run.bold:
+                text = f"\\textbf{{{text}}}"
+            elif run.italic:
+                text = f"\\textit{{{text}}}"
+            parts.append(text)
+        return "".join(parts)
+    
+    def _export_section(self, section):
+        lines = [f"\\chapter{{{self._escape_latex(section.title)}}}", ""]
+        for block in section.blocks:
+            if block.type == BlockType.PARAGRAPH:
+                lines.append(f"{self._runs_to_latex(block.runs)}\n")
+            elif block.type == BlockType.LIST:
+                items = [f"\\item {self._runs_to_latex(i.content)}" for i in block.items]
+                lines.append("\\begin{itemize}\n" + "\n".join(items) + "\n\\end{itemize}\n")
+            elif block.type == BlockType.TABLE:
+                rows = ["\\begin{tabular}{|l|l|l|}", "\\hline"]
+                for row in block.rows:
+                    rows.append(" & ".join(self._runs_to_latex(c.content) for c in row.cells)
+                                + " \\\\")
+                    rows.append("\\hline")
+                rows.append("\\end{tabular}")
+                lines.append("\n".join(rows) + "\n")
+        return "\n".join(lines)
+
+
+def make_sections(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    
+    def runs(n):
+        return [Run(" ".join(rng.choice(WORDS) for _ in range(8)) + " ",
+                    bold=rng.random() < 0.2, italic=rng.random() < 0.1) for _ in range(n)]
+    
+    sections = []
+    for s in range(count):
+        blocks = [Block(type=BlockType.PARAGRAPH, runs=runs(12)) for _ in range(60)]
+        blocks.append(Block(type=BlockType.LIST, items=[ListItem(content=runs(2)) for _ in range(10)]))
+        blocks.append(Block(type=BlockType.TABLE, rows=[
+            TableRow(cells=[TableCell(content=runs(1)) for _ in range(3)]) for _ in range(40)
+        ]))
+        sections.append(Section(title=f"Chương {s + 1}: 100% & $", level=1, blocks=blocks))
+    return sections
+
+
+def measure(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sections", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    sections = make_sections(args.sections)
+    texts = [run.text for s in sections for b in s.blocks if b.type == BlockType.PARAGRAPH
+             for run in b.runs]
+    # Văn xuôi thông thường: runs không có ký tự đặc biệt
+    plain = str.maketrans("", "", "".join(OLD_REPLACEMENTS))
+    prose = [text.translate(plain) for text in texts]
+    print(f"📊 {args.sections} sections, {len(texts)} paragraph runs")
+    
+    for label, sample in (("escape (special-heavy)", texts), ("escape (prose)", prose)):
+        old_escape, _ = measure(lambda: [replace_escape(t) for t in sample], args.repeat)
+        new_escape, _ = measure(lambda: [escape_latex(t) for t in sample], args.repeat)
+        print(f"{label:<24} replace x10 {old_escape:7.3f}s   single pass {new_escape:7.3f}s "
+              f"({old_escape / new_escape:.1f}x)")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "all.tex")
+        old, new = JoinedExporter(), LaTeXExporter()
+        
+        def write_joined():
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n\n".join(old._export_section(s) for s in sections))
+        
+        def write_streamed():
+            with open(path, "w", encoding="utf-8") as f:
+                for i, section in enumerate(sections):
+                    if i:
+                        f.write("\n\n")
+                    new.write_section(f, section)
+        
+        for label, fn in (("joined", write_joined), ("streamed", write_streamed)):
+            elapsed, peak = measure(fn, args.repeat)
+            print(f"{'export':<24} {label:<11} {elapsed:7.3f}s   peak {peak:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Markdown Writer Benchmark
+==========================
+So sánh ghi Markdown kiểu cũ (build list các dòng rồi join cả document thành
+1 chuỗi) với write_markdown (stream từng block vào file): thời gian và peak
+bộ nhớ cấp phát thêm (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_markdown_writer [--pages 3000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_docx
+from function1.parsers.docx_parser import DOCXParser
+from function1.parsers.ir import BlockType
+
+
+def joined_markdown(document) -> str:
+    """Cách cũ: mỗi section thành list các dòng, join rồi join cả document"""
+    parts = []
+    for section in document.sections:
+        lines = [f"{'#' * section.level} {section.title}", ""]
+        for block in section.blocks:
+            if block.type == BlockType.HEADING:
+                lines.append(f"{'#' * block.level} {section._runs_to_text(block.runs)}")
+            elif block.type == BlockType.PARAGRAPH:
+                lines.append(section._runs_to_text(block.runs))
+            elif block.type == BlockType.LIST:
+                for i, item in enumerate(block.items):
+                    prefix = f"{i+1}. " if block.ordered else "- "
+                    lines.append(f"{'  ' * item.level}{prefix}"
+                                 f"{section._runs_to_text(item.content)}")
+            else:
+                continue
+            lines.append("")
+        parts.append("\n".join(lines))
+    return "\n---\n\n".join(parts)
+
+
+def write_joined(document, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(joined_markdown(document))
+
+
+def write_streamed(document, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        document.write_markdown(f)
+
+
+def measure(write, document, path: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(document, path)
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    write(document, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_docx(os.path.join(tmp, "thesis.docx"), pages=args.pages)
+        document = DOCXParser(reader="stream").parse(source)
+        path = os.path.join(tmp, "out.md")
+        
+        print(f"📊 {args.pages} pages, {document.get_total_blocks()} blocks")
+        for name, write in (("join", write_joined), ("write_markdown", write_streamed)):
+            elapsed, peak, size = measure(write, document, path, args.repeat)
+            print(f"{name:<15} {elapsed:7.3f}s  peak {peak:7.2f} MB  ({size / 1e6:.1f} MB file)")
+
+
+if __name__ == "__main__":
+    main()
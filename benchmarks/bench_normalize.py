@@ -0,0 +1,59 @@
+"""
+Run Coalescing Benchmark
+=========================
+DOCX có mỗi từ là 1 run: so sánh parse + xuất Markdown/LaTeX khi tắt và bật
+chuẩn hóa IR (gộp runs liền nhau cùng formatting).
+
+Usage:
+    python -m benchmarks.bench_normalize [--pages 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_docx
+from function1.exporters.latex_exporter import LaTeXExporter
+from function1.parsers.docx_parser import DOCXParser
+
+
+def run_once(path: str, normalize: bool):
+    """Parse rồi xuất Markdown và LaTeX, trả về thời gian từng bước"""
+    parser = DOCXParser(reader="stream", normalize=normalize)
+    start = time.perf_counter()
+    document = parser.parse(path)
+    parsed = time.perf_counter()
+    markdown = document.to_markdown()
+    rendered = time.perf_counter()
+    exporter = LaTeXExporter()
+    latex = "".join(exporter._export_section(section) for section in document.sections)
+    exported = time.perf_counter()
+    return (parsed - start, rendered - parsed, exported - rendered,
+            parser.normalized, len(markdown), len(latex))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_docx(os.path.join(tmp, "fragmented.docx"), pages=args.pages,
+                         fragmented=True)
+        print(f"📊 {args.pages} pages, 1 run per word")
+        print(f"{'normalize':<10} {'parse':>8} {'markdown':>9} {'latex':>8} "
+              f"{'runs':>8} {'md size':>9} {'tex size':>9}")
+        for normalize in (False, True):
+            results = [run_once(path, normalize) for _ in range(args.repeat)]
+            parse, markdown, latex = (min(r[i] for r in results) for i in range(3))
+            counts, md_size, tex_size = results[-1][3:]
+            runs = counts["runs"] - counts["merged"] - counts["dropped"] if normalize else "-"
+            print(f"{'on' if normalize else 'off':<10} {parse:7.3f}s {markdown:8.3f}s "
+                  f"{latex:7.3f}s {runs:>8} {md_size:>9} {tex_size:>9}")
+        print(f"counters: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+PDF Reading Order Benchmark
+============================
+Độ đúng thứ tự đọc và chi phí của columns=True trên PDF 2 cột / 1 cột.
+
+Usage:
+    python -m benchmarks.bench_pdf_columns [--pages 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf, make_two_column_pdf
+from function1.parsers.pdf_parser import PDFParser
+
+_MARKER = re.compile(r"\[(\d+)\.(\d+)\.(\d+)\]")
+
+
+def in_order(markdown: str) -> str:
+    """Tỷ lệ cặp đoạn liên tiếp đúng thứ tự (trang, cột, đoạn)"""
+    markers = [tuple(map(int, m)) for m in _MARKER.findall(markdown)]
+    pairs = list(zip(markers, markers[1:]))
+    if not pairs:
+        return "n/a"
+    return f"{sum(a < b for a, b in pairs) / len(pairs) * 100:.1f}%"
+
+
+def best_time(path: str, columns: bool, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = PDFParser(columns=columns).parse(path)
+        best = min(best, time.perf_counter() - start)
+    return best, document
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        corpora = {
+            "2-column": make_two_column_pdf(os.path.join(tmp, "two.pdf"), pages=args.pages),
+            "1-column": make_text_pdf(os.path.join(tmp, "one.pdf"), pages=args.pages),
+        }
+        
+        print(f"📊 {args.pages} pages")
+        print(f"{'corpus':<9} {'columns':<8} {'time':>8} {'in order':>9}")
+        for name, path in corpora.items():
+            times = {}
+            for columns in (False, True):
+                elapsed, document = best_time(path, columns, args.repeat)
+                times[columns] = elapsed
+                print(f"{name:<9} {str(columns):<8} {elapsed:7.3f}s "
+                      f"{in_order(document.to_markdown()):>9}")
+            print(f"{'':<9} overhead: {(times[True] / times[False] - 1) * 100:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+PDF Fidelity Tier Benchmark
+============================
+Pages/sec của PDFParser với fidelity="full" và fidelity="fast".
+
+Usage:
+    python -m benchmarks.bench_pdf_fidelity [--pages 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.pdf_parser import PDFParser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages)
+        
+        best = {"full": float("inf"), "fast": float("inf")}
+        documents = {}
+        for _ in range(args.repeat):
+            for fidelity in best:
+                start = time.perf_counter()
+                documents[fidelity] = PDFParser(fidelity=fidelity).parse(path)
+                best[fidelity] = min(best[fidelity], time.perf_counter() - start)
+    
+    print(f"📊 {args.pages} pages")
+    print(f"{'tier':<6} {'time':>8} {'pages/s':>9} {'sections':>9} {'blocks':>8}")
+    for fidelity, elapsed in best.items():
+        document = documents[fidelity]
+        print(f"{fidelity:<6} {elapsed:7.3f}s {args.pages / elapsed:9.0f} "
+              f"{document.get_section_count():>9} {document.get_total_blocks():>8}")
+
+
+if __name__ == "__main__":
+    main()
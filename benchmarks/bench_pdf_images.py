@@ -0,0 +1,85 @@
+"""
+PDF Image Extraction Benchmark
+===============================
+So sánh extract từng image trên từng trang với extract có khử trùng lặp.
+
+Usage:
+    python -m benchmarks.bench_pdf_images [--pages 300] [--figures-every 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_image_pdf
+from function1.parsers.pdf_images import extract_images
+from function1.parsers.pdf_parser import fitz
+
+
+def naive_extract(doc, output_dir: str) -> int:
+    """Cách cũ: decode và ghi mọi image trên mọi trang, tuần tự"""
+    written = 0
+    for page_num, page in enumerate(doc):
+        for img_index, img in enumerate(page.get_images()):
+            base_image = doc.extract_image(img[0])
+            filename = f"page{page_num + 1}_img{img_index + 1}.{base_image['ext']}"
+            with open(os.path.join(output_dir, filename), "wb") as f:
+                f.write(base_image["image"])
+            written += 1
+    return written
+
+
+def dir_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+def best_time(run, doc, root: str, repeat: int):
+    best = float("inf")
+    for i in range(repeat):
+        output_dir = os.path.join(root, f"run{i}")
+        start = time.perf_counter()
+        result = run(doc, output_dir)
+        best = min(best, time.perf_counter() - start)
+        size = dir_size(output_dir)
+        shutil.rmtree(output_dir)
+    return best, result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--figures-every", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_image_pdf(os.path.join(tmp, "images.pdf"), pages=args.pages,
+                              figures_every=args.figures_every)
+        doc = fitz.open(path)
+        
+        def naive(doc, output_dir):
+            os.makedirs(output_dir)
+            return naive_extract(doc, output_dir)
+        
+        old, written, old_size = best_time(naive, doc, tmp, args.repeat)
+        new, manifest, new_size = best_time(extract_images, doc, tmp, args.repeat)
+        
+        output_dir = os.path.join(tmp, "rerun")
+        extract_images(doc, output_dir)
+        start = time.perf_counter()
+        extract_images(doc, output_dir)
+        rerun = time.perf_counter() - start
+        doc.close()
+    
+    placements = sum(len(placed) for placed in manifest["pages"].values())
+    print(f"📊 {args.pages} pages, {placements} image placements")
+    print(f"per page (old):  {old:.3f}s, {written} files, {old_size / 1e6:.1f} MB")
+    print(f"deduplicated:    {new:.3f}s, {len(manifest['images'])} files, "
+          f"{new_size / 1e6:.1f} MB  ({old / new:.1f}x faster)")
+    print(f"re-run (files already there): {rerun:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
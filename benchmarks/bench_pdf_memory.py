@@ -0,0 +1,77 @@
+"""
+PDF Memory Benchmark
+=====================
+Peak RSS của PDFParser.parse theo số trang, memory="normal" và "bounded".
+
+Mỗi lần đo chạy trong 1 process riêng (peak RSS không giảm lại được).
+
+Usage:
+    python -m benchmarks.bench_pdf_memory [--pages 250,500,1000,2000]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+
+MODES = {
+    "normal": {},
+    "bounded": {"memory": "bounded"},
+    "bounded+spill": {"memory": "bounded", "spill": True},
+}
+
+
+def child(mode: str, path: str) -> None:
+    """Parse 1 lần rồi in 'peak_rss_kb elapsed blocks'"""
+    from function1.parsers.pdf_parser import PDFParser
+    
+    start = time.perf_counter()
+    document = PDFParser(**MODES[mode]).parse(path)
+    elapsed = time.perf_counter() - start
+    blocks = document.get_total_blocks()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # macOS: bytes
+    print(peak, elapsed, blocks)
+
+
+def measure(mode: str, path: str):
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pdf_memory", "--child", mode, path],
+        capture_output=True, text=True, check=True,
+    )
+    peak, elapsed, blocks = result.stdout.splitlines()[-1].split()
+    return int(peak) / 1024, float(elapsed), int(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", default="250,500,1000,2000")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(*args.child)
+        return
+    
+    sizes = [int(n) for n in args.pages.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>6} " + " ".join(f"{mode:>22}" for mode in MODES))
+        for pages in sizes:
+            path = make_text_pdf(os.path.join(tmp, f"{pages}.pdf"), pages=pages,
+                                 running_headers=True)
+            cells = []
+            for mode in MODES:
+                peak, elapsed, _ = measure(mode, path)
+                cells.append(f"{peak:8.1f} MB {elapsed:7.2f}s")
+            print(f"{pages:>6} " + " ".join(f"{cell:>22}" for cell in cells))
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Parallel PDF Parsing Benchmark
+===============================
+So sánh PDFParser serial với --jobs N trên PDF giả lập nhiều trang,
+đồng thời kiểm tra output giống hệt nhau.
+
+Usage:
+    python -m benchmarks.bench_pdf_parallel [--pages 600] [--jobs 8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.pdf_parser import PDFParser
+
+
+def timed_parse(path: str, jobs: int):
+    start = time.perf_counter()
+    document = PDFParser(jobs=jobs).parse(path)
+    return document, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=600)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages)
+        
+        serial, serial_time = timed_parse(path, 1)
+        parallel, parallel_time = timed_parse(path, args.jobs)
+    
+    print(f"📊 {args.pages} pages, {serial.get_total_blocks():,} blocks")
+    print(f"serial     {serial_time:6.2f}s  {args.pages / serial_time:7.0f} pages/s")
+    print(f"jobs={args.jobs:<5} {parallel_time:6.2f}s  {args.pages / parallel_time:7.0f} pages/s  "
+          f"(x{serial_time / parallel_time:.1f})")
+    print(f"identical output: {serial.sections == parallel.sections}")
+
+
+if __name__ == "__main__":
+    main()
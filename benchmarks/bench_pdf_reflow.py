@@ -0,0 +1,42 @@
+"""
+PDF Paragraph Reflow Benchmark
+===============================
+Số blocks, kích thước markdown và thời gian parse khi bật/tắt reflow.
+
+Usage:
+    python -m benchmarks.bench_pdf_reflow [--pages 300]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.pdf_parser import PDFParser
+
+
+def run(path: str, reflow: bool):
+    start = time.perf_counter()
+    document = PDFParser(reflow=reflow).parse(path)
+    elapsed = time.perf_counter() - start
+    return document.get_total_blocks(), len(document.to_markdown()), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages)
+        
+        print(f"📊 {args.pages} pages")
+        print(f"{'mode':<10} {'blocks':>9} {'markdown':>12} {'time':>8}")
+        for label, reflow in (("lines", False), ("reflow", True)):
+            blocks, md_chars, elapsed = run(path, reflow)
+            print(f"{label:<10} {blocks:>9,} {md_chars:>12,} {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
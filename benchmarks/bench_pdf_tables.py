@@ -0,0 +1,71 @@
+"""
+PDF Table Extraction Benchmark
+===============================
+Tỷ lệ trang được pre-check bỏ qua và chi phí thêm của tables=True.
+
+Usage:
+    python -m benchmarks.bench_pdf_tables [--pages 300] [--tables-every 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_text_pdf
+from function1.parsers.ir import BlockType
+from function1.parsers.pdf_parser import PDFParser, ruling_bbox, fitz, TEXTFLAGS_TABLES
+
+
+def best_time(path: str, repeat: int, **options):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = PDFParser(**options).parse(path)
+        best = min(best, time.perf_counter() - start)
+    return best, document
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--tables-every", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "synthetic.pdf"), pages=args.pages,
+                             tables_every=args.tables_every)
+        
+        doc = fitz.open(path)
+        start = time.perf_counter()
+        flagged = 0
+        for page in doc:
+            blocks = page.get_text("dict", flags=TEXTFLAGS_TABLES)["blocks"]
+            flagged += ruling_bbox([b for b in blocks if b["type"] == 3]) is not None
+        precheck = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for page in doc:
+            page.find_tables()
+        find_all = time.perf_counter() - start
+        doc.close()
+        
+        off, _ = best_time(path, args.repeat, tables=False)
+        on, document = best_time(path, args.repeat, tables=True)
+    
+    tables = sum(1 for section in document.sections for block in section.blocks
+                 if block.type == BlockType.TABLE)
+    skipped = args.pages - flagged
+    
+    every = f"a table every {args.tables_every} pages" if args.tables_every else "no tables"
+    print(f"📊 {args.pages} pages, {every}")
+    print(f"pre-check (incl. text extraction): {precheck:.3f}s, "
+          f"skips {skipped}/{args.pages} pages ({skipped / args.pages * 100:.1f}%)")
+    print(f"find_tables on every page: {find_all:.3f}s")
+    print(f"parse tables=False: {off:.3f}s")
+    print(f"parse tables=True:  {on:.3f}s  ({(on / off - 1) * 100:+.1f}%, {tables} TABLE blocks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Size-Bounded Splitter Benchmark
+================================
+1 chương lớn (nhiều đoạn, vài đoạn rất dài, heading con) được tách theo
+max_chars: thời gian phải tăng tuyến tính theo kích thước chương, và mọi chunk
+phải ≤ max_chars.
+
+Usage:
+    python -m benchmarks.bench_splitter [--max-chars 6000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from function1.parsers.ir import Block, BlockType, Document, Run, Section
+from function1.processors.splitter import Splitter
+
+SENTENCE = "Luận văn trình bày phương pháp đánh giá của TS. Nguyễn V. An tại TP. Hồ Chí Minh. "
+
+
+def make_chapter(paragraphs: int) -> Section:
+    """Chương có paragraphs đoạn, cứ 50 đoạn có 1 đoạn dài ~40 KB và 1 heading"""
+    blocks = []
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            blocks.append(Block(type=BlockType.HEADING, level=2, runs=[Run(f"Mục {i // 50 + 1}")]))
+            text = SENTENCE * 500
+        else:
+            text = SENTENCE * 4
+        blocks.append(Block(type=BlockType.PARAGRAPH, runs=[
+            Run(text), Run("Nhấn mạnh. ", bold=True), Run(SENTENCE)
+        ]))
+    return Section(title="Chương 1", level=1, blocks=blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max-chars", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    splitter = Splitter(max_chars=args.max_chars)
+    print(f"{'paragraphs':>10} {'size':>9} {'chunks':>7} {'largest':>8} {'time':>8} {'µs/KB':>7}")
+    for paragraphs in (500, 1000, 2000, 4000, 8000):
+        document = Document(sections=[make_chapter(paragraphs)])
+        size = len(document.to_markdown())
+        
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            chunks = splitter.split(document)
+            best = min(best, time.perf_counter() - start)
+        
+        largest = max(len(chunk.to_markdown()) for chunk in chunks)
+        assert largest <= args.max_chars
+        print(f"{paragraphs:>10} {size:>9} {len(chunks):>7} {largest:>8} "
+              f"{best:7.3f}s {best * 1e6 / (size / 1024):7.1f}")
+
+
+if __name__ == "__main__":
+    main()
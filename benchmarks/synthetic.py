@@ -0,0 +1,222 @@
+"""
+Synthetic Corpus
+=================
+Tạo PDF/DOCX giả lập để chạy benchmarks (không cần file thật)
+"""
+
+import os
+import random
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+
+# Không dấu: font base-14 của PDF không có glyph tiếng Việt
+WORDS = (
+    "nghien cuu he thong du lieu phuong phap ket qua phan tich mo hinh "
+    "danh gia ung dung thuc nghiem giai phap cong nghe thong tin"
+).split()
+
+
+def sentence(seed: int, words: int = 12) -> str:
+    """Câu giả lập, xác định theo seed"""
+    return " ".join(WORDS[(seed * 7 + i * 3) % len(WORDS)] for i in range(words))
+
+
+def draw_table(page, x: float, y: float, rows: int = 5, cols: int = 4,
+               col_width: float = 110, row_height: float = 18) -> float:
+    """Vẽ bảng kẻ ô (đường kẻ vector + text 9pt), trả về y dưới cùng của bảng"""
+    for r in range(rows + 1):
+        page.draw_line((x, y + r * row_height), (x + cols * col_width, y + r * row_height))
+    for c in range(cols + 1):
+        page.draw_line((x + c * col_width, y), (x + c * col_width, y + rows * row_height))
+    for r in range(rows):
+        for c in range(cols):
+            text = f"Cot {c + 1}" if r == 0 else f"{r}.{c} {WORDS[(r * cols + c) % len(WORDS)]}"
+            page.insert_text((x + c * col_width + 4, y + r * row_height + 13), text, fontsize=9)
+    return y + rows * row_height
+
+
+def make_text_pdf(path: str, pages: int = 100, paragraphs_per_page: int = 8,
+                  pages_per_chapter: int = 20, running_headers: bool = False,
+                  tables_every: int = 0) -> str:
+    """
+    PDF text thuần: mỗi `pages_per_chapter` trang mở đầu bằng 1 heading
+    18pt (có trong outline), còn lại là các đoạn văn 11pt nhiều dòng
+    
+    running_headers=True: thêm header 9pt và số trang "Trang N" ở mỗi trang
+    tables_every=N: cứ N trang có 1 trang mở đầu bằng bảng kẻ ô 5x4
+    """
+    if fitz is None:
+        raise ImportError("PyMuPDF required: pip install PyMuPDF")
+    
+    doc = fitz.open()
+    toc = []
+    for page_num in range(pages):
+        page = doc.new_page()
+        if running_headers:
+            page.insert_text((72, 36), "Bao cao thuc tap tot nghiep - Khoa CNTT", fontsize=9)
+            page.insert_text((page.rect.width / 2 - 20, page.rect.height - 30),
+                             f"Trang {page_num + 1}", fontsize=9)
+        y = 60
+        if page_num % pages_per_chapter == 0:
+            title = f"Chuong {page_num // pages_per_chapter + 1}"
+            page.insert_text((72, y + 14), title, fontsize=18, fontname="hebo")
+            toc.append([1, title, page_num + 1])
+            y += 30
+        if tables_every and page_num % tables_every == tables_every - 1:
+            y = draw_table(page, 72, y) + 12
+        for para in range(paragraphs_per_page):
+            seed = page_num * paragraphs_per_page + para
+            text = " ".join(sentence(seed + k) for k in range(3 + seed % 3))
+            rect = fitz.Rect(72, y, page.rect.width - 72, page.rect.height - 50)
+            remaining = page.insert_textbox(rect, text, fontsize=11)
+            if remaining < 0:
+                break
+            y = rect.y1 - remaining + 8
+    
+    doc.set_toc(toc)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def make_two_column_pdf(path: str, pages: int = 100, paragraphs_per_column: int = 6) -> str:
+    """
+    PDF 2 cột kiểu bài báo hội nghị: tiêu đề trải cả trang ở trang đầu,
+    các đoạn 9pt được ghi xen kẽ trái/phải trong content stream (nên thứ
+    tự gốc của PyMuPDF đan xen 2 cột). Mỗi đoạn bắt đầu bằng "[p.c.i]"
+    (trang, cột, thứ tự) để kiểm tra thứ tự đọc.
+    """
+    if fitz is None:
+        raise ImportError("PyMuPDF required: pip install PyMuPDF")
+    
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        top = 60
+        if page_num == 0:
+            title = fitz.Rect(72, top, page.rect.width - 72, top + 40)
+            page.insert_textbox(title, "Nghien cuu he thong du lieu phan tan",
+                                fontsize=16, fontname="hebo", align=1)
+            top += 50
+        
+        gutter = 18
+        column_width = (page.rect.width - 144 - gutter) / 2
+        lefts = (72, 72 + column_width + gutter)
+        ys = [top, top]
+        for para in range(paragraphs_per_column):
+            for column in (0, 1):
+                seed = (page_num * 2 + column) * paragraphs_per_column + para
+                text = f"[{page_num}.{column}.{para}] " + " ".join(
+                    sentence(seed + k) for k in range(2 + seed % 2))
+                rect = fitz.Rect(lefts[column], ys[column],
+                                 lefts[column] + column_width, page.rect.height - 50)
+                remaining = page.insert_textbox(rect, text, fontsize=9)
+                if remaining >= 0:
+                    ys[column] = rect.y1 - remaining + 6
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _png(width: int, height: int, seed: int) -> bytes:
+    """PNG giả lập (các dải nhiễu 8 dòng), xác định theo seed"""
+    rng = random.Random(seed)
+    samples = b"".join(rng.randbytes(width * 3) * 8 for _ in range(-(-height // 8)))
+    pix = fitz.Pixmap(fitz.csRGB, width, height, samples[:width * height * 3], 0)
+    return pix.tobytes("png")
+
+
+def make_image_pdf(path: str, pages: int = 300, parts: int = 6,
+                   figures_every: int = 10) -> str:
+    """
+    PDF có logo ở đầu mỗi trang và 1 hình (1200x800 px) mỗi figures_every trang
+    
+    Ghép từ `parts` file con như báo cáo gộp nhiều phần: mỗi phần có xref
+    logo riêng nhưng cùng nội dung.
+    """
+    if fitz is None:
+        raise ImportError("PyMuPDF is required: pip install PyMuPDF")
+    
+    logo = _png(600, 200, 1)
+    doc = fitz.open()
+    per_part = -(-pages // parts)
+    for start in range(0, pages, per_part):
+        part = fitz.open()
+        for page_num in range(start, min(start + per_part, pages)):
+            page = part.new_page()
+            page.insert_image(fitz.Rect(72, 24, 162, 54), stream=logo)
+            page.insert_text((72, 100), sentence(page_num), fontsize=11)
+            if figures_every and page_num % figures_every == 0:
+                page.insert_image(fitz.Rect(72, 140, 372, 340),
+                                  stream=_png(1200, 800, page_num + 2))
+        doc.insert_pdf(part)
+        part.close()
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def make_docx(path: str, pages: int = 300, paragraphs_per_page: int = 10,
+              pages_per_chapter: int = 15, tables_every: int = 0,
+              table_rows: int = 6, table_cols: int = 4, merged: bool = False,
+              fragmented: bool = False) -> str:
+    """
+    DOCX giả lập kiểu luận văn: Heading 1/2, đoạn văn có runs đậm/nghiêng,
+    danh sách, và 1 bảng table_rows x table_cols mỗi tables_every trang
+    (0 = không có bảng). merged=True: gộp 2 ô cuối của hàng tiêu đề và gộp
+    dọc cột đầu theo nhóm 3 hàng. fragmented=True: mỗi từ là 1 run riêng
+    (như file sửa nhiều lần trong Word).
+    """
+    import docx
+    from docx.table import _Cell
+    
+    document = docx.Document()
+    document.core_properties.title = "Luan van tot nghiep"
+    document.core_properties.author = "Nguyen Van A"
+    for page in range(pages):
+        if page % pages_per_chapter == 0:
+            document.add_heading(f"Chuong {page // pages_per_chapter + 1}", level=1)
+        document.add_heading(f"Muc {page + 1}", level=2)
+        for i in range(paragraphs_per_page):
+            seed = page * paragraphs_per_page + i
+            if i % 5 == 4:
+                document.add_paragraph(sentence(seed, 6), style="List Bullet")
+                continue
+            if fragmented:
+                para = document.add_paragraph()
+                for word in sentence(seed).split():
+                    para.add_run(word + " ")
+                for word in sentence(seed + 1, 3).split():
+                    para.add_run(word + " ").bold = True
+                for word in sentence(seed + 2, 5).split():
+                    para.add_run(word + " ").italic = True
+                continue
+            para = document.add_paragraph(sentence(seed) + " ")
+            para.add_run(sentence(seed + 1, 3)).bold = True
+            para.add_run(" " + sentence(seed + 2, 5)).italic = True
+        if tables_every and page % tables_every == 0:
+            table = document.add_table(rows=table_rows, cols=table_cols)
+            # Ghi thẳng từng w:tc (table.cell()/row.cells rất chậm với bảng lớn)
+            for r, tr in enumerate(table._tbl.tr_lst):
+                for c, tc in enumerate(tr.tc_lst):
+                    _Cell(tc, table).text = (f"Cot {c + 1}" if r == 0
+                                             else sentence(r * table_cols + c, 3))
+                if merged and r == 0:
+                    tr.tc_lst[-2].grid_span = 2
+                    tr.remove(tr.tc_lst[-1])
+                elif merged:
+                    tc = tr.tc_lst[0]
+                    tc.vMerge = "restart" if r % 3 == 1 else "continue"
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document.save(path)
+    return path
@@ -1,4 +1,5 @@
 """Exporters Package"""
 from .latex_exporter import LaTeXExporter, export_to_latex
+from .jsonl_exporter import JSONLExporter, export_to_jsonl
 
-__all__ = ["LaTeXExporter", "export_to_latex"]
+__all__ = ["LaTeXExporter", "export_to_latex", "JSONLExporter", "export_to_jsonl"]
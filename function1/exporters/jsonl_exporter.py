@@ -0,0 +1,114 @@
+"""
+JSONL Exporter
+===============
+Export chunks thành JSON Lines: mỗi chunk 1 record, ghi ngay khi chunk được tạo
+
+Mỗi record có Markdown của chunk, title path, khoảng trang nguồn và text đã bỏ
+formatting (cho embedding/RAG). Chỉ giữ 1 chunk trong bộ nhớ tại một thời điểm.
+"""
+
+import io
+import json
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from function1.parsers.ir import Block, BlockType, Section
+from function1.processors.chunk_writer import page_range
+
+
+def _runs_text(runs) -> str:
+    return "".join(run.text for run in runs)
+
+
+def _block_plain_text(block: Block) -> str:
+    """Text của 1 block, không markdown"""
+    if block.type == BlockType.LIST:
+        return "\n".join(_runs_text(item.content) for item in block.items)
+    if block.type == BlockType.TABLE:
+        return "\n".join("\t".join(_runs_text(cell.content) for cell in row.cells)
+                         for row in block.rows)
+    if block.type == BlockType.CODE and block.content is not None:
+        return block.content
+    if block.type == BlockType.IMAGE:
+        return block.caption or ""
+    if block.type == BlockType.PAGEBREAK:
+        return ""
+    return _runs_text(block.runs)
+
+
+def plain_text(section: Section) -> str:
+    """Text của section (title + các block), các block cách nhau 1 dòng trống"""
+    parts = [section.title]
+    for block in section.blocks:
+        text = _block_plain_text(block)
+        if text:
+            parts.append(text)
+    return "\n\n".join(parts)
+
+
+def chunk_record(chunk: Section, index: int, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Record JSON của 1 chunk
+    
+    Returns:
+        {"id", "source", "title", "path", "level", "pages", "text", "plain"}
+        ("pages" = [đầu, cuối] đánh số từ 1 như chunks.json, None nếu không có)
+    """
+    markdown = io.StringIO()
+    chunk.write_markdown(markdown)
+    pages = page_range(chunk)
+    return {
+        "id": index,
+        "source": source,
+        "title": chunk.title,
+        "path": chunk.metadata.get("breadcrumb") or [chunk.title],
+        "level": chunk.level,
+        "pages": list(pages) if pages else None,
+        "text": markdown.getvalue(),
+        "plain": plain_text(chunk),
+    }
+
+
+class JSONLExporter:
+    """
+    Ghi chunks vào 1 file JSONL (hoặc stdout) đã mở
+    
+    Example:
+        >>> with open("thesis.jsonl", "w", encoding="utf-8") as f:
+        ...     exporter = JSONLExporter(f, source="thesis.pdf")
+        ...     for chunk in splitter.iter_split(parser.iter_sections(path)):
+        ...         exporter.write(chunk)
+    """
+    
+    def __init__(self, fp: TextIO, source: Optional[str] = None):
+        """
+        Args:
+            fp: File-like object (text) để ghi records
+            source: Tên file nguồn, ghi vào mỗi record
+        """
+        self.fp = fp
+        self.source = source
+        self.count = 0
+    
+    def write(self, chunk: Section) -> None:
+        """Ghi record của chunk thành 1 dòng"""
+        self.count += 1
+        json.dump(chunk_record(chunk, self.count, self.source), self.fp, ensure_ascii=False)
+        self.fp.write("\n")
+    
+    def write_all(self, chunks: Iterable[Section]) -> int:
+        """Ghi mọi chunk, trả về số record đã ghi"""
+        for chunk in chunks:
+            self.write(chunk)
+        return self.count
+
+
+def export_to_jsonl(chunks: Iterable[Section], output_path: str,
+                    source: Optional[str] = None) -> int:
+    """
+    Hàm tiện ích: ghi chunks vào output_path
+    
+    Returns:
+        Số record đã ghi
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        return JSONLExporter(f, source).write_all(chunks)
@@ -4,9 +4,11 @@ LaTeX Exporter
 Export Document IR to LaTeX format
 """
 
+import io
 import os
+import re
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, TextIO
 from string import Template
 
 from function1.parsers.ir import Document, Section, Block, BlockType, Run
@@ -97,6 +99,34 @@ $content
 """)
 
 
+# Ký tự đặc biệt của LaTeX → chuỗi thay thế (thay 1 lượt, nên "{}" sinh ra
+# bởi \textbackslash{} không bị escape lại)
+LATEX_ESCAPES = {
+    '\\': '\\textbackslash{}',
+    '&': '\\&',
+    '%': '\\%',
+    '$': '\\$',
+    '#': '\\#',
+    '_': '\\_',
+    '{': '\\{',
+    '}': '\\}',
+    '~': '\\textasciitilde{}',
+    '^': '\\textasciicircum{}',
+}
+_LATEX_SPECIAL = re.compile("[" + re.escape("".join(LATEX_ESCAPES)) + "]")
+
+
+def _latex_char(match) -> str:
+    return LATEX_ESCAPES[match[0]]
+
+
+def escape_latex(text: str) -> str:
+    """Escape ký tự đặc biệt của LaTeX trong 1 lượt quét (text thường: trả lại nguyên)"""
+    if not text or not _LATEX_SPECIAL.search(text):
+        return text or ""
+    return _LATEX_SPECIAL.sub(_latex_char, text)
+
+
 class LaTeXExporter:
     """Export Document IR to LaTeX"""
     
@@ -119,25 +149,22 @@ class LaTeXExporter:
         
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         
-        # Generate content from sections
-        content_parts = []
-        for section in document.sections:
-            content_parts.append(self._export_section(section))
-        
-        content = "\n\n".join(content_parts)
-        
-        # Fill main template
+        # Fill main template, ghi từng section thẳng vào file
         from datetime import datetime
         
-        latex = MAIN_TEMPLATE.substitute(
+        head, tail = _template_parts(
             title=self._escape_latex(document.title),
             author=self._escape_latex(document.author),
             date=datetime.now().strftime("%d/%m/%Y"),
-            content=content
         )
         
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(latex)
+            f.write(head)
+            for i, section in enumerate(document.sections):
+                if i:
+                    f.write("\n\n")
+                self.write_section(f, section)
+            f.write(tail)
         
         print(f"✅ Exported: {output_path}")
         return output_path
@@ -157,23 +184,35 @@ class LaTeXExporter:
         saved_files = []
         
         for i, section in enumerate(sections, 1):
-            filename = f"chapter_{i:02d}.tex"
-            filepath = os.path.join(output_dir, filename)
-            
-            latex = self._export_section(section)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(latex)
-            
-            saved_files.append(filepath)
-            print(f"✓ Saved: {filename}")
+            saved_files.append(self.export_section_file(section, output_dir, i))
         
         # Create main.tex that includes all chapters
-        self._create_main_include(saved_files, output_dir)
+        self.create_main_include(saved_files, output_dir)
         
         return saved_files
     
-    def _create_main_include(self, chapter_files: List[str], output_dir: str):
+    def export_section_file(self, section: Section, output_dir: str, index: int) -> str:
+        """
+        Export 1 section to chapter_XX.tex (output_dir phải tồn tại)
+        
+        Args:
+            section: Section cần export
+            output_dir: Output directory
+            index: Số thứ tự chapter (bắt đầu từ 1)
+        
+        Returns:
+            Đường dẫn file đã tạo
+        """
+        filename = f"chapter_{index:02d}.tex"
+        filepath = os.path.join(output_dir, filename)
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            self.write_section(f, section)
+        
+        print(f"✓ Saved: {filename}")
+        return filepath
+    
+    def create_main_include(self, chapter_files: List[str], output_dir: str):
         """Create main.tex that includes all chapter files"""
         includes = []
         for filepath in chapter_files:
@@ -200,92 +239,90 @@ class LaTeXExporter:
     
     def _export_section(self, section: Section) -> str:
         """Export single section to LaTeX"""
-        lines = []
+        buffer = io.StringIO()
+        self.write_section(buffer, section)
+        return buffer.getvalue()
+    
+    def write_section(self, fp: TextIO, section: Section) -> None:
+        """
+        Ghi LaTeX của section vào file-like object, từng block một
         
+        Phần tiếp theo của 1 section bị Splitter tách theo max_chars
+        (metadata["part"] > 1) không có \\chapter/\\label riêng.
+        """
         # Add chapter/section header
-        if section.level == 1:
+        continued = section.metadata.get("part", 1) > 1
+        if section.level == 1 and not continued:
             label = self._make_label(section.title)
-            lines.append(f"\\chapter{{{self._escape_latex(section.title)}}}")
-            lines.append(f"\\label{{ch:{label}}}")
-        elif section.level == 2:
+            fp.write(f"\\chapter{{{self._escape_latex(section.title)}}}\n")
+            fp.write(f"\\label{{ch:{label}}}\n")
+        elif section.level == 2 and not continued:
             label = self._make_label(section.title)
-            lines.append(f"\\section{{{self._escape_latex(section.title)}}}")
-            lines.append(f"\\label{{sec:{label}}}")
+            fp.write(f"\\section{{{self._escape_latex(section.title)}}}\n")
+            fp.write(f"\\label{{sec:{label}}}\n")
         
-        lines.append("")
-        
-        # Export blocks
+        # Export blocks (mỗi block cách nhau 1 dòng)
         for block in section.blocks:
-            lines.append(self._export_block(block))
-        
-        return "\n".join(lines)
+            fp.write("\n")
+            self._write_block(fp, block)
     
     def _export_block(self, block: Block) -> str:
         """Export single block to LaTeX"""
+        buffer = io.StringIO()
+        self._write_block(buffer, block)
+        return buffer.getvalue()
+    
+    def _write_block(self, fp: TextIO, block: Block) -> None:
+        """Ghi LaTeX của 1 block"""
         if block.type == BlockType.HEADING:
-            level = block.level
-            text = self._runs_to_latex(block.runs)
-            
-            if level == 2:
-                return f"\\section{{{text}}}\n"
-            elif level == 3:
-                return f"\\subsection{{{text}}}\n"
-            elif level == 4:
-                return f"\\subsubsection{{{text}}}\n"
-            else:
-                return f"\\paragraph{{{text}}}\n"
+            command = _HEADING_COMMANDS.get(block.level, "paragraph")
+            fp.write(f"\\{command}{{{self._runs_to_latex(block.runs)}}}\n")
         
         elif block.type == BlockType.PARAGRAPH:
-            text = self._runs_to_latex(block.runs)
-            return f"{text}\n"
+            fp.write(f"{self._runs_to_latex(block.runs)}\n")
         
         elif block.type == BlockType.LIST:
             env = "enumerate" if block.ordered else "itemize"
-            items = []
+            fp.write(f"\\begin{{{env}}}\n")
             for item in block.items:
-                item_text = self._runs_to_latex(item.content)
-                items.append(f"\\item {item_text}")
-            
-            return f"\\begin{{{env}}}\n" + "\n".join(items) + f"\n\\end{{{env}}}\n"
+                fp.write(f"\\item {self._runs_to_latex(item.content)}\n")
+            fp.write(f"\\end{{{env}}}\n")
         
         elif block.type == BlockType.QUOTE:
-            text = self._runs_to_latex(block.runs)
-            return f"\\begin{{quote}}\n{text}\n\\end{{quote}}\n"
+            fp.write(f"\\begin{{quote}}\n{self._runs_to_latex(block.runs)}\n\\end{{quote}}\n")
         
         elif block.type == BlockType.TABLE:
-            return self._export_table(block)
+            self._write_table(fp, block)
         
         elif block.type == BlockType.IMAGE:
             if block.image_path:
-                return f"\\includegraphics[width=0.8\\textwidth]{{{block.image_path}}}\n"
-            return ""
-        
-        return ""
+                fp.write(f"\\includegraphics[width=0.8\\textwidth]{{{block.image_path}}}\n")
     
     def _export_table(self, block: Block) -> str:
         """Export table block to LaTeX"""
+        buffer = io.StringIO()
+        self._write_table(buffer, block)
+        return buffer.getvalue()
+    
+    def _write_table(self, fp: TextIO, block: Block) -> None:
+        """Ghi table block, từng hàng một"""
         if not block.rows:
-            return ""
+            return
         
-        num_cols = len(block.rows[0].cells) if block.rows else 0
+        num_cols = len(block.rows[0].cells)
         col_spec = "|" + "l|" * num_cols
         
-        lines = [f"\\begin{{tabular}}{{{col_spec}}}"]
-        lines.append("\\hline")
-        
+        fp.write(f"\\begin{{tabular}}{{{col_spec}}}\n\\hline\n")
         for row in block.rows:
             cells = [self._runs_to_latex(cell.content) for cell in row.cells]
-            lines.append(" & ".join(cells) + " \\\\")
-            lines.append("\\hline")
-        
-        lines.append("\\end{tabular}")
-        return "\n".join(lines) + "\n"
+            fp.write(" & ".join(cells) + " \\\\\n\\hline\n")
+        fp.write("\\end{tabular}\n")
     
     def _runs_to_latex(self, runs: List[Run]) -> str:
         """Convert runs to LaTeX text"""
         parts = []
         for run in runs:
-            text = self._escape_latex(run.text)
+            text = escape_latex(run.text)
             if run.bold and run.italic:
                 text = f"\\textbf{{\\textit{{{text}}}}}"
             elif run.bold:
@@ -297,26 +334,7 @@ class LaTeXExporter:
     
     def _escape_latex(self, text: str) -> str:
         """Escape special LaTeX characters"""
-        if not text:
-            return ""
-        
-        replacements = {
-            '\\': '\\textbackslash{}',
-            '&': '\\&',
-            '%': '\\%',
-            '$': '\\$',
-            '#': '\\#',
-            '_': '\\_',
-            '{': '\\{',
-            '}': '\\}',
-            '~': '\\textasciitilde{}',
-            '^': '\\textasciicircum{}',
-        }
-        
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        
-        return text
+        return escape_latex(text)
     
     def _make_label(self, text: str) -> str:
         """Create safe label from text"""
@@ -324,6 +342,15 @@ class LaTeXExporter:
         return safe[:30]
 
 
+_HEADING_COMMANDS = {2: "section", 3: "subsection", 4: "subsubsection"}
+
+
+def _template_parts(**values) -> tuple:
+    """MAIN_TEMPLATE đã điền values, tách thành (phần trước, phần sau) $content"""
+    head, tail = MAIN_TEMPLATE.template.split("$content", 1)
+    return Template(head).substitute(**values), Template(tail).substitute(**values)
+
+
 def export_to_latex(document: Document, output_path: str) -> str:
     """
     Hàm tiện ích để export document sang LaTeX
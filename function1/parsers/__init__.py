@@ -1,17 +1,24 @@
 """Parsers Package"""
 from .ir import (
     Document, Section, Block, BlockType, Run, ListItem, TableRow, TableCell,
+    SectionBuilder,
     create_paragraph, create_heading, create_list
 )
 from .pdf_parser import PDFParser, parse_pdf
 from .docx_parser import DOCXParser, parse_docx
+from .ir_cache import IRCache, default_cache_dir
+from .outline import scan_outline
 
 __all__ = [
     # IR
     "Document", "Section", "Block", "BlockType", "Run",
-    "ListItem", "TableRow", "TableCell",
+    "ListItem", "TableRow", "TableCell", "SectionBuilder",
     "create_paragraph", "create_heading", "create_list",
     # Parsers
     "PDFParser", "parse_pdf",
     "DOCXParser", "parse_docx",
+    # Cache
+    "IRCache", "default_cache_dir",
+    # Outline
+    "scan_outline",
 ]
@@ -5,39 +5,76 @@ Parse DOCX files using python-docx to IR
 """
 
 import os
+import zipfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional
 
 from docx import Document as DocxDocument
+from docx.oxml.ns import qn
 from docx.shared import Pt
+from docx.text.paragraph import Paragraph
 
 from .ir import (
-    Document, Section, Block, BlockType, Run, ListItem, TableRow, TableCell,
-    create_paragraph, create_heading
+    Document, Section, Block, BlockType, Run, ListItem,
+    SectionBuilder, create_paragraph, create_heading, title_matches
 )
+from .docx_stream import core_properties, iter_body, table_block
+from .docx_styles import StyleFormat, StyleResolver
+from .normalize import new_counts, normalize_sections
+
+
+CORE_PROPERTIES = "docProps/core.xml"
+DEFAULT_CORE_TITLE = "Word Document"
+
+_P = qn("w:p")
+_TBL = qn("w:tbl")
 
 
 class DOCXParser:
     """Parse DOCX files to Intermediate Representation"""
     
-    def __init__(self):
-        pass
+    # Tăng khi output IR thay đổi (invalidate IR cache)
+    VERSION = "4"
+    
+    def __init__(self, sections: Optional[List[str]] = None, reader: str = "python-docx",
+                 normalize: bool = True):
+        """
+        Args:
+            sections: Chỉ giữ các chương (Heading 1) có tiêu đề này,
+                vd ["Chương 3"]
+            reader: "python-docx" hoặc "stream" (iterparse thẳng
+                word/document.xml, cùng IR nhưng nhanh hơn nhiều)
+            normalize: Gộp các runs liền nhau cùng formatting, bỏ runs rỗng
+        """
+        if reader not in ("python-docx", "stream"):
+            raise ValueError(f"Unknown DOCX reader: {reader}")
+        
+        self.sections = list(sections) if sections else None
+        self.reader = reader
+        self.normalize = normalize
+        # Thống kê gộp runs ở lần parse gần nhất
+        self.normalized = new_counts()
+    
+    def cache_options(self) -> dict:
+        """Options ảnh hưởng tới output IR (dùng làm cache key)"""
+        options = {}
+        if self.sections:
+            options["sections"] = self.sections
+        if not self.normalize:
+            options["normalize"] = False
+        return options
     
-    def parse(self, docx_path: str) -> Document:
+    def parse(self, docx_path: str, sections: Optional[List[str]] = None) -> Document:
         """
         Parse DOCX file to Document IR
         
         Args:
             docx_path: Đường dẫn đến file DOCX
+            sections: Chỉ giữ các chương này, mặc định self.sections
         
         Returns:
             Document object chứa nội dung đã parse
         """
-        if not os.path.exists(docx_path):
-            raise FileNotFoundError(f"File not found: {docx_path}")
-        
-        docx = DocxDocument(docx_path)
-        
         # Create IR Document
         ir_doc = Document(
             title=Path(docx_path).stem,
@@ -45,6 +82,16 @@ class DOCXParser:
             source_type="docx"
         )
         
+        if self.reader == "stream":
+            self._check_exists(docx_path)
+            with zipfile.ZipFile(docx_path) as archive:
+                self._core_properties(archive, ir_doc)
+                ir_doc.sections.extend(self._select(self._iter_sections_stream(archive),
+                                                    sections))
+            return ir_doc
+        
+        docx = self._open(docx_path)
+        
         # Get core properties if available
         try:
             if docx.core_properties.title:
@@ -54,118 +101,204 @@ class DOCXParser:
         except:
             pass
         
-        current_section = None
+        ir_doc.sections.extend(self._select(self._iter_sections(docx), sections))
+        return ir_doc
+    
+    def document_info(self, docx_path: str) -> Document:
+        """Document (title, author, nguồn) chưa có sections, chỉ đọc docProps"""
+        self._check_exists(docx_path)
+        ir_doc = Document(
+            title=Path(docx_path).stem,
+            source_path=docx_path,
+            source_type="docx"
+        )
+        with zipfile.ZipFile(docx_path) as archive:
+            self._core_properties(archive, ir_doc)
+        return ir_doc
+    
+    def _core_properties(self, archive: zipfile.ZipFile, ir_doc: Document) -> None:
+        """title/author từ docProps/core.xml (giống python-docx)"""
+        props = core_properties(archive)
+        if CORE_PROPERTIES not in archive.namelist():
+            # python-docx tự tạo core properties mặc định khi file không có
+            props["title"] = DEFAULT_CORE_TITLE
+        ir_doc.title = props["title"] or ir_doc.title
+        ir_doc.author = props["author"] or ir_doc.author
+    
+    def iter_sections(self, docx_path: str,
+                      sections: Optional[List[str]] = None) -> Iterator[Section]:
+        """
+        Parse DOCX và yield từng Section ngay khi gặp H1 tiếp theo
         
-        for para in docx.paragraphs:
-            text = para.text.strip()
+        Args:
+            docx_path: Đường dẫn đến file DOCX
+            sections: Chỉ giữ các chương này, mặc định self.sections
+        
+        Yields:
+            Section đã hoàn chỉnh, theo thứ tự trong file
+        """
+        if self.reader == "stream":
+            self._check_exists(docx_path)
+            with zipfile.ZipFile(docx_path) as archive:
+                yield from self._select(self._iter_sections_stream(archive), sections)
+            return
+        
+        yield from self._select(self._iter_sections(self._open(docx_path)), sections)
+    
+    def _select(self, all_sections: Iterator[Section],
+                sections: Optional[List[str]]) -> Iterator[Section]:
+        """Lọc sections theo tiêu đề chương, rồi chuẩn hóa runs (nếu bật)"""
+        self.normalized = new_counts()
+        if self.normalize:
+            yield from normalize_sections(self._filter(all_sections, sections),
+                                          self.normalized)
+        else:
+            yield from self._filter(all_sections, sections)
+    
+    def _filter(self, all_sections: Iterator[Section],
+                sections: Optional[List[str]]) -> Iterator[Section]:
+        sections = self.sections if sections is None else sections
+        if not sections:
+            yield from all_sections
+            return
+        
+        found = set()
+        for section in all_sections:
+            for query in sections:
+                if title_matches(section.title, query):
+                    found.add(query)
+                    yield section
+                    break
+        
+        missing = [query for query in sections if query not in found]
+        if missing:
+            raise ValueError(f"Section not found in DOCX: {', '.join(missing)}")
+    
+    def _check_exists(self, docx_path: str) -> None:
+        if not os.path.exists(docx_path):
+            raise FileNotFoundError(f"File not found: {docx_path}")
+    
+    def _open(self, docx_path: str):
+        """Mở file DOCX bằng python-docx"""
+        self._check_exists(docx_path)
+        return DocxDocument(docx_path)
+    
+    def _iter_sections(self, docx) -> Iterator[Section]:
+        """
+        Duyệt 1 lượt các phần tử con của w:body (paragraph và bảng theo
+        đúng thứ tự trong file), yield sections
+        """
+        builder = SectionBuilder()
+        styles = StyleResolver.from_docx(docx)
+        
+        for child in docx.element.body.iterchildren():
+            if child.tag == _TBL:
+                # Dựng lưới trực tiếp từ XML (row.cells bậc 2 với ô gộp dọc)
+                builder.add(table_block(child))
+                continue
+            if child.tag != _P:
+                continue
             
+            para = Paragraph(child, docx)
+            text = para.text.strip()
             if not text:
                 continue
             
-            # Detect heading by style
-            style_name = para.style.name.lower() if para.style else ""
-            
-            if "heading 1" in style_name or style_name == "title":
-                # H1 - Start new section
-                if current_section:
-                    ir_doc.sections.append(current_section)
-                current_section = Section(title=text, level=1)
-            
-            elif "heading 2" in style_name:
-                if current_section is None:
-                    current_section = Section(title="Document", level=1)
-                current_section.blocks.append(create_heading(text, 2))
-            
-            elif "heading 3" in style_name:
-                if current_section is None:
-                    current_section = Section(title="Document", level=1)
-                current_section.blocks.append(create_heading(text, 3))
+            fmt = styles.paragraph(child)
+            finished = self._add_paragraph(builder, fmt, text,
+                                           lambda: self._parse_runs(para, styles, fmt))
+            if finished:
+                yield finished
+        
+        # Add last section
+        last = builder.finish()
+        if last:
+            yield last
+    
+    def _iter_sections_stream(self, archive: zipfile.ZipFile) -> Iterator[Section]:
+        """reader="stream": duyệt w:body bằng iterparse, yield sections"""
+        builder = SectionBuilder()
+        
+        for item in iter_body(archive):
+            if item[0] == "tbl":
+                builder.add(item[1])
+                continue
             
-            elif "heading 4" in style_name:
-                if current_section is None:
-                    current_section = Section(title="Document", level=1)
-                current_section.blocks.append(create_heading(text, 4))
+            _, fmt, text, runs = item
+            text = text.strip()
+            if not text:
+                continue
             
-            elif "list" in style_name:
-                # List item
-                if current_section is None:
-                    current_section = Section(title="Document", level=1)
-                
-                # Check if last block is a list
-                if current_section.blocks and current_section.blocks[-1].type == BlockType.LIST:
-                    # Add to existing list
-                    current_section.blocks[-1].items.append(
-                        ListItem(content=self._parse_runs(para))
-                    )
-                else:
-                    # Create new list
-                    is_ordered = "number" in style_name
-                    current_section.blocks.append(Block(
-                        type=BlockType.LIST,
-                        ordered=is_ordered,
-                        items=[ListItem(content=self._parse_runs(para))]
-                    ))
+            finished = self._add_paragraph(builder, fmt, text, lambda: runs)
+            if finished:
+                yield finished
+        
+        last = builder.finish()
+        if last:
+            yield last
+    
+    def _add_paragraph(self, builder: SectionBuilder, fmt: StyleFormat, text: str,
+                       parse_runs: Callable[[], List[Run]]) -> Optional[Section]:
+        """
+        Thêm 1 paragraph (không rỗng) theo định dạng style của nó
+        
+        Returns:
+            Section vừa kết thúc nếu paragraph là H1, ngược lại None
+        """
+        style_name = fmt.name.lower()
+        level = fmt.heading_level
+        
+        # Detect heading by style (kể cả style kế thừa từ Heading n)
+        if level == 1 or style_name == "title":
+            # H1 - Start new section
+            return builder.start(text, level=1)
+        
+        if level in (2, 3, 4):
+            builder.add(create_heading(text, level))
+        
+        elif fmt.is_list:
+            # List item
+            current_section = builder.section
             
+            # Check if last block is a list
+            if current_section.blocks and current_section.blocks[-1].type == BlockType.LIST:
+                # Add to existing list
+                current_section.blocks[-1].items.append(
+                    ListItem(content=parse_runs())
+                )
             else:
-                # Normal paragraph
-                if current_section is None:
-                    current_section = Section(title="Document", level=1)
-                
-                runs = self._parse_runs(para)
+                # Create new list
+                is_ordered = "number" in style_name
                 current_section.blocks.append(Block(
-                    type=BlockType.PARAGRAPH,
-                    runs=runs
+                    type=BlockType.LIST,
+                    ordered=is_ordered,
+                    items=[ListItem(content=parse_runs())]
                 ))
         
-        # Parse tables
-        for table in docx.tables:
-            if current_section is None:
-                current_section = Section(title="Document", level=1)
-            
-            table_block = self._parse_table(table)
-            current_section.blocks.append(table_block)
-        
-        # Add last section
-        if current_section:
-            ir_doc.sections.append(current_section)
+        else:
+            # Normal paragraph
+            builder.add(Block(
+                type=BlockType.PARAGRAPH,
+                runs=parse_runs()
+            ))
         
-        return ir_doc
+        return None
     
-    def _parse_runs(self, para) -> List[Run]:
-        """Parse runs từ paragraph"""
+    def _parse_runs(self, para, styles: StyleResolver, fmt: StyleFormat) -> List[Run]:
+        """Parse runs từ paragraph (định dạng hiệu lực theo style)"""
         runs = []
         for run in para.runs:
             if run.text:
+                bold, italic, font_name, font_size = styles.run(run._r, fmt)
                 runs.append(Run(
                     text=run.text,
-                    bold=run.bold or False,
-                    italic=run.italic or False,
+                    bold=bold,
+                    italic=italic,
                     underline=run.underline is not None,
-                    font_name=run.font.name,
-                    font_size=run.font.size.pt if run.font.size else None
+                    font_name=font_name,
+                    font_size=font_size
                 ))
         return runs
-    
-    def _parse_table(self, table) -> Block:
-        """Parse table to Block"""
-        rows = []
-        
-        for i, row in enumerate(table.rows):
-            cells = []
-            for cell in row.cells:
-                text = cell.text.strip()
-                cells.append(TableCell(
-                    content=[Run(text=text)]
-                ))
-            rows.append(TableRow(
-                cells=cells,
-                is_header=(i == 0)  # First row is header
-            ))
-        
-        return Block(
-            type=BlockType.TABLE,
-            rows=rows
-        )
 
 
 def parse_docx(docx_path: str) -> Document:
@@ -0,0 +1,207 @@
+"""
+Streaming DOCX Reader
+======================
+Đọc thẳng word/document.xml bằng iterparse, không tạo object của python-docx
+
+Định dạng theo style được tính 1 lần cho mỗi style (StyleResolver); mỗi
+paragraph/table con trực tiếp của w:body được xử lý rồi giải phóng ngay.
+Text, runs và ô bảng theo đúng quy tắc của python-docx (para.text,
+para.runs, row.cells) để DOCXParser(reader="stream") cho cùng IR với
+reader mặc định.
+"""
+
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from .docx_styles import StyleFormat, StyleResolver
+from .ir import Block, BlockType, Run, TableRow, TableCell
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_R = _W + "r"
+_T = _W + "t"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_HYPERLINK = _W + "hyperlink"
+_RPR = _W + "rPr"
+_VAL = _W + "val"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_EP = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}"
+
+# Phần tử trong run → text tương đương (như python-docx)
+_RUN_TEXT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_BR = _W + "br"
+
+# ("p", StyleFormat, text, runs) hoặc ("tbl", TABLE block)
+BodyItem = Tuple
+
+
+def _run_text(r) -> str:
+    """Text của 1 w:r (w:t, tab, xuống dòng...)"""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _BR:
+            if child.get(_W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _run(r, text: str, styles: StyleResolver, fmt: StyleFormat) -> Run:
+    """w:r → Run (định dạng hiệu lực theo style, underline như python-docx)"""
+    bold, italic, font_name, font_size = styles.run(r, fmt)
+    rpr = r.find(_RPR)
+    underline = rpr.find(_W + "u") if rpr is not None else None
+    return Run(
+        text=text,
+        bold=bold,
+        italic=italic,
+        underline=underline is not None and underline.get(_VAL) is not None,
+        font_name=font_name,
+        font_size=font_size,
+    )
+
+
+def paragraph_text(p) -> str:
+    """Text của paragraph: runs và hyperlinks con trực tiếp (như para.text)"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterfind(_R))
+    return "".join(parts)
+
+
+def paragraph_runs(p, styles: StyleResolver, fmt: StyleFormat) -> List[Run]:
+    """Runs con trực tiếp có text (như para.runs, không gồm hyperlinks)"""
+    runs = []
+    for r in p.iterfind(_R):
+        text = _run_text(r)
+        if text:
+            runs.append(_run(r, text, styles, fmt))
+    return runs
+
+
+def _int_prop(parent, props: str, name: str, default: int) -> int:
+    """Giá trị số của parent/props/name (vd w:tcPr/w:gridSpan)"""
+    container = parent.find(_W + props)
+    if container is not None:
+        elem = container.find(_W + name)
+        if elem is not None and elem.get(_VAL, "").isdigit():
+            return int(elem.get(_VAL))
+    return default
+
+
+def _is_continue(tc) -> bool:
+    """Ô nối tiếp của vertical merge (vMerge không có val hoặc "continue")"""
+    tcpr = tc.find(_W + "tcPr")
+    if tcpr is None:
+        return False
+    vmerge = tcpr.find(_W + "vMerge")
+    return vmerge is not None and vmerge.get(_VAL, "continue") == "continue"
+
+
+def table_block(tbl) -> Block:
+    """
+    w:tbl → TABLE block, cùng text ô như row.cells của python-docx nhưng
+    tuyến tính: ô gridSpan=n lặp lại n lần, ô vMerge="continue" lấy text của
+    ô phía trên (nhớ theo grid offset thay vì dò ngược từng hàng)
+    """
+    rows = []
+    above: Dict[int, str] = {}   # grid offset → text của hàng trên
+    
+    for i, tr in enumerate(tbl.iterfind(_TR)):
+        current = {}
+        texts = []
+        offset = _int_prop(tr, "trPr", "gridBefore", 0)
+        for tc in tr.iterfind(_TC):
+            span = _int_prop(tc, "tcPr", "gridSpan", 1)
+            if _is_continue(tc):
+                text = above.get(offset, "")
+            else:
+                text = "\n".join(paragraph_text(p) for p in tc.iterfind(_P)).strip()
+            current[offset] = text
+            texts.extend([text] * span)
+            offset += span
+        above = current
+        
+        rows.append(TableRow(
+            cells=[TableCell(content=[Run(text=text)]) for text in texts],
+            is_header=(i == 0)
+        ))
+    
+    return Block(type=BlockType.TABLE, rows=rows)
+
+
+def iter_body(archive: zipfile.ZipFile) -> Iterator[BodyItem]:
+    """
+    Stream các phần tử con trực tiếp của w:body theo thứ tự trong file
+    
+    Yields:
+        ("p", StyleFormat, text, runs) cho paragraph, ("tbl", block) cho bảng
+    """
+    styles = StyleResolver.from_archive(archive)
+    
+    with archive.open("word/document.xml") as data:
+        depth = 0
+        body = None
+        for event, elem in iterparse(data, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if elem.tag == _BODY:
+                    body = elem
+                continue
+            
+            depth -= 1
+            if depth != 2 or body is None:
+                continue
+            
+            # Con trực tiếp của body đã parse xong
+            if elem.tag == _P:
+                fmt = styles.paragraph(elem)
+                yield ("p", fmt, paragraph_text(elem), paragraph_runs(elem, styles, fmt))
+            elif elem.tag == _TBL:
+                yield ("tbl", table_block(elem))
+            
+            # Giải phóng phần tử đã xử lý (bộ nhớ ~ hằng số)
+            body.remove(elem)
+
+
+def core_properties(archive: zipfile.ZipFile) -> Dict[str, Optional[str]]:
+    """title/author từ docProps/core.xml, số trang từ docProps/app.xml"""
+    props = {"title": None, "author": None, "pages": None}
+    
+    try:
+        with archive.open("docProps/core.xml") as data:
+            for _, elem in iterparse(data):
+                if elem.tag == _DC + "title" and elem.text:
+                    props["title"] = elem.text.strip()
+                elif elem.tag == _DC + "creator" and elem.text:
+                    props["author"] = elem.text.strip()
+    except KeyError:
+        pass
+    
+    # Số trang do Word lưu lại khi save (có thể không có)
+    try:
+        with archive.open("docProps/app.xml") as data:
+            for _, elem in iterparse(data):
+                if elem.tag == _EP + "Pages" and elem.text and elem.text.isdigit():
+                    props["pages"] = int(elem.text)
+    except KeyError:
+        pass
+    
+    return props
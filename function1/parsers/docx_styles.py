@@ -0,0 +1,267 @@
+"""
+DOCX Style Resolver
+====================
+Định dạng hiệu lực của paragraph/run trong DOCX theo chuỗi style
+
+styles.xml được đọc 1 lần cho mỗi document; định dạng của mỗi style (font,
+cỡ chữ, đậm/nghiêng, cấp heading, có phải list) được tính qua chuỗi basedOn
+và docDefaults rồi memoize, nên mỗi paragraph/run chỉ tốn 1 lần tra dict.
+Dùng chung cho DOCXParser (cả 2 reader), ContentExtractor và ND30Validator.
+"""
+
+import re
+import zipfile
+from dataclasses import dataclass, replace
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from xml.etree.ElementTree import parse as parse_xml
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_VAL = _W + "val"
+_RPR = _W + "rPr"
+_PPR = _W + "pPr"
+
+_ON = ("1", "true", "on")
+_HEADING = re.compile(r"heading (\d)")
+
+# Tên nội bộ → tên hiển thị (như docx.styles.BabelFish của python-docx)
+_UI_NAMES = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {n}": f"Heading {n}" for n in range(1, 10)},
+}
+
+# Không có outline level (w:outlineLvl="9" = body text)
+_BODY_LEVEL = 9
+
+
+@dataclass(frozen=True)
+class StyleFormat:
+    """Định dạng hiệu lực của 1 paragraph style (đã gộp basedOn + docDefaults)"""
+    name: str = ""
+    font_name: Optional[str] = None
+    font_size: Optional[float] = None
+    bold: bool = False
+    italic: bool = False
+    heading_level: Optional[int] = None
+    is_list: bool = False
+
+
+class RunFormat(NamedTuple):
+    """Định dạng hiệu lực của 1 run"""
+    bold: bool
+    italic: bool
+    font_name: Optional[str]
+    font_size: Optional[float]
+
+
+def _on_off(elem) -> bool:
+    """Giá trị OnOff (w:b, w:i...): True nếu thiếu w:val"""
+    val = elem.get(_VAL)
+    return val is None or val in _ON
+
+
+def _rpr_props(rpr) -> dict:
+    """Các thuộc tính run có khai báo trong w:rPr"""
+    props = {}
+    for child in rpr:
+        tag = child.tag
+        if tag == _W + "rFonts":
+            if child.get(_W + "ascii"):
+                props["font_name"] = child.get(_W + "ascii")
+        elif tag == _W + "sz":
+            if (child.get(_VAL) or "").isdigit():
+                props["font_size"] = int(child.get(_VAL)) / 2
+        elif tag == _W + "b":
+            props["bold"] = _on_off(child)
+        elif tag == _W + "i":
+            props["italic"] = _on_off(child)
+    return props
+
+
+def _ppr_props(ppr) -> dict:
+    """Các thuộc tính paragraph có khai báo trong w:pPr (outline level, numbering)"""
+    props = {}
+    outline = ppr.find(_W + "outlineLvl")
+    if outline is not None and (outline.get(_VAL) or "").isdigit():
+        props["outline"] = int(outline.get(_VAL))
+    num = ppr.find(_W + "numPr")
+    if num is not None:
+        num_id = num.find(_W + "numId")
+        # numId="0" = tắt numbering kế thừa
+        props["numbered"] = num_id is None or num_id.get(_VAL) != "0"
+    return props
+
+
+def _name_level(name: str) -> Optional[int]:
+    match = _HEADING.search(name.lower())
+    return int(match.group(1)) if match else None
+
+
+class StyleResolver:
+    """
+    Tra định dạng hiệu lực theo style, memoize theo style ID
+    
+    Example:
+        >>> styles = StyleResolver.from_docx(docx_document)
+        >>> fmt = styles.paragraph(para._p)
+        >>> fmt.heading_level, styles.run(para.runs[0]._r, fmt).font_name
+    """
+    
+    def __init__(self, root=None):
+        """
+        Args:
+            root: Phần tử w:styles (ElementTree hoặc lxml), None nếu không có
+        """
+        # styleId → (type, tên, basedOn, props)
+        self._styles: Dict[str, Tuple[str, str, Optional[str], dict]] = {}
+        self._defaults: dict = {}
+        self._default_id: Optional[str] = None
+        self._paragraph_cache: Dict[Optional[str], StyleFormat] = {}
+        self._character_cache: Dict[Tuple[StyleFormat, str], StyleFormat] = {}
+        
+        if root is not None:
+            self._load(root)
+    
+    @classmethod
+    def from_archive(cls, archive: zipfile.ZipFile) -> "StyleResolver":
+        """Đọc word/styles.xml từ file DOCX đã mở bằng zipfile"""
+        try:
+            data = archive.open("word/styles.xml")
+        except KeyError:
+            return cls()
+        with data:
+            return cls(parse_xml(data).getroot())
+    
+    @classmethod
+    def from_docx(cls, docx) -> "StyleResolver":
+        """Dùng styles part của python-docx Document (không parse lại XML)"""
+        return cls(docx.styles.element)
+    
+    def _load(self, root) -> None:
+        rpr = root.find(f"{_W}docDefaults/{_W}rPrDefault/{_RPR}")
+        if rpr is not None:
+            self._defaults = _rpr_props(rpr)
+        
+        for style in root.iterfind(_W + "style"):
+            style_type = style.get(_W + "type", "paragraph")
+            name_elem = style.find(_W + "name")
+            name = name_elem.get(_VAL, "") if name_elem is not None else ""
+            based_on = style.find(_W + "basedOn")
+            
+            props = {}
+            ppr = style.find(_PPR)
+            if ppr is not None:
+                props.update(_ppr_props(ppr))
+            rpr = style.find(_RPR)
+            if rpr is not None:
+                props.update(_rpr_props(rpr))
+            
+            style_id = style.get(_W + "styleId")
+            self._styles[style_id] = (
+                style_type, _UI_NAMES.get(name, name),
+                based_on.get(_VAL) if based_on is not None else None, props,
+            )
+            if (style_type == "paragraph" and self._default_id is None
+                    and style.get(_W + "default") in _ON):
+                self._default_id = style_id
+    
+    def style_ids(self, style_type: str = "paragraph") -> List[str]:
+        """ID của các style loại style_type, theo thứ tự trong styles.xml"""
+        return [style_id for style_id, entry in self._styles.items()
+                if entry[0] == style_type]
+    
+    def _chain(self, style_id: Optional[str], style_type: str) -> list:
+        """Style và các style cha (basedOn), style gần nhất trước"""
+        chain = []
+        seen = set()
+        while style_id is not None and style_id not in seen:
+            entry = self._styles.get(style_id)
+            if entry is None or entry[0] != style_type:
+                break
+            seen.add(style_id)
+            chain.append(entry)
+            style_id = entry[2]
+        return chain
+    
+    def style(self, style_id: Optional[str]) -> StyleFormat:
+        """
+        Định dạng hiệu lực của paragraph style (memoize)
+        
+        Style ID không có/không tồn tại → style paragraph mặc định.
+        """
+        fmt = self._paragraph_cache.get(style_id)
+        if fmt is not None:
+            return fmt
+        
+        chain = self._chain(style_id, "paragraph")
+        if not chain:
+            chain = self._chain(self._default_id, "paragraph")
+        
+        props = dict(self._defaults)
+        for entry in reversed(chain):
+            props.update(entry[3])
+        
+        # Cấp heading: theo tên style gần nhất trong chuỗi, rồi outline level
+        level = next((lvl for lvl in (_name_level(e[1]) for e in chain) if lvl), None)
+        if level is None and props.get("outline", _BODY_LEVEL) < _BODY_LEVEL:
+            level = props["outline"] + 1
+        
+        name = chain[0][1] if chain else ""
+        fmt = StyleFormat(
+            name=name,
+            font_name=props.get("font_name"),
+            font_size=props.get("font_size"),
+            bold=props.get("bold", False),
+            italic=props.get("italic", False),
+            heading_level=level,
+            is_list="list" in name.lower() or props.get("numbered", False),
+        )
+        self._paragraph_cache[style_id] = fmt
+        return fmt
+    
+    def paragraph(self, p) -> StyleFormat:
+        """Định dạng hiệu lực của phần tử w:p (theo w:pStyle)"""
+        ppr = p.find(_PPR)
+        if ppr is not None:
+            pstyle = ppr.find(_W + "pStyle")
+            if pstyle is not None:
+                return self.style(pstyle.get(_VAL))
+        return self.style(None)
+    
+    def _with_character(self, paragraph: StyleFormat, style_id: str) -> StyleFormat:
+        """Paragraph style + character style (w:rStyle) của run (memoize)"""
+        key = (paragraph, style_id)
+        fmt = self._character_cache.get(key)
+        if fmt is None:
+            props = {}
+            for entry in reversed(self._chain(style_id, "character")):
+                props.update(entry[3])
+            props.pop("outline", None)
+            props.pop("numbered", None)
+            fmt = replace(paragraph, **props)
+            self._character_cache[key] = fmt
+        return fmt
+    
+    def run(self, r, paragraph: StyleFormat) -> RunFormat:
+        """
+        Định dạng hiệu lực của phần tử w:r trong paragraph có định dạng paragraph
+        
+        Thứ tự ưu tiên: w:rPr của run > character style > paragraph style
+        > docDefaults.
+        """
+        rpr = r.find(_RPR)
+        if rpr is None:
+            return RunFormat(paragraph.bold, paragraph.italic,
+                             paragraph.font_name, paragraph.font_size)
+        
+        rstyle = rpr.find(_W + "rStyle")
+        base = paragraph if rstyle is None else self._with_character(paragraph, rstyle.get(_VAL))
+        props = _rpr_props(rpr)
+        return RunFormat(
+            props.get("bold", base.bold),
+            props.get("italic", base.italic),
+            props.get("font_name", base.font_name),
+            props.get("font_size", base.font_size),
+        )
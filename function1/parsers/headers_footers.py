@@ -0,0 +1,90 @@
+"""
+Header/Footer Detection
+========================
+Phát hiện header, footer và số trang lặp lại trên nhiều trang PDF
+
+Mỗi dòng nằm ở lề trên/dưới được gán key = (dải vị trí dọc, text đã chuẩn
+hóa với chữ số thay bằng "#"). Key xuất hiện trên quá nửa số trang là
+header/footer và bị bỏ. Chỉ cần 1 lần đếm qua tất cả các dòng (O(n)).
+"""
+
+import re
+from collections import Counter
+from typing import Iterable, Optional, Set, Tuple
+
+from .pdf_layout import SIZE_TOLERANCE
+
+
+MARGIN = 0.15           # chỉ xét dòng có tâm nằm trong 15% trên/dưới của trang
+BANDS = 40              # số dải chia theo chiều cao trang
+MIN_SHARE = 0.5         # lặp lại trên > 50% số trang → header/footer
+MIN_PAGES = 5           # document quá ngắn: không đủ để kết luận
+CHARS_PER_TOKEN = 4     # ước lượng thô số token cho prompt AI
+
+_DIGITS = re.compile(r"\d+")
+
+RepeatKey = Tuple[int, str]
+
+
+def repeat_key(text: str, y0: float, y1: float, page_height: float) -> Optional[RepeatKey]:
+    """
+    Key của 1 dòng (hoặc block) để so sánh giữa các trang
+    
+    Returns:
+        (band, normalized_text), None nếu dòng không nằm ở lề trên/dưới
+    """
+    if page_height <= 0:
+        return None
+    
+    center = (y0 + y1) / 2 / page_height
+    if MARGIN < center < 1 - MARGIN:
+        return None
+    
+    # "Trang 12" và "Trang 13" có cùng key
+    normalized = _DIGITS.sub("#", " ".join(text.split()).casefold())
+    if not normalized:
+        return None
+    return (int(center * BANDS), normalized)
+
+
+def is_repeat(key: Optional[RepeatKey], size: float, repeated: Set[RepeatKey],
+              body_size: float) -> bool:
+    """
+    Dòng (hoặc block) có phải header/footer cần bỏ không
+    
+    Dòng lớn hơn body text (vd: "Chương 1", "Chương 2" ở đầu mỗi trang)
+    là heading, không phải header nên được giữ lại.
+    """
+    return key in repeated and size <= body_size + SIZE_TOLERANCE
+
+
+def estimate_tokens(chars: int) -> int:
+    """Ước lượng số token từ số ký tự"""
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+class RepeatDetector:
+    """Đếm số trang chứa mỗi key, trả về các key lặp lại"""
+    
+    def __init__(self, min_share: float = MIN_SHARE, min_pages: int = MIN_PAGES):
+        """
+        Args:
+            min_share: Tỷ lệ số trang tối thiểu (không tính bằng) để coi là lặp lại
+            min_pages: Số trang tối thiểu của document để bật phát hiện
+        """
+        self.min_share = min_share
+        self.min_pages = min_pages
+        self.pages = 0
+        self.counts: Counter = Counter()
+    
+    def add_page(self, keys: Iterable[Optional[RepeatKey]]) -> None:
+        """Ghi nhận các key của 1 trang (mỗi key chỉ tính 1 lần/trang)"""
+        self.pages += 1
+        self.counts.update({key for key in keys if key is not None})
+    
+    def repeated(self) -> Set[RepeatKey]:
+        """Các key xuất hiện trên > min_share số trang"""
+        if self.pages < self.min_pages:
+            return set()
+        threshold = max(self.min_share * self.pages, 1)
+        return {key for key, count in self.counts.items() if count > threshold}
@@ -0,0 +1,197 @@
+"""
+Heading Classifier
+===================
+Xác định heading level (H1-H4) từ phân bố cỡ chữ của chính document
+
+Pass 1 ghi (cỡ chữ, đậm, số ký tự) của từng dòng vào array nhỏ gọn trong
+lúc trích xuất trang. Pass 2 lấy cỡ chữ phổ biến nhất (theo số ký tự) làm
+body text, các cỡ lớn hơn hiếm gặp được xếp hạng thành H1..H4.
+"""
+
+from array import array
+from collections import defaultdict
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+MAX_LEVEL = 4
+MAX_HEADING_CHARS = 300     # dòng/đoạn dài hơn không thể là heading
+MIN_SIZE_STEP = 2           # heading lớn hơn body ít nhất 1pt (đơn vị 0.5pt)
+MAX_TIER_SHARE = 0.25       # cỡ chữ chiếm > 25% ký tự không phải heading
+MAX_TIER_AVG_CHARS = 150    # heading trung bình ngắn
+MAX_BOLD_SHARE = 0.10       # bold cỡ body chỉ là heading nếu hiếm
+MAX_BOLD_CHAPTER_SHARE = 0.005  # không có cỡ heading: dòng đậm thưa cỡ này mới là H1
+
+
+def _size_key(size: float) -> int:
+    """Làm tròn cỡ chữ về bước 0.5pt"""
+    return int(round(size * 2))
+
+
+class FontStats:
+    """Thống kê cỡ chữ/đậm của các dòng (pass 1)"""
+    
+    def __init__(self):
+        self.size_keys = array("H")
+        self.bold = array("B")
+        self.chars = array("I")
+    
+    def add(self, size: float, is_bold: bool, nchars: int) -> None:
+        self.size_keys.append(_size_key(size))
+        self.bold.append(1 if is_bold else 0)
+        self.chars.append(nchars)
+    
+    def __len__(self) -> int:
+        return len(self.size_keys)
+    
+    def short_bold_lines(self, key: int) -> int:
+        """Số dòng đậm, ngắn (< MAX_TIER_AVG_CHARS ký tự) có size key này"""
+        if NUMPY_AVAILABLE:
+            keys = np.frombuffer(self.size_keys, dtype=np.uint16)
+            chars = np.frombuffer(self.chars, dtype=np.uint32)
+            bold = np.frombuffer(self.bold, dtype=np.uint8).astype(bool)
+            return int(np.count_nonzero(bold & (keys == key) & (chars < MAX_TIER_AVG_CHARS)))
+        return sum(1 for k, is_bold, nchars in zip(self.size_keys, self.bold, self.chars)
+                   if is_bold and k == key and nchars < MAX_TIER_AVG_CHARS)
+    
+    def histograms(self):
+        """
+        Returns:
+            (chars_by_size, lines_by_size, bold_chars_by_size) - đánh index
+            theo size key (0.5pt); là numpy arrays nếu có numpy
+        """
+        if NUMPY_AVAILABLE:
+            keys = np.frombuffer(self.size_keys, dtype=np.uint16)
+            chars = np.frombuffer(self.chars, dtype=np.uint32).astype(np.float64)
+            bold = np.frombuffer(self.bold, dtype=np.uint8).astype(bool)
+            length = int(keys.max()) + 1 if len(keys) else 1
+            return (
+                np.bincount(keys, weights=chars, minlength=length),
+                np.bincount(keys, minlength=length),
+                np.bincount(keys[bold], weights=chars[bold], minlength=length),
+            )
+        
+        chars_by_size = defaultdict(float)
+        lines_by_size = defaultdict(int)
+        bold_by_size = defaultdict(float)
+        for key, is_bold, nchars in zip(self.size_keys, self.bold, self.chars):
+            chars_by_size[key] += nchars
+            lines_by_size[key] += 1
+            if is_bold:
+                bold_by_size[key] += nchars
+        length = max(chars_by_size, default=0) + 1
+        return (
+            [chars_by_size.get(k, 0.0) for k in range(length)],
+            [lines_by_size.get(k, 0) for k in range(length)],
+            [bold_by_size.get(k, 0.0) for k in range(length)],
+        )
+
+
+class HeadingClassifier:
+    """Gán heading level cho 1 dòng theo cỡ chữ/đậm"""
+    
+    def __init__(self, size_levels: Dict[int, int], body_key: Optional[int] = None,
+                 bold_level: int = 0):
+        """
+        Args:
+            size_levels: size key (0.5pt) → heading level
+            body_key: size key của body text
+            bold_level: level cho dòng đậm ngắn cỡ body (0 = không dùng)
+        """
+        self.size_levels = size_levels
+        self.body_key = body_key
+        self.bold_level = bold_level
+    
+    @classmethod
+    def fixed(cls) -> "HeadingClassifier":
+        """Ngưỡng cố định cũ: >= 16pt đậm → H1, >= 14pt đậm → H2"""
+        return _FixedClassifier()
+    
+    @classmethod
+    def fit(cls, stats: FontStats) -> "HeadingClassifier":
+        """
+        Học heading levels từ thống kê của document
+        
+        Args:
+            stats: FontStats đã thu thập ở pass 1
+        
+        Returns:
+            HeadingClassifier cho document đó
+        """
+        if not len(stats):
+            return cls({})
+        
+        chars_by_size, lines_by_size, bold_by_size = stats.histograms()
+        total_chars = float(sum(chars_by_size)) or 1.0
+        
+        # Body text = cỡ chữ chiếm nhiều ký tự nhất
+        body_key = max(range(len(chars_by_size)), key=lambda k: chars_by_size[k])
+        
+        tiers = []
+        for key in range(len(chars_by_size) - 1, body_key + MIN_SIZE_STEP - 1, -1):
+            lines = lines_by_size[key]
+            if not lines:
+                continue
+            if chars_by_size[key] / total_chars > MAX_TIER_SHARE:
+                continue
+            if chars_by_size[key] / lines > MAX_TIER_AVG_CHARS:
+                continue
+            tiers.append(key)
+        
+        # Cỡ lớn nhất chỉ xuất hiện 1 lần (tiêu đề bìa) dùng chung H1
+        # với cỡ kế tiếp, để chương vẫn được tách thành sections
+        size_levels = {}
+        if len(tiers) > 1 and lines_by_size[tiers[0]] == 1:
+            size_levels[tiers.pop(0)] = 1
+        for level, key in enumerate(tiers, 1):
+            size_levels[key] = min(level, MAX_LEVEL)
+        
+        bold_level = 0
+        used_levels = min(len(tiers), MAX_LEVEL)
+        if used_levels < MAX_LEVEL and bold_by_size[body_key] / total_chars <= MAX_BOLD_SHARE:
+            bold_level = used_levels + 1
+            # Không có cỡ heading nào: dòng đậm là H2 ("Ghi chú", "Bước 1" không
+            # mở chương mới), trừ khi chúng đủ thưa để là cấu trúc chương duy nhất
+            if not used_levels and (stats.short_bold_lines(body_key)
+                                    > MAX_BOLD_CHAPTER_SHARE * len(stats)):
+                bold_level = 2
+        
+        return cls(size_levels, body_key, bold_level)
+    
+    def classify(self, size: float, is_bold: bool, text: str) -> int:
+        """
+        Returns:
+            Heading level (1-4), 0 nếu là body text
+        """
+        if len(text) > MAX_HEADING_CHARS:
+            return 0
+        
+        key = _size_key(size)
+        level = self.size_levels.get(key)
+        if level:
+            return level
+        
+        if (self.bold_level and is_bold and key == self.body_key
+                and len(text) < MAX_TIER_AVG_CHARS and not text.endswith((".", ":", ";", ","))):
+            return self.bold_level
+        
+        return 0
+
+
+class _FixedClassifier(HeadingClassifier):
+    """Ngưỡng cố định (headings="fixed")"""
+    
+    def __init__(self):
+        super().__init__({})
+    
+    def classify(self, size: float, is_bold: bool, text: str) -> int:
+        if size >= 16 and is_bold:
+            return 1
+        if size >= 14 and is_bold:
+            return 2
+        return 0
@@ -4,11 +4,17 @@ Intermediate Representation (IR)
 Dataclasses để đại diện document structure
 """
 
+import io
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, TextIO
 from enum import Enum
 
 
+_BACKTICKS = re.compile(r"`+")
+
+
 class BlockType(Enum):
     """Loại block trong document"""
     HEADING = "heading"
@@ -21,7 +27,7 @@ class BlockType(Enum):
     PAGEBREAK = "pagebreak"
 
 
-@dataclass
+@dataclass(slots=True)
 class Run:
     """Một đoạn text với formatting"""
     text: str
@@ -29,17 +35,22 @@ class Run:
     italic: bool = False
     underline: bool = False
     font_name: Optional[str] = None
-    font_size: Optional[int] = None
+    font_size: Optional[float] = None
+    
+    def __post_init__(self):
+        # Tên font lặp lại ở hàng trăm nghìn runs → dùng chung 1 string
+        if self.font_name is not None:
+            self.font_name = sys.intern(self.font_name)
 
 
-@dataclass
+@dataclass(slots=True)
 class ListItem:
     """Item trong list"""
     content: List[Run] = field(default_factory=list)
     level: int = 0  # Indent level
 
 
-@dataclass
+@dataclass(slots=True)
 class TableCell:
     """Cell trong table"""
     content: List[Run] = field(default_factory=list)
@@ -47,39 +58,133 @@ class TableCell:
     col_span: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class TableRow:
     """Row trong table"""
     cells: List[TableCell] = field(default_factory=list)
     is_header: bool = False
 
 
-@dataclass 
 class Block:
-    """Base block trong document"""
-    type: BlockType
-    content: Any = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    """
+    Base block trong document
     
-    # Heading specific
-    level: int = 0  # H1=1, H2=2, etc
+    Dùng __slots__ thay vì dataclass: một document lớn có hàng trăm nghìn
+    blocks, nên mỗi block không giữ __dict__ riêng và các container
+    (runs, items, rows, metadata) chỉ được tạo khi thực sự truy cập.
+    Constructor và attributes giữ nguyên như dataclass cũ.
+    """
     
-    # Paragraph specific
-    runs: List[Run] = field(default_factory=list)
-    alignment: str = "left"  # left, center, right, justify
+    __slots__ = (
+        "type", "content", "level", "alignment", "ordered",
+        "image_path", "caption", "width", "height",
+        "_metadata", "_runs", "_items", "_rows",
+    )
     
-    # List specific
-    items: List[ListItem] = field(default_factory=list)
-    ordered: bool = False
+    def __init__(self, type: BlockType, content: Any = None,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 level: int = 0,
+                 runs: Optional[List[Run]] = None,
+                 alignment: str = "left",
+                 items: Optional[List["ListItem"]] = None,
+                 ordered: bool = False,
+                 rows: Optional[List["TableRow"]] = None,
+                 image_path: Optional[str] = None,
+                 caption: Optional[str] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        self.type = type
+        self.content = content
+        self._metadata = metadata
+        
+        # Heading specific
+        self.level = level  # H1=1, H2=2, etc
+        
+        # Paragraph specific
+        self._runs = runs
+        self.alignment = alignment  # left, center, right, justify
+        
+        # List specific
+        self._items = items
+        self.ordered = ordered
+        
+        # Table specific
+        self._rows = rows
+        
+        # Image specific
+        self.image_path = image_path
+        self.caption = caption
+        self.width = width
+        self.height = height
     
-    # Table specific
-    rows: List[TableRow] = field(default_factory=list)
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
     
-    # Image specific
-    image_path: Optional[str] = None
-    caption: Optional[str] = None
-    width: Optional[int] = None
-    height: Optional[int] = None
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+    
+    @property
+    def runs(self) -> List[Run]:
+        if self._runs is None:
+            self._runs = []
+        return self._runs
+    
+    @runs.setter
+    def runs(self, value: List[Run]):
+        self._runs = value
+    
+    @property
+    def items(self) -> List[ListItem]:
+        if self._items is None:
+            self._items = []
+        return self._items
+    
+    @items.setter
+    def items(self, value: List[ListItem]):
+        self._items = value
+    
+    @property
+    def rows(self) -> List[TableRow]:
+        if self._rows is None:
+            self._rows = []
+        return self._rows
+    
+    @rows.setter
+    def rows(self, value: List[TableRow]):
+        self._rows = value
+    
+    def _astuple(self) -> tuple:
+        return (
+            self.type, self.content, self._metadata or {}, self.level,
+            self._runs or [], self.alignment, self._items or [], self.ordered,
+            self._rows or [], self.image_path, self.caption,
+            self.width, self.height,
+        )
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        parts = [f"type={self.type!r}"]
+        if self.level:
+            parts.append(f"level={self.level!r}")
+        for name in ("runs", "items", "rows", "metadata"):
+            value = getattr(self, "_" + name)
+            if value:
+                parts.append(f"{name}={value!r}")
+        for name in ("content", "image_path", "caption", "width", "height"):
+            value = getattr(self, name)
+            if value is not None:
+                parts.append(f"{name}={value!r}")
+        return f"Block({', '.join(parts)})"
 
 
 @dataclass
@@ -92,38 +197,88 @@ class Section:
     
     def to_markdown(self) -> str:
         """Convert section to Markdown"""
-        lines = []
-        
-        # Title
-        lines.append(f"{'#' * self.level} {self.title}")
-        lines.append("")
+        buffer = io.StringIO()
+        self.write_markdown(buffer)
+        return buffer.getvalue()
+    
+    def write_markdown(self, fp: TextIO) -> None:
+        """
+        Ghi Markdown của section vào file-like object, từng block một
         
+        Không build cả chuỗi trong bộ nhớ: chỉ giữ text của block đang ghi
+        (bảng lớn được ghi theo từng hàng).
+        """
+        fp.write(f"{'#' * self.level} {self.title}\n")
         for block in self.blocks:
-            if block.type == BlockType.HEADING:
-                lines.append(f"{'#' * block.level} {self._runs_to_text(block.runs)}")
-                lines.append("")
-            
-            elif block.type == BlockType.PARAGRAPH:
-                lines.append(self._runs_to_text(block.runs))
-                lines.append("")
-            
-            elif block.type == BlockType.LIST:
-                for i, item in enumerate(block.items):
-                    prefix = f"{i+1}. " if block.ordered else "- "
-                    indent = "  " * item.level
-                    lines.append(f"{indent}{prefix}{self._runs_to_text(item.content)}")
-                lines.append("")
-            
-            elif block.type == BlockType.QUOTE:
-                lines.append(f"> {self._runs_to_text(block.runs)}")
-                lines.append("")
-            
-            elif block.type == BlockType.IMAGE:
-                caption = block.caption or ""
-                lines.append(f"![{caption}]({block.image_path})")
-                lines.append("")
+            self._write_block(fp, block)
+    
+    def _write_block(self, fp: TextIO, block: Block) -> None:
+        """Ghi 1 block, mỗi block cách block trước 1 dòng trống"""
+        if block.type == BlockType.HEADING:
+            fp.write(f"\n{'#' * block.level} {self._runs_to_text(block.runs)}\n")
         
-        return "\n".join(lines)
+        elif block.type == BlockType.PARAGRAPH:
+            fp.write(f"\n{self._runs_to_text(block.runs)}\n")
+        
+        elif block.type == BlockType.LIST:
+            fp.write("\n")
+            for i, item in enumerate(block.items):
+                prefix = f"{i+1}. " if block.ordered else "- "
+                indent = "  " * item.level
+                fp.write(f"{indent}{prefix}{self._runs_to_text(item.content)}\n")
+        
+        elif block.type == BlockType.QUOTE:
+            fp.write(f"\n> {self._runs_to_text(block.runs)}\n")
+        
+        elif block.type == BlockType.IMAGE:
+            caption = block.caption or ""
+            fp.write(f"\n![{caption}]({block.image_path})\n")
+        
+        elif block.type == BlockType.TABLE:
+            self._write_table(fp, block)
+        
+        elif block.type == BlockType.CODE:
+            code = block.content if block.content is not None else \
+                "".join(r.text for r in block.runs)
+            # Fence dài hơn mọi chuỗi ``` có sẵn trong code
+            fence = "`" * max(3, _longest_backticks(code) + 1)
+            language = (block._metadata or {}).get("language", "")
+            code = code.rstrip("\n")
+            fp.write(f"\n{fence}{language}\n{code}\n{fence}\n")
+        
+        elif block.type == BlockType.PAGEBREAK:
+            fp.write("\n<!-- pagebreak -->\n")
+    
+    def _write_table(self, fp: TextIO, block: Block) -> None:
+        """
+        Bảng GFM: hàng đầu là header, các hàng thiếu ô được bù ô rỗng
+        
+        Ô có col_span = n chiếm n cột: text ở cột đầu, n - 1 ô rỗng ngay sau.
+        """
+        rows = block.rows
+        if not rows:
+            return
+        width = max(table_width(row) for row in rows)
+        if not width:
+            return
+        
+        fp.write("\n")
+        for i, row in enumerate(rows):
+            cells = []
+            for cell in row.cells:
+                cells.append(self._cell_to_text(cell.content))
+                cells.extend([""] * (cell.col_span - 1))
+            cells.extend([""] * (width - len(cells)))
+            fp.write(f"| {' | '.join(cells)} |\n")
+            if i == 0:
+                fp.write(f"|{' --- |' * width}\n")
+    
+    def _cell_to_text(self, runs: List[Run]) -> str:
+        """Text 1 ô bảng: escape "|", xuống dòng thành <br>"""
+        text = self._runs_to_text(runs)
+        if "|" in text or "\n" in text:
+            text = text.replace("|", "\\|").replace("\n", "<br>")
+        return text
     
     def _runs_to_text(self, runs: List[Run]) -> str:
         """Convert runs to plain text with markdown formatting"""
@@ -140,6 +295,16 @@ class Section:
         return "".join(parts)
 
 
+def table_width(row: TableRow) -> int:
+    """Số cột của 1 hàng (tính cả col_span)"""
+    return sum(cell.col_span for cell in row.cells)
+
+
+def _longest_backticks(text: str) -> int:
+    """Độ dài chuỗi ` liên tiếp dài nhất trong text"""
+    return max(map(len, _BACKTICKS.findall(text)), default=0)
+
+
 @dataclass
 class Document:
     """Đại diện cho toàn bộ document"""
@@ -160,10 +325,52 @@ class Document:
     
     def to_markdown(self) -> str:
         """Convert entire document to Markdown"""
-        parts = []
-        for section in self.sections:
-            parts.append(section.to_markdown())
-        return "\n---\n\n".join(parts)
+        buffer = io.StringIO()
+        self.write_markdown(buffer)
+        return buffer.getvalue()
+    
+    def write_markdown(self, fp: TextIO) -> None:
+        """Ghi Markdown của cả document vào fp, từng section/block một"""
+        for i, section in enumerate(self.sections):
+            if i:
+                fp.write("\n---\n\n")
+            section.write_markdown(fp)
+
+
+class SectionBuilder:
+    """
+    Gom blocks thành sections theo thứ tự parse
+    
+    Parser gọi start() khi gặp H1: section trước đó (nếu có) được trả về
+    ngay để caller có thể yield/xử lý mà không chờ hết document.
+    """
+    
+    def __init__(self, default_title: str = "Document"):
+        self.default_title = default_title
+        self._current: Optional[Section] = None
+    
+    @property
+    def section(self) -> Section:
+        """Section hiện tại (tạo section mặc định nếu chưa có H1)"""
+        if self._current is None:
+            self._current = Section(title=self.default_title, level=1)
+        return self._current
+    
+    def start(self, title: str, level: int = 1) -> Optional[Section]:
+        """Bắt đầu section mới, trả về section vừa hoàn thành"""
+        finished = self._current
+        self._current = Section(title=title, level=level)
+        return finished
+    
+    def add(self, block: Block) -> None:
+        """Thêm block vào section hiện tại"""
+        self.section.blocks.append(block)
+    
+    def finish(self) -> Optional[Section]:
+        """Kết thúc, trả về section cuối cùng"""
+        finished = self._current
+        self._current = None
+        return finished
 
 
 # Factory functions
@@ -193,6 +400,19 @@ def create_list(items: List[str], ordered: bool = False) -> Block:
     )
 
 
+def title_matches(title: str, query: str) -> bool:
+    """
+    Tiêu đề có khớp query không (không phân biệt hoa thường, theo tiền tố):
+    "Chương 3" khớp "CHƯƠNG 3. KẾT QUẢ" nhưng không khớp "Chương 30"
+    """
+    title_key = " ".join(title.split()).casefold()
+    query_key = " ".join(query.split()).casefold()
+    if not title_key.startswith(query_key):
+        return False
+    rest = title_key[len(query_key):]
+    return not rest or not rest[0].isalnum()
+
+
 if __name__ == "__main__":
     # Test
     doc = Document(title="Test Document", author="Author")
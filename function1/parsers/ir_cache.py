@@ -0,0 +1,287 @@
+"""
+IR Cache
+=========
+Cache Document IR đã parse trên đĩa, key theo nội dung file nguồn
+
+Key = hash nội dung file + tên/version parser + options của parser, nên
+đổi split level hay output format không cần parse lại. Mỗi entry là 1 file
+records của ir_codec, ghi/đọc từng Section. Dung lượng cache được giới hạn,
+entry ít dùng nhất (mtime cũ nhất) bị xóa trước.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from .ir import Document, Section
+from .ir_codec import (
+    TAG_SECTION, TAG_DOCUMENT,
+    encode_section, encode_document_info, decode_section,
+    write_record, iter_records, load_document
+)
+
+
+CACHE_FORMAT = "1"
+ENTRY_SUFFIX = ".irc"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+
+def default_cache_dir() -> Path:
+    """Thư mục cache mặc định của user (ADM_CACHE_DIR để override)"""
+    env_dir = os.environ.get("ADM_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "adm" / "cache" / "ir"
+    
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "adm" / "ir"
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash nội dung file (đọc theo chunk)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IRCache:
+    """Cache IR trên đĩa với LRU giới hạn dung lượng"""
+    
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Thư mục cache (mặc định: default_cache_dir())
+            max_bytes: Dung lượng tối đa, vượt quá thì xóa entry cũ nhất
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+    
+    # ===== KEYS =====
+    
+    def make_key(self, source_path: str, parser, sections_only: bool = False) -> str:
+        """
+        Tạo cache key cho file + parser
+        
+        Args:
+            source_path: File PDF/DOCX nguồn
+            parser: PDFParser/DOCXParser (dùng VERSION và cache_options())
+            sections_only: Entry không có title/author thật (parser không có
+                document_info), không dùng chung với parse()
+        
+        Returns:
+            Key dạng hex
+        """
+        stat = os.stat(source_path)
+        memo_key = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+        content_hash = self._hash_memo.get(memo_key)
+        if content_hash is None:
+            content_hash = hash_file(source_path)
+            self._hash_memo[memo_key] = content_hash
+        
+        parts = {
+            "content": content_hash,
+            "parser": type(parser).__name__,
+            "version": getattr(parser, "VERSION", "0"),
+            "options": parser.cache_options() if hasattr(parser, "cache_options") else {},
+            "format": CACHE_FORMAT,
+            "marshal": marshal.version,
+        }
+        if sections_only:
+            parts["sections_only"] = True
+        raw = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=20).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+    
+    def _hit(self, entry: Path, parser) -> bool:
+        """Entry dùng được: đã có, và file phụ của parser (images) còn đủ"""
+        if not entry.exists():
+            return False
+        outputs_exist = getattr(parser, "outputs_exist", None)
+        return outputs_exist is None or outputs_exist()
+    
+    def contains(self, source_path: str, parser) -> bool:
+        """File này đã có trong cache chưa (cho iter_sections)"""
+        key = self.make_key(source_path, parser, not hasattr(parser, "document_info"))
+        return self._hit(self._entry_path(key), parser)
+    
+    # ===== READ / WRITE =====
+    
+    def iter_sections(self, source_path: str, parser) -> Iterator[Section]:
+        """
+        Yield sections từ cache; nếu miss thì stream parser.iter_sections
+        và ghi vào cache đồng thời
+        
+        Title/author của entry lấy từ parser.document_info(path); parser
+        không có document_info thì entry có key riêng, parse() không dùng lại.
+        
+        Args:
+            source_path: File PDF/DOCX nguồn
+            parser: Parser có iter_sections(path)
+        
+        Yields:
+            Section theo thứ tự trong file
+        """
+        sections_only = not hasattr(parser, "document_info")
+        key = self.make_key(source_path, parser, sections_only)
+        entry = self._entry_path(key)
+        
+        if self._hit(entry, parser):
+            self.hits += 1
+            self._touch(entry)
+            yield from self._read_sections(entry)
+            return
+        
+        self.misses += 1
+        if sections_only:
+            info = Document(
+                title=Path(source_path).stem,
+                source_path=str(source_path),
+                source_type=Path(source_path).suffix.lower().lstrip("."),
+            )
+        else:
+            info = parser.document_info(str(source_path))
+        yield from self._record(key, parser.iter_sections(str(source_path)), info)
+    
+    def parse(self, source_path: str, parser) -> Document:
+        """
+        Trả về Document từ cache, hoặc parser.parse rồi lưu vào cache
+        
+        Args:
+            source_path: File PDF/DOCX nguồn
+            parser: Parser có parse(path)
+        
+        Returns:
+            Document IR
+        """
+        key = self.make_key(source_path, parser)
+        entry = self._entry_path(key)
+        
+        if self._hit(entry, parser):
+            self.hits += 1
+            self._touch(entry)
+            return self._read_document(entry)
+        
+        self.misses += 1
+        document = parser.parse(str(source_path))
+        for _ in self._record(key, document.sections, document):
+            pass
+        return document
+    
+    def _record(self, key: str, sections: Iterable[Section],
+                info: Document) -> Iterator[Section]:
+        """Ghi sections vào file tạm khi đi qua, commit khi hết generator"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        
+        committed = False
+        try:
+            with open(tmp_path, "wb") as f:
+                for section in sections:
+                    write_record(f, TAG_SECTION, encode_section(section))
+                    yield section
+                write_record(f, TAG_DOCUMENT, encode_document_info(info))
+            
+            os.replace(tmp_path, entry)
+            committed = True
+        finally:
+            if not committed and tmp_path.exists():
+                tmp_path.unlink()
+        
+        self.evict()
+    
+    def _read_sections(self, entry: Path) -> Iterator[Section]:
+        with open(entry, "rb") as f:
+            for tag, value in iter_records(f):
+                if tag == TAG_SECTION:
+                    yield decode_section(value)
+    
+    def _read_document(self, entry: Path) -> Document:
+        with open(entry, "rb") as f:
+            return load_document(f)
+    
+    def _touch(self, entry: Path) -> None:
+        """Cập nhật mtime để đánh dấu vừa dùng (LRU)"""
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+    
+    # ===== MAINTENANCE =====
+    
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+    
+    def evict(self) -> int:
+        """
+        Xóa entries dùng lâu nhất cho đến khi tổng dung lượng <= max_bytes
+        
+        Returns:
+            Số entries đã xóa
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Thống kê cache"""
+        entries = self._entries()
+        return {
+            "cache_dir": str(self.cache_dir),
+            "entries": len(entries),
+            "total_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+    
+    def clear(self) -> int:
+        """
+        Xóa toàn bộ cache
+        
+        Returns:
+            Số entries đã xóa
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,266 @@
+"""
+IR Codec
+=========
+Serialize Document IR sang dạng nhị phân gọn (tuple + marshal + zlib)
+
+File gồm các record độc lập, mỗi record = tag (1 byte) + độ dài (4 bytes)
++ payload đã nén. Nhờ vậy có thể ghi/đọc từng Section một mà không cần
+giữ cả Document trong bộ nhớ.
+"""
+
+import marshal
+import struct
+import tempfile
+import zlib
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .ir import (
+    Document, Section, Block, BlockType, Run, ListItem, TableRow, TableCell
+)
+
+
+# Record tags
+TAG_SECTION = b"S"
+TAG_DOCUMENT = b"D"
+
+_HEADER = struct.Struct("<cI")
+_BLOCK_TYPES = {t.value: t for t in BlockType}
+
+# Run flags
+_BOLD = 1
+_ITALIC = 2
+_UNDERLINE = 4
+
+
+# ===== ENCODE =====
+
+def _encode_runs(runs) -> tuple:
+    return tuple(
+        (r.text,
+         (_BOLD if r.bold else 0) | (_ITALIC if r.italic else 0)
+         | (_UNDERLINE if r.underline else 0),
+         r.font_name, r.font_size)
+        for r in runs
+    )
+
+
+def _encode_block(block: Block) -> tuple:
+    return (
+        block.type.value,
+        block.level,
+        _encode_runs(block._runs or ()),
+        block.alignment,
+        tuple((_encode_runs(i.content), i.level) for i in block._items or ()),
+        block.ordered,
+        tuple(
+            (tuple((_encode_runs(c.content), c.row_span, c.col_span) for c in row.cells),
+             row.is_header)
+            for row in block._rows or ()
+        ),
+        block.image_path,
+        block.caption,
+        block.width,
+        block.height,
+        block._metadata or None,
+        block.content,
+    )
+
+
+def encode_section(section: Section) -> tuple:
+    """Section → tuple chỉ gồm kiểu built-in (marshal được)"""
+    return (
+        section.title,
+        section.level,
+        tuple(_encode_block(b) for b in section.blocks),
+        section.metadata or None,
+    )
+
+
+def encode_document_info(document: Document) -> tuple:
+    """Các field của Document (không gồm sections)"""
+    return (
+        document.title,
+        document.author,
+        document.metadata or None,
+        document.source_path,
+        document.source_type,
+    )
+
+
+# ===== DECODE =====
+
+def _decode_runs(data) -> list:
+    return [
+        Run(text=text, bold=bool(flags & _BOLD), italic=bool(flags & _ITALIC),
+            underline=bool(flags & _UNDERLINE), font_name=font_name,
+            font_size=font_size)
+        for text, flags, font_name, font_size in data
+    ]
+
+
+def _decode_block(data) -> Block:
+    (type_value, level, runs, alignment, items, ordered, rows,
+     image_path, caption, width, height, metadata, content) = data
+    return Block(
+        type=_BLOCK_TYPES[type_value],
+        content=content,
+        metadata=metadata,
+        level=level,
+        runs=_decode_runs(runs) if runs else None,
+        alignment=alignment,
+        items=[ListItem(content=_decode_runs(c), level=lvl) for c, lvl in items] or None,
+        ordered=ordered,
+        rows=[
+            TableRow(
+                cells=[TableCell(content=_decode_runs(c), row_span=rs, col_span=cs)
+                       for c, rs, cs in cells],
+                is_header=is_header
+            )
+            for cells, is_header in rows
+        ] or None,
+        image_path=image_path,
+        caption=caption,
+        width=width,
+        height=height,
+    )
+
+
+def decode_section(data) -> Section:
+    """tuple → Section"""
+    title, level, blocks, metadata = data
+    return Section(
+        title=title,
+        level=level,
+        blocks=[_decode_block(b) for b in blocks],
+        metadata=metadata or {},
+    )
+
+
+def decode_document_info(data) -> Document:
+    """tuple → Document rỗng (chưa có sections)"""
+    title, author, metadata, source_path, source_type = data
+    return Document(
+        title=title,
+        author=author,
+        metadata=metadata or {},
+        source_path=source_path,
+        source_type=source_type,
+    )
+
+
+# ===== RECORDS =====
+
+def write_record(fp: BinaryIO, tag: bytes, value: Any, level: int = 1) -> int:
+    """
+    Ghi 1 record vào file nhị phân
+    
+    Returns:
+        Số bytes đã ghi
+    """
+    payload = zlib.compress(marshal.dumps(value), level)
+    fp.write(_HEADER.pack(tag, len(payload)))
+    fp.write(payload)
+    return _HEADER.size + len(payload)
+
+
+def read_record(fp: BinaryIO) -> Optional[Tuple[bytes, Any]]:
+    """Đọc 1 record, trả về None khi hết file"""
+    header = fp.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise ValueError("Truncated IR record header")
+    
+    tag, size = _HEADER.unpack(header)
+    payload = fp.read(size)
+    if len(payload) < size:
+        raise ValueError("Truncated IR record")
+    
+    return tag, marshal.loads(zlib.decompress(payload))
+
+
+def iter_records(fp: BinaryIO) -> Iterator[Tuple[bytes, Any]]:
+    """Duyệt tất cả records trong file"""
+    while True:
+        record = read_record(fp)
+        if record is None:
+            return
+        yield record
+
+
+def dump_document(document: Document, fp: BinaryIO) -> None:
+    """Ghi cả Document: các Section records rồi Document record"""
+    for section in document.sections:
+        write_record(fp, TAG_SECTION, encode_section(section))
+    write_record(fp, TAG_DOCUMENT, encode_document_info(document))
+
+
+def load_document(fp: BinaryIO) -> Document:
+    """Đọc Document đã ghi bằng dump_document"""
+    sections = []
+    document = None
+    
+    for tag, value in iter_records(fp):
+        if tag == TAG_SECTION:
+            sections.append(decode_section(value))
+        elif tag == TAG_DOCUMENT:
+            document = decode_document_info(value)
+    
+    if document is None:
+        document = Document()
+    document.sections = sections
+    return document
+
+
+# ===== SPILL =====
+
+class SectionStore:
+    """
+    Danh sách Section lưu trong file tạm, bộ nhớ chỉ giữ offset của từng record
+    
+    Dùng làm Document.sections khi parse file rất lớn. Mỗi lần truy cập
+    Section được đọc và decode lại từ đĩa, nên sửa Section lấy ra không
+    làm thay đổi nội dung đã lưu.
+    """
+    
+    def __init__(self, sections: Iterable[Section] = (), dir: Optional[str] = None):
+        """
+        Args:
+            sections: Sections ban đầu
+            dir: Thư mục chứa file tạm (mặc định thư mục tạm của hệ thống)
+        """
+        self._fp = tempfile.TemporaryFile(dir=dir)
+        self._offsets: List[int] = []
+        self.extend(sections)
+    
+    def append(self, section: Section) -> None:
+        self._fp.seek(0, 2)
+        self._offsets.append(self._fp.tell())
+        write_record(self._fp, TAG_SECTION, encode_section(section))
+    
+    def extend(self, sections: Iterable[Section]) -> None:
+        for section in sections:
+            self.append(section)
+    
+    def _read(self, offset: int) -> Section:
+        self._fp.seek(offset)
+        _, value = read_record(self._fp)
+        return decode_section(value)
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._read(offset) for offset in self._offsets[index]]
+        return self._read(self._offsets[index])
+    
+    def __iter__(self) -> Iterator[Section]:
+        # Seek lại mỗi lần: vẫn đúng khi append xen kẽ lúc đang duyệt
+        for offset in self._offsets:
+            yield self._read(offset)
+    
+    def close(self) -> None:
+        """Xóa file tạm"""
+        self._fp.close()
+        self._offsets = []
@@ -0,0 +1,95 @@
+"""
+IR Normalization
+=================
+Chuẩn hóa IR sau khi parse: gộp các runs liền nhau có cùng formatting
+
+Word hay tách 1 câu thành nhiều runs nhỏ (mỗi lần sửa, mỗi đoạn spell-check),
+PDF tách theo span. Gộp lại giúp mọi bước sau (markdown, LaTeX) ít việc hơn
+và không sinh ra "**a****b**" / "\\textbf{a}\\textbf{b}".
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ir import Block, Run, Section
+
+
+def new_counts() -> Dict[str, int]:
+    """Bộ đếm của 1 lần chuẩn hóa: runs ban đầu, đã gộp, đã bỏ (rỗng)"""
+    return {"runs": 0, "merged": 0, "dropped": 0}
+
+
+def coalesce_runs(runs: List[Run]) -> Tuple[List[Run], int, int]:
+    """
+    Gộp các runs liền nhau có cùng formatting, bỏ runs rỗng
+    
+    Run đầu tiên của mỗi nhóm được giữ lại (text được nối thêm), nên không
+    tạo Run mới.
+    
+    Returns:
+        (runs mới, số runs đã gộp, số runs rỗng đã bỏ)
+    """
+    out: List[Run] = []
+    pending = None  # texts sẽ nối vào out[-1]
+    last_key = None
+    merged = dropped = 0
+    
+    for run in runs:
+        if not run.text:
+            dropped += 1
+            continue
+        
+        key = (run.bold, run.italic, run.underline, run.font_name, run.font_size)
+        if key == last_key:
+            if pending is None:
+                pending = [out[-1].text]
+            pending.append(run.text)
+            merged += 1
+            continue
+        
+        if pending is not None:
+            out[-1].text = "".join(pending)
+            pending = None
+        out.append(run)
+        last_key = key
+    
+    if pending is not None:
+        out[-1].text = "".join(pending)
+    
+    return out, merged, dropped
+
+
+def _coalesce(runs: List[Run], counts: Dict[str, int]) -> List[Run]:
+    counts["runs"] += len(runs)
+    if len(runs) < 2 and (not runs or runs[0].text):
+        return runs
+    runs, merged, dropped = coalesce_runs(runs)
+    counts["merged"] += merged
+    counts["dropped"] += dropped
+    return runs
+
+
+def normalize_block(block: Block, counts: Dict[str, int]) -> None:
+    """Chuẩn hóa runs của 1 block (paragraph/heading, list items, ô bảng)"""
+    if block._runs:
+        block._runs = _coalesce(block._runs, counts)
+    for item in block._items or ():
+        item.content = _coalesce(item.content, counts)
+    for row in block._rows or ():
+        for cell in row.cells:
+            cell.content = _coalesce(cell.content, counts)
+
+
+def normalize_section(section: Section, counts: Optional[Dict[str, int]] = None) -> Section:
+    """Chuẩn hóa tại chỗ mọi block của section"""
+    counts = new_counts() if counts is None else counts
+    for block in section.blocks:
+        normalize_block(block, counts)
+    return section
+
+
+def normalize_sections(sections: Iterable[Section],
+                       counts: Optional[Dict[str, int]] = None) -> Iterator[Section]:
+    """Chuẩn hóa từng section khi stream qua (cộng dồn vào counts)"""
+    counts = new_counts() if counts is None else counts
+    for section in sections:
+        yield normalize_section(section, counts)
@@ -0,0 +1,187 @@
+"""
+Outline Scanner
+================
+Đọc nhanh cây heading, số trang, title/author của PDF/DOCX mà không parse nội dung
+
+PDF: chỉ đọc bookmarks (outline) và metadata. DOCX: đọc thẳng file zip,
+stream word/document.xml và chỉ lấy text của các paragraph có style heading,
+title/author từ docProps/core.xml.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from .docx_stream import core_properties
+from .docx_styles import StyleResolver
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+MAX_LEVEL = 4
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_P = _W + "p"
+_TBL = _W + "tbl"
+_PPR = _W + "pPr"
+_PSTYLE = _W + "pStyle"
+_T = _W + "t"
+_VAL = _W + "val"
+
+
+def _build_tree(headings: List[Tuple[int, str, Optional[int]]]) -> List[Dict[str, Any]]:
+    """[(level, title, page), ...] → cây heading lồng nhau theo level"""
+    roots = []
+    stack = []  # (level, node)
+    for level, title, page in headings:
+        node = {"title": title, "level": level, "page": page, "children": []}
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        (stack[-1][1]["children"] if stack else roots).append(node)
+        stack.append((level, node))
+    return roots
+
+
+# ===== PDF =====
+
+def scan_pdf_outline(pdf_path: str) -> Dict[str, Any]:
+    """
+    Outline của PDF từ bookmarks + metadata (không đọc nội dung trang)
+    
+    Args:
+        pdf_path: Đường dẫn đến file PDF
+    
+    Returns:
+        Dict outline (xem scan_outline)
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF not installed. Run: pip install pymupdf")
+    
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(f"File not found: {pdf_path}")
+    
+    doc = fitz.open(pdf_path)
+    try:
+        metadata = doc.metadata or {}
+        headings = [
+            (min(level, MAX_LEVEL), " ".join(title.split()), page if page >= 1 else None)
+            for level, title, page in (entry[:3] for entry in doc.get_toc(simple=True))
+        ]
+        return {
+            "source": str(pdf_path),
+            "type": "pdf",
+            "title": metadata.get("title") or Path(pdf_path).stem,
+            "author": metadata.get("author") or None,
+            "pages": doc.page_count,
+            "headings": _build_tree(headings),
+        }
+    finally:
+        doc.close()
+
+
+# ===== DOCX =====
+
+def _docx_heading_styles(archive: zipfile.ZipFile) -> Dict[str, int]:
+    """styleId → heading level, như DOCXParser ("Heading N", "Title", kế thừa)"""
+    styles = StyleResolver.from_archive(archive)
+    
+    levels = {}
+    for style_id in styles.style_ids():
+        fmt = styles.style(style_id)
+        level = 1 if fmt.name.lower() == "title" else fmt.heading_level
+        if level and 1 <= level <= MAX_LEVEL:
+            levels[style_id] = level
+    
+    return levels
+
+
+def _docx_headings(archive: zipfile.ZipFile, styles: Dict[str, int]) -> List[Tuple[int, str, None]]:
+    """
+    Stream word/document.xml, chỉ lấy text của các paragraph heading
+    
+    Bỏ qua paragraph trong bảng (DOCXParser coi cả bảng là 1 TABLE block).
+    """
+    headings = []
+    in_table = 0
+    
+    with archive.open("word/document.xml") as data:
+        for event, elem in iterparse(data, events=("start", "end")):
+            if elem.tag == _TBL:
+                in_table += 1 if event == "start" else -1
+                continue
+            if event != "end" or elem.tag != _P:
+                continue
+            if in_table:
+                elem.clear()
+                continue
+            
+            level = 0
+            ppr = elem.find(_PPR)
+            if ppr is not None:
+                pstyle = ppr.find(_PSTYLE)
+                if pstyle is not None:
+                    level = styles.get(pstyle.get(_VAL), 0)
+            
+            if level:
+                text = " ".join("".join(t.text or "" for t in elem.iter(_T)).split())
+                if text:
+                    headings.append((level, text, None))
+            
+            # Giải phóng paragraph đã xử lý (giữ bộ nhớ ~ hằng số)
+            elem.clear()
+    
+    return headings
+
+
+def scan_docx_outline(docx_path: str) -> Dict[str, Any]:
+    """
+    Outline của DOCX: heading paragraphs + core properties
+    
+    Args:
+        docx_path: Đường dẫn đến file DOCX
+    
+    Returns:
+        Dict outline (xem scan_outline)
+    """
+    if not os.path.exists(docx_path):
+        raise FileNotFoundError(f"File not found: {docx_path}")
+    
+    with zipfile.ZipFile(docx_path) as archive:
+        props = core_properties(archive)
+        headings = _docx_headings(archive, _docx_heading_styles(archive))
+    
+    return {
+        "source": str(docx_path),
+        "type": "docx",
+        "title": props["title"] or Path(docx_path).stem,
+        "author": props["author"],
+        "pages": props["pages"],
+        "headings": _build_tree(headings),
+    }
+
+
+def scan_outline(path: str) -> Dict[str, Any]:
+    """
+    Outline của 1 file PDF/DOCX (dùng để phân loại trước khi convert)
+    
+    Args:
+        path: File PDF/DOCX
+    
+    Returns:
+        {"source", "type", "title", "author", "pages",
+         "headings": [{"title", "level", "page", "children": [...]}, ...]}
+        ("page" là None với DOCX, "pages" lấy từ docProps/app.xml)
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".pdf":
+        return scan_pdf_outline(str(path))
+    if suffix == ".docx":
+        return scan_docx_outline(str(path))
+    raise ValueError(f"Unsupported file type: {suffix}")
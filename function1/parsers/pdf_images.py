@@ -0,0 +1,268 @@
+"""
+PDF Image Extraction
+=====================
+Trích xuất images từ PDF, mỗi image chỉ decode và ghi 1 lần
+
+Image lặp lại (logo, chữ ký trên mọi trang) được gom theo xref, rồi theo
+hash stream gốc trước khi decode (các xref khác nhau nhưng cùng nội dung,
+vd PDF ghép từ nhiều file). Tên file theo hash nên chạy lại không ghi lại
+file đã có. Việc downscale (Pillow, tùy chọn) và ghi file chạy trong thread
+pool; PyMuPDF chỉ được gọi từ thread chính.
+
+images.json ánh xạ trang → các image (file, bbox) để gán Block.image_path.
+"""
+
+import io
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+MANIFEST_NAME = "images.json"
+DEFAULT_WORKERS = 4
+JPEG_QUALITY = 85
+
+_REFS = re.compile(rb"\d+ \d+ R")
+
+BBox = Tuple[float, float, float, float]
+
+
+def _placements(doc, page_numbers: List[int]) -> Tuple[Dict[int, list], Dict[int, Tuple[float, float]]]:
+    """
+    Vị trí của các image trên từng trang (không decode image)
+    
+    Returns:
+        ({page_num: [(xref, bbox)]}, {xref: (rộng, cao) hiển thị lớn nhất, pt})
+    """
+    pages: Dict[int, list] = {}
+    display: Dict[int, Tuple[float, float]] = {}
+    
+    for page_num in page_numbers:
+        page = doc[page_num]
+        placed = []
+        for item in page.get_images(full=True):
+            xref = item[0]
+            rect = page.get_image_bbox(item)
+            bbox = None
+            if rect.is_valid and not rect.is_empty and not rect.is_infinite:
+                bbox = [round(v, 2) for v in rect]
+                width, height = display.get(xref, (0.0, 0.0))
+                display[xref] = (max(width, rect.width), max(height, rect.height))
+            placed.append((xref, bbox))
+        if placed:
+            pages[page_num] = placed
+    
+    return pages, display
+
+
+def _digest(doc, xref: int) -> str:
+    """
+    Hash nội dung image: stream gốc + dictionary của object
+    
+    Số xref trong dictionary (vd /SMask 12 0 R) được bỏ đi để cùng 1 image
+    ở 2 file PDF ghép lại vẫn cùng hash.
+    """
+    h = blake2b(digest_size=10)
+    h.update(_REFS.sub(b"R", doc.xref_object(xref, compressed=True).encode()))
+    h.update(doc.xref_stream_raw(xref) or b"")
+    return h.hexdigest()
+
+
+def _downscale(data: bytes, ext: str, max_width: int) -> Tuple[bytes, str, int, int]:
+    """
+    Thu nhỏ image về rộng tối đa max_width pixel và nén lại
+    
+    Image không có kênh alpha được lưu JPEG, còn lại PNG.
+    
+    Returns:
+        (bytes, ext, width, height)
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= max_width:
+            return data, ext, image.width, image.height
+        
+        height = max(1, round(image.height * max_width / image.width))
+        resized = image.resize((max_width, height), Image.LANCZOS)
+    
+    out = io.BytesIO()
+    if resized.mode in ("RGBA", "LA", "P"):
+        resized.save(out, "PNG", optimize=True)
+        ext = "png"
+    else:
+        if resized.mode not in ("RGB", "L"):
+            resized = resized.convert("RGB")
+        resized.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        ext = "jpg"
+    return out.getvalue(), ext, resized.width, resized.height
+
+
+def _write(path: str, data: bytes) -> None:
+    """Ghi file qua file tạm để không để lại file ghi dở"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _save(output_dir: str, stem: str, data: bytes, ext: str,
+          max_width: Optional[int]) -> Tuple[str, int, int]:
+    """Downscale (nếu cần) rồi ghi image, chạy trong thread pool"""
+    width = height = 0
+    if max_width:
+        data, ext, width, height = _downscale(data, ext, max_width)
+    
+    filename = f"{stem}.{ext}"
+    _write(os.path.join(output_dir, filename), data)
+    return filename, width, height
+
+
+def _existing(output_dir: str) -> Dict[str, Tuple[str, dict]]:
+    """Images đã ghi ở lần chạy trước: {tên không đuôi: (file, thông tin)}"""
+    previous = load_manifest(output_dir)
+    if not previous:
+        return {}
+    return {
+        filename.rsplit(".", 1)[0]: (filename, info)
+        for filename, info in previous["images"].items()
+        if os.path.exists(os.path.join(output_dir, filename))
+    }
+
+
+def extract_images(doc, output_dir: str, page_numbers: Optional[List[int]] = None,
+                   max_dpi: Optional[int] = None, workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Extract images của các trang được chọn, ghi images.json
+    
+    Args:
+        doc: fitz.Document đã mở
+        output_dir: Thư mục lưu images
+        page_numbers: Các trang (0-based), mặc định tất cả
+        max_dpi: Downscale image có độ phân giải (theo kích thước hiển thị
+            trên trang) lớn hơn max_dpi, cần Pillow. None = giữ nguyên
+        workers: Số thread ghi file
+    
+    Returns:
+        Manifest: {"images": {file: {"xrefs", "width", "height", "pages"}},
+                   "pages": {"1": [{"file", "bbox"}]}}
+    """
+    if max_dpi and not PILLOW_AVAILABLE:
+        raise ImportError(
+            "Pillow is required for max_dpi. "
+            "Install with: pip install Pillow"
+        )
+    
+    os.makedirs(output_dir, exist_ok=True)
+    if page_numbers is None:
+        page_numbers = list(range(doc.page_count))
+    
+    pages, display = _placements(doc, page_numbers)
+    existing = _existing(output_dir)
+    
+    by_xref: Dict[int, Optional[str]] = {}     # xref → digest (None = không extract được)
+    by_digest: Dict[str, dict] = {}            # digest → thông tin image
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for page_num in sorted(pages):
+            for xref, _ in pages[page_num]:
+                if xref in by_xref:
+                    continue
+                
+                # Hash stream gốc (chưa decode): xref trùng nội dung
+                # không phải decode/re-encode lần nữa
+                digest = by_xref[xref] = _digest(doc, xref)
+                if digest in by_digest:
+                    by_digest[digest]["xrefs"].append(xref)
+                    continue
+                
+                stem = f"img_{digest}" + (f"_{max_dpi}dpi" if max_dpi else "")
+                if stem in existing:
+                    # Tên theo hash: file đã có từ lần chạy trước, không decode
+                    filename, info = existing[stem]
+                    by_digest[digest] = {"xrefs": [xref], "file": filename,
+                                         "width": info["width"], "height": info["height"]}
+                    continue
+                
+                base_image = doc.extract_image(xref)
+                if not base_image:
+                    by_xref[xref] = None
+                    continue
+                
+                max_width = None
+                if max_dpi and xref in display:
+                    max_width = max(1, round(display[xref][0] / 72 * max_dpi))
+                
+                by_digest[digest] = {
+                    "xrefs": [xref],
+                    "width": base_image["width"],
+                    "height": base_image["height"],
+                    "future": executor.submit(_save, output_dir, stem, base_image["image"],
+                                              base_image["ext"], max_width),
+                }
+    
+    for info in by_digest.values():
+        if "future" in info:
+            filename, width, height = info.pop("future").result()
+            info["file"] = filename
+            if width:
+                info["width"], info["height"] = width, height
+        info["pages"] = []
+    
+    manifest_pages = {}
+    for page_num in sorted(pages):
+        placed = []
+        for xref, bbox in pages[page_num]:
+            digest = by_xref[xref]
+            if digest is None:
+                continue
+            info = by_digest[digest]
+            if not info["pages"] or info["pages"][-1] != page_num + 1:
+                info["pages"].append(page_num + 1)
+            placed.append({"file": info["file"], "bbox": bbox})
+        if placed:
+            manifest_pages[str(page_num + 1)] = placed
+    
+    images = {info.pop("file"): info for info in by_digest.values()}
+    manifest = {"images": images, "pages": manifest_pages}
+    _write(os.path.join(output_dir, MANIFEST_NAME),
+           json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+def load_manifest(output_dir: str) -> Optional[dict]:
+    """Đọc images.json trong output_dir (None nếu chưa có)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def image_for(manifest: dict, page_num: int, bbox: Optional[BBox]) -> Optional[str]:
+    """
+    File image (trong manifest) đặt tại bbox trên trang page_num (0-based)
+    
+    Lấy image có bbox gần nhất, vì bbox của image block và của
+    get_image_bbox có thể lệch nhau vài phần trăm điểm.
+    """
+    placed = manifest["pages"].get(str(page_num + 1))
+    if not placed:
+        return None
+    if bbox is None:
+        return placed[0]["file"]
+    
+    def distance(entry: dict) -> float:
+        other = entry["bbox"]
+        if other is None:
+            return float("inf")
+        return sum(abs(a - b) for a, b in zip(bbox, other))
+    
+    return min(placed, key=distance)["file"]
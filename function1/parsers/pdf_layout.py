@@ -0,0 +1,300 @@
+"""
+PDF Layout Helpers
+===================
+Xử lý hình học các dòng text lấy từ PyMuPDF trước khi dựng IR
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Một dòng text: (x0, y0, x1, y1, size, is_bold, text, spans)
+# - text: đã strip
+# - spans: ((span_text, flags), ...) giữ nguyên text gốc của span
+Line = Tuple[float, float, float, float, float, bool, str, tuple]
+
+# Dòng bắt đầu bằng bullet / số thứ tự → luôn là đoạn mới
+_LIST_MARKER = re.compile(r"^(?:[-•–●▪◦*+]|\d{1,3}[.)]|[a-zđ][.)])\s", re.IGNORECASE)
+
+# Ngưỡng (tỷ lệ) dùng cho reflow
+SIZE_TOLERANCE = 0.5        # pt, chênh lệch cỡ chữ vẫn coi là cùng font
+MAX_LINE_GAP = 0.6          # x chiều cao dòng trước
+INDENT_EM = 1.0             # lùi đầu dòng > 1em → đoạn mới
+SHORT_LINE = 0.3            # dòng trước kết thúc sớm > 30% bề rộng → hết đoạn
+
+# Ngưỡng dùng cho phát hiện cột
+SPANNING_WIDTH = 0.55       # block rộng hơn 55% vùng text → trải qua các cột
+MIN_GUTTER = 8.0            # pt, khe giữa 2 cột
+GUTTER_COVERAGE = 0.05      # khe: độ phủ < 5% độ phủ lớn nhất
+MIN_COLUMN_SHARE = 0.2      # mỗi cột chứa ít nhất 20% lượng text của trang
+
+
+def _starts_paragraph(prev: Line, line: Line, left: float, right: float) -> bool:
+    """Dòng `line` có bắt đầu đoạn mới so với dòng `prev` không"""
+    px0, py0, px1, py1, psize, pbold, ptext, _ = prev
+    x0, y0, x1, y1, size, bold, text, spans = line
+    
+    # Font continuity
+    if abs(size - psize) > SIZE_TOLERANCE or bold != pbold:
+        return True
+    
+    # Khoảng cách dọc (hoặc dòng nhảy lên trên: cột khác)
+    line_height = max(py1 - py0, 1.0)
+    if y0 - py1 > MAX_LINE_GAP * line_height or y0 < py0:
+        return True
+    
+    # Lùi đầu dòng (theo hình học hoặc bằng khoảng trắng đầu span)
+    raw = spans[0][0] if spans else ""
+    if x0 - left > INDENT_EM * size or raw.startswith("  "):
+        return True
+    
+    # Bullet / số thứ tự
+    if _LIST_MARKER.match(text):
+        return True
+    
+    # Dòng trước ngắn → đoạn trước đã kết thúc
+    if right - px1 > SHORT_LINE * (right - left):
+        return True
+    
+    return False
+
+
+def _is_hyphen_break(prev_text: str, next_text: str) -> bool:
+    """Dòng trước ngắt từ bằng '-' ở cuối dòng (vd: 'phương-' + 'pháp')"""
+    return (
+        len(prev_text) >= 2
+        and prev_text[-1] in "-\u00ad"
+        and prev_text[-2].isalpha()
+        and next_text[:1].islower()
+    )
+
+
+def join_lines(lines: List[str]) -> str:
+    """
+    Nối các dòng text thô (vd: từ get_text("blocks")) thành 1 đoạn,
+    sửa ngắt từ bằng gạch nối cuối dòng
+    """
+    text = ""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if not text:
+            text = line
+        elif _is_hyphen_break(text, line):
+            text = text[:-1] + line
+        else:
+            text = text + " " + line
+    return text
+
+
+def _merge(prev: Line, line: Line) -> Line:
+    """Nối `line` vào cuối `prev`"""
+    px0, py0, px1, py1, psize, pbold, ptext, pspans = prev
+    x0, y0, x1, y1, size, bold, text, spans = line
+    
+    # Bỏ các span chỉ có khoảng trắng ở cuối dòng trước ("-" nằm ở span trước đó)
+    end = len(pspans)
+    while end > 1 and not pspans[end - 1][0].strip():
+        end -= 1
+    pspans = pspans[:end]
+    
+    last_text, last_flags = pspans[-1]
+    first_text, first_flags = spans[0]
+    
+    if _is_hyphen_break(ptext, text):
+        ptext = ptext[:-1]
+        last_text = last_text.rstrip()[:-1]
+        joiner = ""
+    else:
+        last_text = last_text.rstrip()
+        joiner = " "
+    
+    merged_spans = (
+        pspans[:-1]
+        + ((last_text, last_flags), (joiner + first_text.lstrip(), first_flags))
+        + spans[1:]
+    )
+    return (
+        min(px0, x0), py0, max(px1, x1), y1, psize, pbold,
+        ptext + joiner + text, merged_spans
+    )
+
+
+def reflow_lines(lines: List[Line]) -> List[Line]:
+    """
+    Gộp các dòng liên tiếp của cùng 1 text block thành đoạn văn
+    
+    Dựa trên bbox (khoảng cách dọc, lùi đầu dòng, dòng ngắn), cỡ chữ/đậm
+    và bullet; sửa ngắt từ bằng gạch nối cuối dòng. Dòng không gộp được
+    giữ nguyên.
+    
+    Args:
+        lines: Các dòng của 1 block, theo thứ tự đọc
+    
+    Returns:
+        List đoạn văn (cùng định dạng Line)
+    """
+    if len(lines) < 2:
+        return lines
+    
+    left = min(line[0] for line in lines)
+    right = max(line[2] for line in lines)
+    
+    paragraphs = [lines[0]]
+    prev = lines[0]
+    for line in lines[1:]:
+        # So sánh hình học với dòng ngay trước, không phải cả đoạn đã gộp
+        if _starts_paragraph(prev, line, left, right):
+            paragraphs.append(line)
+        else:
+            paragraphs[-1] = _merge(paragraphs[-1], line)
+        prev = line
+    
+    return paragraphs
+
+
+# ===== READING ORDER =====
+
+BBox = Sequence[float]
+
+
+def _area(b: BBox) -> float:
+    return (b[3] - b[1]) * (b[2] - b[0])
+
+
+def _x_coverage(bboxes: List[BBox], left: int, width: int):
+    """Độ phủ theo trục x (tổng chiều cao các block đi qua mỗi điểm, bước 1pt)"""
+    if NUMPY_AVAILABLE:
+        boxes = np.asarray(bboxes, dtype=np.float64)
+        x0 = np.clip(boxes[:, 0].astype(np.int64) - left, 0, width)
+        x1 = np.clip(np.ceil(boxes[:, 2]).astype(np.int64) - left, 0, width)
+        heights = boxes[:, 3] - boxes[:, 1]
+        diff = (np.bincount(x0, weights=heights, minlength=width + 1)
+                - np.bincount(x1, weights=heights, minlength=width + 1))
+        return np.cumsum(diff[:width])
+    
+    diff = [0.0] * (width + 1)
+    for x0, y0, x1, y1 in bboxes:
+        diff[min(max(int(x0) - left, 0), width)] += y1 - y0
+        diff[min(max(int(-(-x1 // 1)) - left, 0), width)] -= y1 - y0
+    coverage = []
+    total = 0.0
+    for value in diff[:width]:
+        total += value
+        coverage.append(total)
+    return coverage
+
+
+def _empty_runs(coverage, share: float) -> List[Tuple[int, int]]:
+    """Các đoạn [start, end) liên tiếp có độ phủ <= share x độ phủ lớn nhất"""
+    if NUMPY_AVAILABLE:
+        threshold = share * coverage.max()
+        empty = np.concatenate(([0], (coverage <= threshold).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(empty))
+        return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+    
+    threshold = share * max(coverage)
+    runs = []
+    start = None
+    for x, value in enumerate(coverage):
+        if value <= threshold:
+            if start is None:
+                start = x
+        elif start is not None:
+            runs.append((start, x))
+            start = None
+    if start is not None:
+        runs.append((start, len(coverage)))
+    return runs
+
+
+def find_gutters(bboxes: List[BBox]) -> List[float]:
+    """
+    Tìm khe giữa các cột bằng phân tích chiếu theo trục x
+    
+    Chỉ xét các block hẹp (không trải qua nhiều cột). Khe là đoạn x nằm
+    giữa vùng text, đủ rộng và gần như không có block nào phủ, và mỗi
+    bên khe có đủ lượng text.
+    
+    Returns:
+        Tọa độ x giữa mỗi khe, tăng dần ([] = 1 cột)
+    """
+    if len(bboxes) < 2:
+        return []
+    
+    left = int(min(b[0] for b in bboxes))
+    right = int(-(-max(b[2] for b in bboxes) // 1))
+    width = right - left
+    narrow = [b[:4] for b in bboxes if b[2] - b[0] < SPANNING_WIDTH * width]
+    if len(narrow) < 2 or width <= 0:
+        return []
+    
+    # Cần ít nhất 2 cột, mỗi cột chứa đủ text của cả trang (tránh nhầm
+    # heading + số trang, hoặc form "Họ tên: ... Ngày: ..." là 2 cột)
+    total = sum(_area(b) for b in bboxes)
+    if sum(_area(b) for b in narrow) < 2 * MIN_COLUMN_SHARE * total:
+        return []
+    
+    gutters = []
+    for start, end in _empty_runs(_x_coverage(narrow, left, width), GUTTER_COVERAGE):
+        # Bỏ qua khoảng trống ở mép trái/phải của vùng text
+        if start > 0 and end < width and end - start >= MIN_GUTTER:
+            gutters.append(left + (start + end) / 2)
+    if not gutters:
+        return []
+    
+    edges = [float("-inf")] + gutters + [float("inf")]
+    for lo, hi in zip(edges, edges[1:]):
+        mass = sum(_area(b) for b in narrow if lo <= (b[0] + b[2]) / 2 < hi)
+        if mass < MIN_COLUMN_SHARE * total:
+            return []
+    
+    return gutters
+
+
+def column_order(bboxes: List[BBox],
+                 gutters: Optional[List[float]] = None) -> Optional[List[int]]:
+    """
+    Thứ tự đọc cho trang nhiều cột
+    
+    Block trải qua khe giữa các cột (tiêu đề, abstract, hình rộng) chia
+    trang thành các vùng theo chiều dọc; trong mỗi vùng đọc hết cột trái
+    rồi tới cột phải, mỗi cột từ trên xuống. O(n log n).
+    
+    Args:
+        bboxes: (x0, y0, x1, y1) của các block theo thứ tự gốc
+        gutters: Khe giữa các cột (mặc định: find_gutters(bboxes))
+    
+    Returns:
+        List index theo thứ tự đọc, None nếu trang chỉ có 1 cột
+    """
+    if gutters is None:
+        gutters = find_gutters(bboxes)
+    if not gutters:
+        return None
+    
+    def spans_gutter(b):
+        return any(b[0] < g < b[2] for g in gutters)
+    
+    spanning_tops = sorted(b[1] for b in bboxes if spans_gutter(b))
+    
+    keys = []
+    for i, b in enumerate(bboxes):
+        region = bisect_right(spanning_tops, b[1])
+        if spans_gutter(b):
+            # Mở đầu vùng mới, trước mọi cột của vùng đó
+            column = -1
+        else:
+            column = bisect_right(gutters, (b[0] + b[2]) / 2)
+        keys.append((region, column, b[1], b[0], i))
+    
+    keys.sort()
+    return [key[-1] for key in keys]
@@ -5,177 +5,916 @@ Parse PDF files using PyMuPDF (fitz) to IR
 """
 
 import os
+import marshal
+import tempfile
+from bisect import bisect_right
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import re
 
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
+    # find_tables() in gợi ý cài pymupdf_layout ra stdout (lẫn vào output CLI)
+    if hasattr(fitz, "no_recommend_layout"):
+        fitz.no_recommend_layout()
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
+from .ir_codec import SectionStore
 from .ir import (
-    Document, Section, Block, BlockType, Run, 
-    create_paragraph, create_heading
+    Document, Section, Block, BlockType, Run, TableRow, TableCell, SectionBuilder,
+    create_paragraph, create_heading, title_matches
 )
+from .pdf_layout import reflow_lines, join_lines, column_order, find_gutters
+from .heading_classifier import FontStats, HeadingClassifier
+from .headers_footers import RepeatDetector, repeat_key, is_repeat, estimate_tokens
+from .pdf_images import DEFAULT_WORKERS, extract_images, image_for, load_manifest
+from .normalize import new_counts, normalize_sections
+
+
+# Compact per-page elements (picklable, dùng chung cho serial và worker processes)
+# ("L", page_num, avg_size, is_bold, text, ((span_text, flags), ...), repeat_key)
+#     - dòng/đoạn; repeat_key != None nếu nằm ở lề trên/dưới (header/footer?)
+# ("H", page_num, level, text)  - heading lấy từ outline (fidelity="fast")
+# ("I", page_num, bbox)
+# ("T", page_num, bbox, ((cell_text | None, ...), ...))  - bảng, hàng đầu là header
+ELEM_LINE = "L"
+ELEM_HEADING = "H"
+ELEM_IMAGE = "I"
+ELEM_TABLE = "T"
+
+# PyMuPDF span flags
+FLAG_ITALIC = 2
+FLAG_BOLD = 16
+
+# fidelity="fast": chỉ cắt theo mediabox, không giữ ligature/whitespace/images
+TEXT_FLAGS_FAST = 64  # fitz.TEXT_MEDIABOX_CLIP
+
+# get_text("dict") mặc định + vector graphics (blocks type 3) cho pre-check bảng
+TEXTFLAGS_TABLES = (fitz.TEXTFLAGS_DICT | fitz.TEXT_COLLECT_VECTORS) if PYMUPDF_AVAILABLE else 0
+
+# memory="bounded": không giữ bytes của images trong get_text("dict"),
+# vị trí image lấy từ page.get_image_info()
+TEXTFLAGS_NO_IMAGES = (fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES) if PYMUPDF_AVAILABLE else 0
+
+# Mỗi worker nhận ít nhất chừng này trang một lần
+MIN_PAGES_PER_TASK = 8
+
+# memory="bounded": mở lại PDF sau chừng này trang (MuPDF giữ lại
+# các object đã parse cho tới khi đóng document)
+REOPEN_PAGES = 200
+
+# Pre-check bảng: cần đủ đường kẻ ngang/dọc dài hơn MIN_RULE_LENGTH
+MIN_RULE_LENGTH = 10.0
+MAX_RULE_WIDTH = 3.0
+MIN_RULES = 5
+
+
+def _span_flags(span: dict) -> int:
+    """Flags của span; font tên "...Bold" nhưng thiếu flag vẫn tính là đậm"""
+    flags = span.get("flags", 0)
+    if not flags & FLAG_BOLD and "bold" in span.get("font", "").lower():
+        flags |= FLAG_BOLD
+    return flags
+
+
+def _normalize_title(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _outline_by_page(doc) -> Dict[int, List[Tuple[int, str]]]:
+    """Outline (bookmarks) của PDF: page_num (0-based) → [(level, title), ...]"""
+    outline = {}
+    for entry in doc.get_toc(simple=True):
+        level, title, page = entry[:3]
+        if page >= 1 and title.strip():
+            outline.setdefault(page - 1, []).append((min(level, 4), title.strip()))
+    return outline
+
+
+def _split_at_gutters(block: dict, gutters: List[float]) -> List[dict]:
+    """
+    Tách text block mà PyMuPDF đã gộp dòng của 2 cột (cùng baseline)
+    thành các block con theo cột
+    """
+    x0, y0, x1, y1 = block["bbox"]
+    if not any(x0 < g < x1 for g in gutters):
+        return [block]
+    
+    groups = {}
+    for line in block.get("lines", []):
+        lx0, _, lx1, _ = line["bbox"]
+        if any(lx0 < g < lx1 for g in gutters):
+            return [block]  # dòng thật sự trải qua khe: giữ nguyên
+        groups.setdefault(bisect_right(gutters, lx0), []).append(line)
+    
+    if len(groups) < 2:
+        return [block]
+    
+    return [
+        {
+            "type": 0,
+            "bbox": (min(l["bbox"][0] for l in lines), min(l["bbox"][1] for l in lines),
+                     max(l["bbox"][2] for l in lines), max(l["bbox"][3] for l in lines)),
+            "lines": lines,
+        }
+        for _, lines in sorted(groups.items())
+    ]
+
+
+def _reading_order(blocks: list) -> list:
+    """Sắp xếp lại blocks (get_text("dict")) theo thứ tự đọc nếu trang có nhiều cột"""
+    # Phân tích cột theo từng dòng: block của PyMuPDF có thể gộp 2 cột
+    boxes = []
+    for block in blocks:
+        if block["type"] == 0:
+            boxes.extend(line["bbox"] for line in block.get("lines", []))
+        else:
+            boxes.append(block["bbox"])
+    
+    gutters = find_gutters(boxes)
+    if not gutters:
+        return blocks
+    
+    units = []
+    for block in blocks:
+        if block["type"] == 0:
+            units.extend(_split_at_gutters(block, gutters))
+        else:
+            units.append(block)
+    
+    order = column_order([unit["bbox"] for unit in units], gutters)
+    return [units[i] for i in order]
+
+
+def _extract_page_fast(page, page_num: int, headings: List[Tuple[int, str]],
+                       columns: bool = True) -> list:
+    """
+    Trích xuất nhanh (fidelity="fast"): text theo block, bỏ images,
+    headings chỉ lấy từ outline của PDF
+    """
+    elements = []
+    pending = list(headings)
+    height = page.rect.height
+    
+    blocks = page.get_text("blocks", flags=TEXT_FLAGS_FAST)
+    if columns:
+        # Chỉ có bbox của block (không có dòng): sắp xếp theo block
+        order = column_order([block[:4] for block in blocks])
+        if order is not None:
+            blocks = [blocks[i] for i in order]
+    
+    for block in blocks:
+        if block[6] != 0:  # Image block
+            continue
+        
+        text = join_lines(block[4].splitlines())
+        if not text:
+            continue
+        
+        # Block bắt đầu bằng tiêu đề outline → heading (+ phần text còn lại)
+        if pending:
+            words = text.split()
+            key = _normalize_title(text)
+            match = None
+            for i, (_, title) in enumerate(pending):
+                title_key = _normalize_title(title)
+                if key == title_key or key.startswith(title_key + " "):
+                    match = i
+                    break
+            
+            if match is not None:
+                # Các mục outline trước đó chưa khớp block nào: đặt ngay trước
+                for level, title in pending[:match + 1]:
+                    elements.append((ELEM_HEADING, page_num, level, title))
+                text = " ".join(words[len(pending[match][1].split()):])
+                del pending[:match + 1]
+                if not text:
+                    continue
+        
+        elements.append((ELEM_LINE, page_num, 0.0, False, text, ((text, 0),),
+                         repeat_key(text, block[1], block[3], height)))
+    
+    # Mục outline không khớp block nào: đặt ở đầu trang
+    if pending:
+        elements[:0] = [(ELEM_HEADING, page_num, level, title) for level, title in pending]
+    
+    return elements
+
+
+def ruling_bbox(vectors: list) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Pre-check rẻ cho bảng: từ vector blocks (type 3) mà get_text("dict")
+    đã thu thập sẵn, kiểm tra trang có đủ đường kẻ ngang và dọc không
+    
+    Returns:
+        Vùng bao các đường kẻ (để giới hạn find_tables), None nếu không có bảng
+    """
+    horizontal = vertical = 0
+    x0 = y0 = float("inf")
+    x1 = y1 = float("-inf")
+    
+    for vector in vectors:
+        bx0, by0, bx1, by1 = vector["bbox"]
+        width, height = bx1 - bx0, by1 - by0
+        if width >= MIN_RULE_LENGTH and height >= MIN_RULE_LENGTH:
+            # Khung ô: 2 cạnh ngang + 2 cạnh dọc
+            horizontal += 2
+            vertical += 2
+        elif width >= MIN_RULE_LENGTH and height <= MAX_RULE_WIDTH:
+            horizontal += 1
+        elif height >= MIN_RULE_LENGTH and width <= MAX_RULE_WIDTH:
+            vertical += 1
+        else:
+            continue
+        x0, y0 = min(x0, bx0), min(y0, by0)
+        x1, y1 = max(x1, bx1), max(y1, by1)
+    
+    if horizontal >= 2 and vertical >= 2 and horizontal + vertical >= MIN_RULES:
+        return (x0, y0, x1, y1)
+    return None
+
+
+def _find_tables(page, clip: Tuple[float, float, float, float]) -> list:
+    """Bảng (>= 2 hàng, >= 2 cột) trong vùng clip: [(bbox, rows), ...]"""
+    margin = MAX_RULE_WIDTH
+    clip = (clip[0] - margin, clip[1] - margin, clip[2] + margin, clip[3] + margin)
+    
+    tables = []
+    for table in page.find_tables(clip=clip).tables:
+        rows = table.extract()
+        if table.header.external:
+            rows = [table.header.names] + rows
+        if len(rows) < 2 or table.col_count < 2:
+            continue
+        tables.append((tuple(table.bbox), tuple(tuple(row) for row in rows)))
+    return tables
+
+
+def _table_index(bbox, tables: list) -> int:
+    """Index của bảng chứa tâm bbox, -1 nếu không có"""
+    cx = (bbox[0] + bbox[2]) / 2
+    cy = (bbox[1] + bbox[3]) / 2
+    for i, (table_bbox, _) in enumerate(tables):
+        if table_bbox[0] <= cx <= table_bbox[2] and table_bbox[1] <= cy <= table_bbox[3]:
+            return i
+    return -1
+
+
+def _insert_images(blocks: list, images: list) -> list:
+    """Chèn image blocks (chỉ có bbox) vào blocks theo vị trí dọc"""
+    for image in images:
+        bbox = tuple(image["bbox"])
+        index = next((i for i, block in enumerate(blocks) if block["bbox"][1] > bbox[1]),
+                     len(blocks))
+        blocks.insert(index, {"type": 1, "bbox": bbox})
+    return blocks
+
+
+def _extract_page(page, page_num: int, options: dict) -> list:
+    """Trích xuất các elements của 1 trang (chỉ giữ field parser cần)"""
+    elements = []
+    height = page.rect.height
+    tables = []
+    
+    bounded = options.get("memory") == "bounded"
+    flags = TEXTFLAGS_NO_IMAGES if bounded else fitz.TEXTFLAGS_DICT
+    
+    if options.get("tables"):
+        # Lấy luôn vector graphics trong cùng lần trích xuất text (gần như
+        # không tốn thêm); find_tables tốn ~80ms/trang nên chỉ chạy trên
+        # vùng có đường kẻ của những trang qua được pre-check
+        blocks = page.get_text("dict", flags=flags | fitz.TEXT_COLLECT_VECTORS)["blocks"]
+        vectors = [block for block in blocks if block["type"] == 3]
+        blocks = [block for block in blocks if block["type"] != 3]
+        clip = ruling_bbox(vectors)
+        if clip is not None:
+            tables = _find_tables(page, clip)
+    else:
+        blocks = page.get_text("dict", flags=flags)["blocks"]
+    
+    if bounded:
+        blocks = _insert_images(blocks, page.get_image_info())
+    
+    if options.get("columns"):
+        blocks = _reading_order(blocks)
+    emitted = set()
+    
+    for block in blocks:
+        if tables:
+            index = _table_index(block["bbox"], tables)
+            if index >= 0:
+                # Text trong bảng: thay bằng bảng, đặt tại vị trí block đầu tiên
+                if index not in emitted:
+                    emitted.add(index)
+                    elements.append((ELEM_TABLE, page_num) + tables[index])
+                continue
+        
+        if block["type"] == 0:  # Text block
+            lines = []
+            for line in block.get("lines", []):
+                spans = line.get("spans", [])
+                
+                if not spans:
+                    continue
+                
+                text = "".join(span["text"] for span in spans).strip()
+                if not text:
+                    continue
+                
+                span_flags = tuple(_span_flags(span) for span in spans)
+                avg_size = sum(s["size"] for s in spans) / len(spans)
+                is_bold = any(flags & FLAG_BOLD for flags in span_flags)
+                
+                x0, y0, x1, y1 = line["bbox"]
+                lines.append((
+                    x0, y0, x1, y1, avg_size, is_bold, text,
+                    tuple(zip((span["text"] for span in spans), span_flags))
+                ))
+            
+            if options.get("reflow"):
+                lines = reflow_lines(lines)
+            
+            for _, y0, _, y1, avg_size, is_bold, text, spans in lines:
+                elements.append((ELEM_LINE, page_num, avg_size, is_bold, text, spans,
+                                 repeat_key(text, y0, y1, height)))
+        
+        elif block["type"] == 1:  # Image block
+            elements.append((ELEM_IMAGE, page_num, block.get("bbox")))
+    
+    for index, table in enumerate(tables):
+        if index not in emitted:
+            elements.append((ELEM_TABLE, page_num) + table)
+    
+    return elements
+
+
+def _table_block(rows: tuple, page_num: int, bbox: tuple) -> Block:
+    """
+    Rows của find_tables → TABLE block đủ lưới như DOCX table_block
+    
+    (None = ô bị gộp với ô bên trái: lặp lại text của ô đó)
+    """
+    table_rows = []
+    for i, row in enumerate(rows):
+        texts = []
+        for text in row:
+            if text is None and texts:
+                texts.append(texts[-1])
+            else:
+                texts.append(" ".join((text or "").split()))
+        table_rows.append(TableRow(cells=[TableCell(content=[Run(text=text)]) for text in texts],
+                                   is_header=(i == 0)))
+    
+    return Block(
+        type=BlockType.TABLE,
+        rows=table_rows,
+        metadata={"page": page_num, "bbox": bbox}
+    )
+
+
+def _page_heading(text: str, level: int, page: Optional[dict]) -> Block:
+    """Heading block kèm metadata số trang (nếu có)"""
+    block = create_heading(text, level)
+    if page:
+        block.metadata = page
+    return block
+
+
+def _read_spilled(fp, count: int) -> Iterator[list]:
+    """Đọc lại elements của từng trang đã ghi bằng marshal.dump"""
+    fp.seek(0)
+    for _ in range(count):
+        yield marshal.load(fp)
+
+
+def _extract_page_range(pdf_path: str, page_numbers: List[int], options: dict) -> List[list]:
+    """Worker: tự mở PDF, trích xuất elements cho các trang được giao (0-based)"""
+    doc = fitz.open(pdf_path)
+    try:
+        if options.get("fidelity") == "fast":
+            outline = _outline_by_page(doc)
+            return [_extract_page_fast(doc[page_num], page_num, outline.get(page_num, []),
+                                       options.get("columns"))
+                    for page_num in page_numbers]
+        return [_extract_page(doc[page_num], page_num, options)
+                for page_num in page_numbers]
+    finally:
+        doc.close()
+
+
+def parse_page_spec(spec: str, page_count: int) -> List[int]:
+    """
+    Parse chuỗi chọn trang kiểu "1-5,8,12-" (1-based, như --pages)
+    
+    Args:
+        spec: Chuỗi chọn trang
+        page_count: Tổng số trang (cho khoảng mở "12-")
+    
+    Returns:
+        List số trang 1-based, tăng dần, không trùng
+    """
+    pages = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = part.split("-", 1)
+                first = int(first) if first else 1
+                last = int(last) if last else page_count
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}")
+        
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {part!r}")
+        pages.update(range(first, min(last, page_count) + 1))
+    
+    return sorted(pages)
+
+
+def outline_page_ranges(doc, sections: List[str]) -> List[int]:
+    """
+    Tìm các trang (0-based) của những mục outline có tiêu đề khớp `sections`
+    
+    Mỗi mục kéo dài tới trước mục kế tiếp có level <= level của nó.
+    
+    Raises:
+        ValueError: PDF không có outline hoặc không tìm thấy mục
+    """
+    toc = doc.get_toc(simple=True)
+    if not toc:
+        raise ValueError("PDF has no outline (bookmarks); use pages=... instead")
+    
+    pages = set()
+    for query in sections:
+        found = False
+        for i, (level, title, page) in enumerate(entry[:3] for entry in toc):
+            if page < 1 or not title_matches(title, query):
+                continue
+            
+            found = True
+            end = doc.page_count
+            for next_level, _, next_page in (entry[:3] for entry in toc[i + 1:]):
+                if next_level <= level and next_page >= 1:
+                    end = max(next_page - 1, page)
+                    break
+            pages.update(range(page - 1, min(end, doc.page_count)))
+        
+        if not found:
+            raise ValueError(f"Section not found in PDF outline: {query}")
+    
+    return sorted(pages)
 
 
 class PDFParser:
     """Parse PDF files to Intermediate Representation"""
     
-    def __init__(self):
+    # Tăng khi output IR thay đổi (invalidate IR cache)
+    VERSION = "12"
+    
+    def __init__(self, jobs: int = 1, reflow: bool = True, headings: str = "adaptive",
+                 fidelity: str = "full", pages: Union[str, Iterable[int], None] = None,
+                 sections: Optional[List[str]] = None, strip_repeats: bool = True,
+                 columns: bool = True, tables: bool = True,
+                 images_dir: Optional[str] = None, image_dpi: Optional[int] = None,
+                 memory: str = "normal", spill: bool = False, normalize: bool = True):
+        """
+        Args:
+            jobs: Số process song song để parse các khoảng trang (1 = serial)
+            reflow: Gộp các dòng thành đoạn văn (False = mỗi dòng 1 block)
+            headings: "adaptive" (học từ cỡ chữ của document, 2 pass)
+                hoặc "fixed" (ngưỡng 16pt/14pt)
+            fidelity: "full" (spans, formatting, images) hoặc "fast"
+                (chỉ text theo block, headings từ outline của PDF)
+            pages: Chỉ parse các trang này (1-based), vd "10-25" hoặc [10, 11]
+            sections: Chỉ parse các chương có tiêu đề này trong outline,
+                vd ["Chương 3"]
+            strip_repeats: Bỏ header/footer/số trang lặp lại trên nhiều trang
+                (False + headings="fixed" thì stream được từng trang)
+            columns: Sắp xếp lại thứ tự đọc cho trang 2 cột (trái rồi phải)
+            tables: Nhận diện bảng kẻ ô thành TABLE blocks (chỉ fidelity="full")
+            images_dir: Extract images vào thư mục này (kèm images.json)
+                và gán Block.image_path cho IMAGE blocks (chỉ fidelity="full")
+            image_dpi: Downscale images lớn hơn DPI này khi extract (cần Pillow)
+            memory: "normal" hoặc "bounded" (bộ nhớ không tăng theo số trang:
+                mở lại PDF theo từng khoảng trang, không giữ bytes của images,
+                elements của pass 1 ghi ra file tạm)
+            spill: parse() trả về Document có sections lưu trong file tạm
+                (SectionStore) thay vì list trong bộ nhớ
+            normalize: Gộp các runs liền nhau cùng formatting, bỏ runs rỗng
+        """
         if not PYMUPDF_AVAILABLE:
             raise ImportError(
                 "PyMuPDF is not installed. "
                 "Install with: pip install PyMuPDF"
             )
+        if headings not in ("adaptive", "fixed"):
+            raise ValueError(f"Unknown headings mode: {headings}")
+        if fidelity not in ("full", "fast"):
+            raise ValueError(f"Unknown fidelity: {fidelity}")
+        if memory not in ("normal", "bounded"):
+            raise ValueError(f"Unknown memory mode: {memory}")
+        
+        self.jobs = max(1, jobs or 1)
+        self.reflow = reflow
+        self.headings = headings
+        self.fidelity = fidelity
+        self.pages = pages if isinstance(pages, (str, type(None))) else list(pages)
+        self.sections = list(sections) if sections else None
+        self.strip_repeats = strip_repeats
+        self.columns = columns
+        self.tables = tables
+        self.images_dir = images_dir
+        self.image_dpi = image_dpi
+        self.image_manifest: Optional[dict] = None
+        self.memory = memory
+        self.spill = spill
+        self.classifier: Optional[HeadingClassifier] = None
+        self.normalize = normalize
+        # Thống kê header/footer đã bỏ và runs đã gộp ở lần parse gần nhất
+        self.stripped = {"lines": 0, "chars": 0, "tokens": 0}
+        self.normalized = new_counts()
     
-    def parse(self, pdf_path: str) -> Document:
+    def cache_options(self) -> dict:
+        """Options ảnh hưởng tới output IR (dùng làm cache key)"""
+        if self.fidelity == "fast":
+            options = {"fidelity": "fast"}
+        else:
+            options = {"fidelity": "full", "reflow": self.reflow, "headings": self.headings,
+                       "tables": self.tables}
+        options["strip_repeats"] = self.strip_repeats
+        options["columns"] = self.columns
+        if self.memory == "bounded" and self.fidelity != "fast":
+            # Vị trí image lấy từ get_image_info(), thứ tự có thể khác chút ít
+            options["memory"] = self.memory
+        if self.images_dir and self.fidelity != "fast":
+            options["images_dir"] = self.images_dir
+            options["image_dpi"] = self.image_dpi
+        if self.pages is not None:
+            options["pages"] = self.pages
+        if self.sections:
+            options["sections"] = self.sections
+        if not self.normalize:
+            options["normalize"] = False
+        return options
+    
+    def outputs_exist(self) -> bool:
+        """
+        File phụ mà parse ghi ra (images.json + images) còn đủ không
+        
+        IRCache chỉ dùng entry khi còn đủ, để image bị xóa được extract lại.
+        """
+        if not (self.images_dir and self.fidelity != "fast"):
+            return True
+        manifest = load_manifest(self.images_dir)
+        if manifest is None:
+            return False
+        return all(os.path.exists(os.path.join(self.images_dir, filename))
+                   for filename in manifest["images"])
+    
+    def parse(self, pdf_path: str, pages: Union[str, Iterable[int], None] = None,
+              sections: Optional[List[str]] = None) -> Document:
         """
         Parse PDF file to Document IR
         
         Args:
             pdf_path: Đường dẫn đến file PDF
+            pages: Chỉ parse các trang này (1-based), mặc định self.pages
+            sections: Chỉ parse các chương trong outline, mặc định self.sections
         
         Returns:
             Document object chứa nội dung đã parse
+        
+        Example:
+            >>> PDFParser().parse("thesis.pdf", sections=["Chương 3"])
         """
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"File not found: {pdf_path}")
+        doc = self._open(pdf_path)
         
-        doc = fitz.open(pdf_path)
+        try:
+            ir_doc = self._document_info(doc, pdf_path)
+            if self.spill:
+                ir_doc.sections = SectionStore()
+            page_numbers = self._select_pages(doc, pages, sections)
+            ir_doc.sections.extend(self._iter_sections(doc, pdf_path, page_numbers))
+        finally:
+            doc.close()
         
-        # Create IR Document
-        ir_doc = Document(
+        return ir_doc
+    
+    def document_info(self, pdf_path: str) -> Document:
+        """Document (title, author, nguồn) chưa có sections, chỉ đọc metadata"""
+        doc = self._open(pdf_path)
+        try:
+            return self._document_info(doc, pdf_path)
+        finally:
+            doc.close()
+    
+    def _document_info(self, doc, pdf_path: str) -> Document:
+        return Document(
             title=doc.metadata.get("title", Path(pdf_path).stem),
             author=doc.metadata.get("author", ""),
             source_path=pdf_path,
             source_type="pdf"
         )
+    
+    def iter_sections(self, pdf_path: str, pages: Union[str, Iterable[int], None] = None,
+                      sections: Optional[List[str]] = None) -> Iterator[Section]:
+        """
+        Parse PDF và yield từng Section ngay khi gặp H1 tiếp theo
+        
+        Chỉ giữ trong bộ nhớ section đang parse, không build cả Document.
+        
+        Args:
+            pdf_path: Đường dẫn đến file PDF
+            pages: Chỉ parse các trang này (1-based), mặc định self.pages
+            sections: Chỉ parse các chương trong outline, mặc định self.sections
+        
+        Yields:
+            Section đã hoàn chỉnh, theo thứ tự trong file
+        """
+        doc = self._open(pdf_path)
+        
+        try:
+            page_numbers = self._select_pages(doc, pages, sections)
+            yield from self._iter_sections(doc, pdf_path, page_numbers)
+        finally:
+            doc.close()
+    
+    def _select_pages(self, doc, pages, sections) -> List[int]:
+        """Các trang (0-based) cần parse theo pages/sections"""
+        pages = self.pages if pages is None else pages
+        sections = self.sections if sections is None else sections
+        
+        if sections:
+            selected = set(outline_page_ranges(doc, sections))
+            if pages is None:
+                return sorted(selected)
+        elif pages is None:
+            return list(range(doc.page_count))
+        else:
+            selected = None
         
-        current_section = None
+        if isinstance(pages, str):
+            pages = parse_page_spec(pages, doc.page_count)
+        by_pages = {p - 1 for p in pages if 1 <= p <= doc.page_count}
         
-        for page_num, page in enumerate(doc):
-            blocks = page.get_text("dict")["blocks"]
+        # Có cả pages và sections: lấy phần giao
+        return sorted(by_pages if selected is None else by_pages & selected)
+    
+    def _open(self, pdf_path: str):
+        """Mở file PDF bằng PyMuPDF"""
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"File not found: {pdf_path}")
+        
+        return fitz.open(pdf_path)
+    
+    def _iter_sections(self, doc, pdf_path: str, page_numbers: List[int]) -> Iterator[Section]:
+        """Trích xuất elements từng trang rồi gom thành sections"""
+        page_elements = self._iter_page_elements(doc, pdf_path, page_numbers)
+        self.stripped = {"lines": 0, "chars": 0, "tokens": 0}
+        self.normalized = new_counts()
+        
+        self.image_manifest = None
+        if self.images_dir and self.fidelity != "fast":
+            self.image_manifest = extract_images(doc, self.images_dir, page_numbers,
+                                                 max_dpi=self.image_dpi)
+        
+        if self.fidelity == "fast":
+            # Headings đã có từ outline, mọi dòng khác là paragraph
+            self.classifier = HeadingClassifier({})
+        elif self.headings == "fixed":
+            self.classifier = HeadingClassifier.fixed()
+        
+        if not (self.strip_repeats or self.classifier is None):
+            yield from self._normalized(self._build_sections(page_elements, self.classifier))
+            return
+        
+        # Pass 1: giữ elements gọn của mọi trang (memory="bounded": trong
+        # file tạm), thống kê cỡ chữ và đếm dòng ở lề trên/dưới lặp lại
+        with tempfile.TemporaryFile() if self.memory == "bounded" else nullcontext() as spill:
+            pages = []
+            stats = FontStats()
+            detector = RepeatDetector()
+            for elements in page_elements:
+                keys = []
+                for element in elements:
+                    if element[0] == ELEM_LINE:
+                        stats.add(element[2], element[3], len(element[4]))
+                        keys.append(element[6])
+                detector.add_page(keys)
+                if spill is None:
+                    pages.append(elements)
+                else:
+                    marshal.dump(elements, spill)
+            
+            if spill is not None:
+                pages = _read_spilled(spill, detector.pages)
+            
+            # Pass 2: phân loại heading theo phân bố cỡ chữ của document
+            body_size = 0.0
+            if self.fidelity != "fast":
+                fitted = HeadingClassifier.fit(stats)
+                if self.classifier is None:
+                    self.classifier = fitted
+                body_size = (fitted.body_key or 0) / 2
             
-            for block in blocks:
-                if block["type"] == 0:  # Text block
-                    for line in block.get("lines", []):
-                        text = ""
-                        spans = line.get("spans", [])
-                        
-                        if not spans:
-                            continue
-                        
-                        # Get text and detect if heading
-                        for span in spans:
-                            text += span["text"]
-                        
-                        text = text.strip()
-                        if not text:
-                            continue
-                        
-                        # Detect heading by font size
-                        avg_size = sum(s["size"] for s in spans) / len(spans)
-                        is_bold = any(s.get("flags", 0) & 2 for s in spans)
-                        
-                        if avg_size >= 16 and is_bold:
-                            # H1 heading
-                            level = 1
-                            if current_section:
-                                ir_doc.sections.append(current_section)
-                            current_section = Section(title=text, level=level)
-                        
-                        elif avg_size >= 14 and is_bold:
-                            # H2 heading
-                            if current_section is None:
-                                current_section = Section(title="Document", level=1)
-                            current_section.blocks.append(create_heading(text, 2))
-                        
-                        else:
-                            # Normal paragraph
-                            if current_section is None:
-                                current_section = Section(title="Document", level=1)
-                            
-                            runs = []
-                            for span in spans:
-                                is_span_bold = span.get("flags", 0) & 2
-                                is_italic = span.get("flags", 0) & 1
-                                runs.append(Run(
-                                    text=span["text"],
-                                    bold=bool(is_span_bold),
-                                    italic=bool(is_italic)
-                                ))
-                            
-                            current_section.blocks.append(Block(
-                                type=BlockType.PARAGRAPH,
-                                runs=runs
-                            ))
+            page_elements = pages
+            if self.strip_repeats:
+                repeated = detector.repeated()
+                if repeated:
+                    page_elements = (self._strip_repeated(elements, repeated, body_size)
+                                     for elements in pages)
+            
+            yield from self._normalized(self._build_sections(page_elements, self.classifier))
+    
+    def _normalized(self, sections: Iterator[Section]) -> Iterator[Section]:
+        """Gộp runs (nếu self.normalize), đếm vào self.normalized"""
+        if not self.normalize:
+            return sections
+        return normalize_sections(sections, self.normalized)
+    
+    def _strip_repeated(self, elements: list, repeated: set, body_size: float) -> list:
+        """Bỏ các dòng header/footer của 1 trang, cập nhật self.stripped"""
+        kept = []
+        for element in elements:
+            if element[0] == ELEM_LINE and is_repeat(element[6], element[2], repeated, body_size):
+                self.stripped["lines"] += 1
+                self.stripped["chars"] += len(element[4])
+                continue
+            kept.append(element)
+        self.stripped["tokens"] = estimate_tokens(self.stripped["chars"])
+        return kept
+    
+    def _iter_page_elements(self, doc, pdf_path: str, page_numbers: List[int]) -> Iterator[list]:
+        """Yield list elements của từng trang được chọn, theo thứ tự trang"""
+        options = self.cache_options()
+        
+        if self.jobs == 1 or len(page_numbers) < 2 * MIN_PAGES_PER_TASK:
+            if self.memory == "bounded":
+                # Mỗi khoảng trang mở PDF riêng, đóng lại là giải phóng
+                # cache object của MuPDF; page nào xong là bỏ luôn
+                for i in range(0, len(page_numbers), REOPEN_PAGES):
+                    yield from _extract_page_range(pdf_path, page_numbers[i:i + REOPEN_PAGES],
+                                                   options)
+                return
+            
+            if self.fidelity == "fast":
+                outline = _outline_by_page(doc)
+                for page_num in page_numbers:
+                    yield _extract_page_fast(doc[page_num], page_num,
+                                             outline.get(page_num, []), self.columns)
+                return
+            
+            for page_num in page_numbers:
+                yield _extract_page(doc[page_num], page_num, options)
+            return
+        
+        # Chia khoảng trang cho các worker; nhiều task nhỏ hơn số worker
+        # để cân tải, kết quả được lấy lại theo đúng thứ tự trang
+        step = max(MIN_PAGES_PER_TASK, -(-len(page_numbers) // (self.jobs * 4)))
+        tasks = [page_numbers[i:i + step] for i in range(0, len(page_numbers), step)]
+        
+        # memory="bounded": chỉ giữ vài task chưa lấy kết quả cùng lúc
+        window = self.jobs * 2 if self.memory == "bounded" else len(tasks)
+        
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            pending = deque()
+            for task in tasks:
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_extract_page_range, pdf_path, task, options))
+            while pending:
+                yield from pending.popleft().result()
+    
+    def _build_sections(self, page_elements: Iterable[list],
+                        classifier: HeadingClassifier) -> Iterator[Section]:
+        """
+        Gom elements (theo thứ tự trang) thành sections
+        
+        Số trang: section bắt đầu ở H1 có metadata["page"]; trong section, chỉ
+        block đầu tiên của mỗi trang có metadata["page"] (các block sau cùng
+        trang không cần dict metadata riêng), bảng/image luôn có page + bbox.
+        """
+        builder = SectionBuilder()
+        marked = None  # Trang đã ghi gần nhất trong section hiện tại
+        
+        def page_metadata(page_num: int) -> Optional[dict]:
+            nonlocal marked
+            if page_num == marked:
+                return None
+            marked = page_num
+            return {"page": page_num}
+        
+        for elements in page_elements:
+            for element in elements:
+                if element[0] == ELEM_LINE:
+                    _, page_num, avg_size, is_bold, text, spans, _ = element
+                    
+                    level = classifier.classify(avg_size, is_bold, text)
+                    
+                    if level == 1:
+                        # H1 heading
+                        finished = builder.start(text, level=1)
+                        builder.section.metadata["page"] = marked = page_num
+                        if finished:
+                            yield finished
+                    
+                    elif level:
+                        # H2-H4 heading
+                        builder.add(_page_heading(text, level, page_metadata(page_num)))
+                    
+                    else:
+                        # Normal paragraph
+                        runs = [
+                            Run(text=span_text, bold=bool(flags & FLAG_BOLD),
+                                italic=bool(flags & FLAG_ITALIC))
+                            for span_text, flags in spans
+                        ]
+                        builder.add(Block(
+                            type=BlockType.PARAGRAPH,
+                            runs=runs,
+                            metadata=page_metadata(page_num)
+                        ))
                 
-                elif block["type"] == 1:  # Image block
-                    if current_section is None:
-                        current_section = Section(title="Document", level=1)
+                elif element[0] == ELEM_HEADING:
+                    _, page_num, level, text = element
                     
-                    # Extract image info
-                    current_section.blocks.append(Block(
+                    if level == 1:
+                        finished = builder.start(text, level=1)
+                        builder.section.metadata["page"] = marked = page_num
+                        if finished:
+                            yield finished
+                    else:
+                        builder.add(_page_heading(text, level, page_metadata(page_num)))
+                
+                elif element[0] == ELEM_TABLE:
+                    _, page_num, bbox, rows = element
+                    builder.add(_table_block(rows, page_num, bbox))
+                    marked = page_num
+                
+                elif element[0] == ELEM_IMAGE:
+                    _, page_num, bbox = element
+                    image_path = None
+                    if self.image_manifest is not None:
+                        filename = image_for(self.image_manifest, page_num, bbox)
+                        if filename:
+                            image_path = os.path.join(self.images_dir, filename)
+                    builder.add(Block(
                         type=BlockType.IMAGE,
-                        metadata={"page": page_num, "bbox": block.get("bbox")}
+                        image_path=image_path,
+                        metadata={"page": page_num, "bbox": bbox}
                     ))
+                    marked = page_num
         
         # Add last section
-        if current_section:
-            ir_doc.sections.append(current_section)
-        
-        doc.close()
-        return ir_doc
+        last = builder.finish()
+        if last:
+            yield last
     
-    def extract_images(self, pdf_path: str, output_dir: str) -> List[str]:
+    def extract_images(self, pdf_path: str, output_dir: str, max_dpi: Optional[int] = None,
+                       workers: int = DEFAULT_WORKERS) -> List[str]:
         """
         Extract all images from PDF
         
+        Mỗi image chỉ được ghi 1 lần dù lặp lại trên nhiều trang;
+        images.json trong output_dir ghi image nào nằm ở trang nào.
+        
         Args:
             pdf_path: Đường dẫn PDF
             output_dir: Thư mục lưu images
+            max_dpi: Downscale images lớn hơn DPI này (cần Pillow)
+            workers: Số thread ghi file
         
         Returns:
-            List đường dẫn các images đã extract
+            List đường dẫn các images đã extract (không trùng lặp)
         """
-        os.makedirs(output_dir, exist_ok=True)
+        doc = self._open(pdf_path)
         
-        doc = fitz.open(pdf_path)
-        image_paths = []
+        try:
+            manifest = extract_images(doc, output_dir, max_dpi=max_dpi, workers=workers)
+        finally:
+            doc.close()
         
-        for page_num, page in enumerate(doc):
-            images = page.get_images()
-            
-            for img_index, img in enumerate(images):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                
-                if base_image:
-                    image_bytes = base_image["image"]
-                    image_ext = base_image["ext"]
-                    
-                    filename = f"page{page_num+1}_img{img_index+1}.{image_ext}"
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(image_bytes)
-                    
-                    image_paths.append(filepath)
-                    print(f"✓ Extracted: {filename}")
-        
-        doc.close()
-        return image_paths
+        placements = sum(len(placed) for placed in manifest["pages"].values())
+        print(f"✓ Extracted: {len(manifest['images'])} images ({placements} placements)")
+        return [os.path.join(output_dir, filename) for filename in manifest["images"]]
 
 
-def parse_pdf(pdf_path: str) -> Document:
+def parse_pdf(pdf_path: str, jobs: int = 1, fidelity: str = "full") -> Document:
     """
     Hàm tiện ích để parse PDF
     
     Args:
         pdf_path: Đường dẫn file PDF
+        jobs: Số process song song (1 = serial)
+        fidelity: "full" hoặc "fast" (text-only)
     
     Returns:
         Document IR
@@ -184,7 +923,7 @@ def parse_pdf(pdf_path: str) -> Document:
         >>> doc = parse_pdf("thesis.pdf")
         >>> print(doc.get_section_count())
     """
-    parser = PDFParser()
+    parser = PDFParser(jobs=jobs, fidelity=fidelity)
     return parser.parse(pdf_path)
 
 
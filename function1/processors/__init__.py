@@ -1,4 +1,5 @@
 """Processors Package"""
 from .splitter import Splitter, split_document
+from .chunk_writer import ChunkWriter, ChunkIndex
 
-__all__ = ["Splitter", "split_document"]
+__all__ = ["Splitter", "split_document", "ChunkWriter", "ChunkIndex"]
@@ -0,0 +1,305 @@
+"""
+Chunk Writer
+=============
+Ghi chunks ra thư mục kèm manifest chunks.json, chỉ ghi lại chunk đã thay đổi
+
+Mỗi chunk được render thành bytes và băm; chunk có cùng tên file và cùng hash
+với lần chạy trước (theo manifest cũ) không bị ghi lại, nên mtime giữ nguyên
+cho các tool theo dõi phía sau. File được ghi atomic (file tạm + os.replace)
+trong thread pool; chunk của lần chạy trước không còn nữa bị xóa.
+
+chunks.json cũng là index cho consumer: mỗi chunk có title path, cấp heading,
+khoảng trang nguồn, số ký tự/token, hash và offset trong chunks.store (file
+nối tất cả chunks, tùy chọn). ChunkIndex đọc 1 chunk bất kỳ bằng 1 lần tra
+dict + 1 lần seek, không cần quét thư mục.
+"""
+
+import hashlib
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from function1.parsers.headers_footers import estimate_tokens
+from function1.parsers.ir import Section
+
+
+MANIFEST_NAME = "chunks.json"
+STORE_NAME = "chunks.store"
+MANIFEST_VERSION = 2
+
+
+def chunk_filename(chunk: Section, index: int, format: str = "md") -> str:
+    """Tên file của chunk thứ index (bắt đầu từ 1)"""
+    safe_title = "".join(c if c.isalnum() or c in " -_" else "_"
+                         for c in chunk.title[:30])
+    return f"chunk_{index:03d}_{safe_title.strip()}.{format}"
+
+
+def render_markdown(chunk: Section) -> str:
+    """Markdown của chunk"""
+    buffer = io.StringIO()
+    chunk.write_markdown(buffer)
+    return buffer.getvalue()
+
+
+def page_range(chunk: Section) -> Optional[Tuple[int, int]]:
+    """
+    Trang đầu/cuối của chunk theo metadata["page"] của section và các block
+    
+    Đánh số từ 1 như --pages và outline.json (metadata["page"] của PDFParser
+    đánh số từ 0); None nếu không có, ví dụ DOCX.
+    """
+    pages = [block._metadata["page"] for block in chunk.blocks
+             if block._metadata and "page" in block._metadata]
+    if "page" in chunk.metadata:
+        pages.append(chunk.metadata["page"])
+    if not pages:
+        return None
+    return min(pages) + 1, max(pages) + 1
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Ghi data vào file tạm cùng thư mục rồi đổi tên (không để lại file dở)"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class ChunkWriter:
+    """
+    Ghi chunks theo thứ tự vào output_dir, bỏ qua chunk không đổi
+    
+    Example:
+        >>> with ChunkWriter("output/chunks") as writer:
+        ...     for chunk in splitter.iter_split(sections):
+        ...         writer.write(chunk)
+        >>> writer.counts
+        {'written': 3, 'unchanged': 40, 'removed': 1}
+    """
+    
+    def __init__(self, output_dir: str, format: str = "md",
+                 render: Optional[Callable[[Section], str]] = None, workers: int = 4,
+                 store: bool = False):
+        """
+        Args:
+            output_dir: Thư mục output (được tạo nếu chưa có)
+            format: Đuôi file chunk (md | txt)
+            render: Hàm chunk → text, mặc định Markdown
+            workers: Số thread ghi file (1 = ghi tuần tự)
+            store: Ghi thêm chunks.store (nối mọi chunk, offset theo manifest)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.render = render or render_markdown
+        self.workers = workers
+        
+        self.entries: List[dict] = []
+        self.counts = {"written": 0, "unchanged": 0, "removed": 0}
+        self._previous = self._load_manifest()
+        self._offset = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: deque = deque()
+        
+        self._store = None
+        if store:
+            self._store_tmp = self.store_path.with_name(f"{STORE_NAME}.{os.getpid()}.tmp")
+            self._store = open(self._store_tmp, "wb")
+    
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST_NAME
+    
+    @property
+    def store_path(self) -> Path:
+        return self.output_dir / STORE_NAME
+    
+    def _load_manifest(self) -> Dict[str, str]:
+        """file → hash của lần chạy trước ({} nếu chưa có hoặc không đọc được)"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return {entry["file"]: entry["hash"] for entry in manifest.get("chunks", [])}
+    
+    def write(self, chunk: Section) -> str:
+        """
+        Render chunk, ghi file nếu nội dung khác lần chạy trước
+        
+        Returns:
+            Đường dẫn file của chunk
+        """
+        filename = chunk_filename(chunk, len(self.entries) + 1, self.format)
+        path = self.output_dir / filename
+        text = self.render(chunk)
+        data = text.encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        
+        self.entries.append({
+            "file": filename,
+            "title": chunk.title,
+            "path": chunk.metadata.get("breadcrumb") or [chunk.title],
+            "level": chunk.level,
+            "pages": page_range(chunk),
+            "chars": len(text),
+            "tokens": estimate_tokens(len(text)),
+            "hash": digest,
+            "offset": self._offset,
+            "bytes": len(data),
+        })
+        self._offset += len(data)
+        if self._store is not None:
+            self._store.write(data)
+        
+        if (self._previous.get(filename) == digest and path.is_file()
+                and path.stat().st_size == len(data)):
+            self.counts["unchanged"] += 1
+        else:
+            self._submit(path, data)
+            self.counts["written"] += 1
+        return str(path)
+    
+    def _submit(self, path: Path, data: bytes) -> None:
+        if self.workers <= 1:
+            write_atomic(path, data)
+            return
+        
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending.append(self._pool.submit(write_atomic, path, data))
+        # Giới hạn số chunk đang chờ ghi trong bộ nhớ
+        while len(self._pending) > self.workers * 4:
+            self._pending.popleft().result()
+    
+    def _drain(self) -> None:
+        """Chờ mọi file đang ghi xong"""
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+    
+    def close(self) -> Dict[str, int]:
+        """
+        Chờ ghi xong, xóa chunk cũ không còn dùng, ghi manifest
+        
+        Returns:
+            counts: {"written", "unchanged", "removed"}
+        """
+        self._drain()
+        
+        current = {entry["file"] for entry in self.entries}
+        stale = set(self._previous)
+        stale.update(path.name for path in self.output_dir.glob(f"chunk_*.{self.format}"))
+        for name in sorted(stale - current):
+            try:
+                (self.output_dir / name).unlink()
+                self.counts["removed"] += 1
+            except FileNotFoundError:
+                pass
+        
+        # Offset trong store cũ không còn đúng khi chunks thay đổi
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+            os.replace(self._store_tmp, self.store_path)
+        elif self.store_path.exists():
+            self.store_path.unlink()
+        
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "format": self.format,
+            "store": STORE_NAME if self.store_path.exists() else None,
+            "chunks": self.entries,
+        }
+        write_atomic(self.manifest_path, json.dumps(
+            manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return self.counts
+    
+    def __enter__(self) -> "ChunkWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Lỗi giữa chừng: không xóa gì, giữ manifest cũ
+            self._drain()
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+                os.unlink(self._store_tmp)
+
+
+class ChunkIndex:
+    """
+    Đọc chunks.json, lấy 1 chunk theo số thứ tự hoặc title path trong O(1)
+    
+    Example:
+        >>> index = ChunkIndex("output/thesis/markdown")
+        >>> index.find("Chương 2 > Mục 2.1")["pages"]
+        [12, 15]
+        >>> text = index.read("Chương 2 > Mục 2.1")
+    """
+    
+    def __init__(self, output_dir: str):
+        """
+        Args:
+            output_dir: Thư mục chứa chunks.json (output của ChunkWriter)
+        
+        Raises:
+            FileNotFoundError: Không có chunks.json
+            ValueError: Manifest khác version
+        """
+        self.output_dir = Path(output_dir)
+        with open(self.output_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unknown chunk manifest version: {manifest.get('version')}")
+        
+        self.entries: List[dict] = manifest["chunks"]
+        self.store = self.output_dir / manifest["store"] if manifest.get("store") else None
+        # Title path → vị trí (path trùng: giữ chunk đầu tiên, các phần sau tra theo số)
+        self._by_path: Dict[str, int] = {}
+        for i, entry in enumerate(self.entries):
+            self._by_path.setdefault(" > ".join(entry["path"]), i)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def find(self, key: Union[int, str]) -> dict:
+        """
+        Entry của chunk theo số thứ tự (từ 0) hoặc title path ("Chương 2 > Mục 2.1")
+        
+        Raises:
+            KeyError: Không có chunk
+        """
+        if isinstance(key, str):
+            key = self._by_path[key]
+        return self.entries[key]
+    
+    def read(self, key: Union[int, str]) -> str:
+        """Nội dung chunk: đọc từ chunks.store nếu có, không thì từ file chunk"""
+        entry = self.find(key)
+        if self.store is not None:
+            with open(self.store, "rb") as f:
+                f.seek(entry["offset"])
+                data = f.read(entry["bytes"])
+        else:
+            with open(self.output_dir / entry["file"], "rb") as f:
+                data = f.read()
+        return data.decode("utf-8")
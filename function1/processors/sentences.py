@@ -0,0 +1,78 @@
+"""
+Sentence Splitter
+==================
+Tách câu cho văn bản tiếng Việt (và tiếng Anh) bằng quy tắc, thời gian tuyến tính
+
+Ranh giới câu là dấu . ! ? … (kèm ngoặc/nháy đóng) rồi khoảng trắng, và từ
+tiếp theo bắt đầu bằng chữ hoa (kể cả Đ, Ư, Ơ, chữ có dấu), chữ số hoặc
+ngoặc/nháy mở. Không tách sau các viết tắt thường gặp (TP., ThS., PGS.,
+v.v.) và sau chữ cái viết tắt của tên (Nguyễn V. An).
+"""
+
+import re
+from typing import List
+
+
+# Viết tắt (viết thường, bỏ dấu chấm cuối) không kết thúc câu
+ABBREVIATIONS = frozenset({
+    # Học hàm, học vị, chức danh
+    "gs", "pgs", "ts", "tskh", "ths", "th.s", "ks", "bs", "cn", "ls", "kts",
+    "mr", "mrs", "ms", "dr", "prof",
+    # Địa danh, hành chính
+    "tp", "q", "p", "tx", "tt",
+    # Tài liệu, trích dẫn
+    "tr", "nxb", "vd", "v.v", "vv", "no", "vol", "fig", "eq", "tab", "ch",
+    "e.g", "i.e", "cf", "al", "st",
+})
+
+_END = re.compile(r'[.!?…]+["”’»)\]]*\s+')
+_OPENERS = '"“‘«(['
+
+
+def sentence_starts(text: str) -> List[int]:
+    """
+    Vị trí bắt đầu của các câu thứ 2 trở đi trong text
+    
+    Khoảng trắng sau dấu câu thuộc về câu trước, nên text[:i] là câu trước
+    (kèm khoảng trắng) và text[i:] bắt đầu ngay ở chữ đầu câu.
+    """
+    starts = []
+    length = len(text)
+    
+    for match in _END.finditer(text):
+        end = match.end()
+        if end >= length:
+            break
+        
+        first = text[end]
+        if not (first.isupper() or first.isdigit() or first in _OPENERS):
+            continue
+        
+        # Từ đứng ngay trước dấu câu
+        stop = match.start()
+        begin = stop
+        while begin > 0 and not text[begin - 1].isspace():
+            begin -= 1
+        word = text[begin:stop].lstrip(_OPENERS)
+        
+        if text[stop] == "." and (
+            word.lower() in ABBREVIATIONS
+            or (len(word) == 1 and word.isupper())
+        ):
+            continue
+        
+        starts.append(end)
+    
+    return starts
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Tách text thành các câu (nối lại đúng bằng text ban đầu)
+    
+    Example:
+        >>> split_sentences("TP. Hồ Chí Minh rất đông. Hà Nội thì sao?")
+        ['TP. Hồ Chí Minh rất đông. ', 'Hà Nội thì sao?']
+    """
+    bounds = [0, *sentence_starts(text), len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
@@ -5,23 +5,58 @@ Split document thành chunks theo heading level
 """
 
 import os
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from function1.parsers.ir import Document, Section, Block, BlockType
+from function1.parsers.headers_footers import CHARS_PER_TOKEN, estimate_tokens
+from function1.parsers.ir import Document, Section, Block, BlockType, Run, table_width
+
+from .chunk_writer import ChunkWriter, chunk_filename
+from .sentences import sentence_starts
+
+
+# Ký tự markdown tối đa quanh 1 run (***text***)
+_RUN_MARKUP = 6
+
+
+class _CharCounter:
+    """File-like chỉ đếm số ký tự được ghi (đo kích thước markdown)"""
+    
+    __slots__ = ("count",)
+    
+    def __init__(self):
+        self.count = 0
+    
+    def write(self, text: str) -> None:
+        self.count += len(text)
 
 
 class Splitter:
     """Split document theo heading level"""
     
-    def __init__(self, split_level: int = 1, max_chars: int = 6000):
+    PACK_UNITS = ("chars", "tokens")
+    
+    def __init__(self, split_level: int = 1, max_chars: int = 6000,
+                 pack_target: int = 0, pack_unit: str = "chars"):
         """
         Args:
             split_level: Heading level để split (1 = H1, 2 = H2)
-            max_chars: Max characters per chunk (optional further split)
+            max_chars: Số ký tự markdown tối đa mỗi chunk; section lớn hơn
+                được tách tiếp theo block, rồi theo câu (0/None = không giới hạn)
+            pack_target: Gom các chunk liền nhau thành chunk gần pack_target
+                (không vượt max_chars), 0 = mỗi heading 1 chunk
+            pack_unit: Đơn vị của pack_target (chars | tokens)
         """
+        if pack_unit not in self.PACK_UNITS:
+            raise ValueError(f"Unknown pack unit: {pack_unit}")
+        
         self.split_level = split_level
         self.max_chars = max_chars
+        self.pack_target = pack_target
+        self.pack_unit = pack_unit
+        # Số ký tự markdown của các chunk đã gom (khi pack_target > 0)
+        self.sizes: List[int] = []
     
     def split(self, document: Document) -> List[Section]:
         """
@@ -33,17 +68,34 @@ class Splitter:
         Returns:
             List các Section (chunks)
         """
-        if self.split_level == 1:
-            # Mỗi section trong document là 1 chunk
-            return document.sections
+        return list(self.iter_split(document.sections))
+    
+    def iter_split(self, sections: Iterable[Section]) -> Iterator[Section]:
+        """
+        Split từng section ngay khi nhận được (dùng với parser.iter_sections)
         
-        # Split theo heading level cao hơn
-        chunks = []
-        for section in document.sections:
-            sub_chunks = self._split_section(section)
-            chunks.extend(sub_chunks)
+        Args:
+            sections: Iterable các Section, có thể là generator
         
-        return chunks
+        Yields:
+            Các Section (chunks) theo thứ tự
+        """
+        chunks = self._iter_chunks(sections)
+        if self.pack_target:
+            chunks = self._pack_chunks(chunks)
+        yield from chunks
+    
+    def _iter_chunks(self, sections: Iterable[Section]) -> Iterator[Section]:
+        """Chunks theo heading, đã tách theo max_chars"""
+        for section in sections:
+            if self.split_level == 1:
+                chunks = [section]
+            else:
+                # Split theo heading level cao hơn
+                chunks = self._split_section(section)
+            
+            for chunk in chunks:
+                yield from self._split_size(chunk)
     
     def _split_section(self, section: Section) -> List[Section]:
         """Split 1 section thành sub-sections dựa trên headings"""
@@ -52,8 +104,11 @@ class Splitter:
         
         chunks = []
         current_chunk = Section(title=section.title, level=section.level)
+        # Trang hiện tại (PDF chỉ ghi page ở block đầu tiên của mỗi trang)
+        page = section.metadata.get("page")
         
         for block in section.blocks:
+            page = _block_page(block, page)
             if block.type == BlockType.HEADING and block.level <= self.split_level:
                 # Start new chunk
                 if current_chunk.blocks:
@@ -65,6 +120,10 @@ class Splitter:
                     title = "".join(r.text for r in block.runs)
                 
                 current_chunk = Section(title=title or section.title, level=block.level)
+                if title:
+                    current_chunk.metadata["breadcrumb"] = [section.title, title]
+                if page is not None:
+                    current_chunk.metadata["page"] = page
             else:
                 current_chunk.blocks.append(block)
         
@@ -73,43 +132,262 @@ class Splitter:
         
         return chunks
     
-    def save_chunks(self, chunks: List[Section], output_dir: str, 
-                   format: str = "md") -> List[str]:
+    # ===== SIZE =====
+    
+    def _split_size(self, section: Section) -> Iterator[Section]:
+        """
+        Tách section lớn hơn max_chars thành nhiều phần, tuyến tính theo kích thước
+        
+        Tách ở ranh giới block; block quá lớn được tách theo câu (paragraph,
+        quote), theo item (list) hoặc theo hàng (bảng, lặp lại hàng tiêu đề).
+        Mỗi phần có title = title của section > các heading con đang mở tại
+        điểm tách, metadata["breadcrumb"] (đầy đủ, từ chương) và metadata["part"].
+        """
+        budget = self.max_chars
+        if not budget:
+            yield section
+            return
+        
+        sizes = [self._block_size(section, block) for block in section.blocks]
+        if _header_size(section.title, section.level) + sum(sizes) <= budget:
+            yield section
+            return
+        
+        base = list(section.metadata.get("breadcrumb") or [section.title])
+        stack: List[tuple] = []  # (level, title) các heading đang mở
+        crumbs = base
+        blocks: List[Block] = []
+        used = _header_size(section.title, section.level)
+        part = 0
+        page = start_page = section.metadata.get("page")
+        
+        def flush() -> Section:
+            nonlocal part
+            part += 1
+            metadata = {**section.metadata, "breadcrumb": crumbs, "part": part}
+            if start_page is not None:
+                metadata["page"] = start_page
+            return Section(
+                title=" > ".join(crumbs[len(base) - 1:]),
+                level=section.level,
+                blocks=blocks,
+                metadata=metadata,
+            )
+        
+        for block, size in zip(section.blocks, sizes):
+            page = _block_page(block, page)
+            next_crumbs = base + [title for _, title in stack]
+            next_header = _header_size(" > ".join(next_crumbs[len(base) - 1:]), section.level)
+            # Mỗi mảnh phải vừa 1 phần mới (tiêu đề = breadcrumb hiện tại)
+            limit = budget - next_header
+            
+            pieces = [(block, size)]
+            if size > limit:
+                pieces = self._split_block(section, block, max(limit, 1))
+            
+            for piece, piece_size in pieces:
+                if blocks and used + piece_size > budget:
+                    yield flush()
+                    crumbs = next_crumbs
+                    blocks = []
+                    used = next_header
+                    start_page = page
+                blocks.append(piece)
+                used += piece_size
+            
+            if block.type == BlockType.HEADING:
+                while stack and stack[-1][0] >= block.level:
+                    stack.pop()
+                stack.append((block.level, "".join(r.text for r in block.runs)))
+        
+        if blocks:
+            yield flush()
+    
+    def _block_size(self, section: Section, block: Block) -> int:
+        """Số ký tự markdown của block (không build chuỗi)"""
+        counter = _CharCounter()
+        section._write_block(counter, block)
+        return counter.count
+    
+    def _section_size(self, section: Section) -> int:
+        """Số ký tự markdown của cả section"""
+        counter = _CharCounter()
+        section.write_markdown(counter)
+        return counter.count
+    
+    def _split_block(self, section: Section, block: Block, limit: int) -> List[tuple]:
+        """Tách 1 block quá lớn thành các (block, size) nhỏ hơn limit nếu được"""
+        if block.type in (BlockType.PARAGRAPH, BlockType.QUOTE):
+            # "\n" + text + "\n", quote thêm "> "
+            markup = 2 if block.type == BlockType.PARAGRAPH else 4
+            pieces = [Block(type=block.type, runs=runs, alignment=block.alignment,
+                            metadata=dict(block._metadata) if block._metadata else None)
+                      for runs in self._split_runs(section, block.runs, max(limit - markup, 1))]
+        elif block.type == BlockType.LIST:
+            # Số thứ tự của list có thứ tự dài nhất bằng số item
+            digits = len(str(len(block.items))) - 1 if block.ordered else 0
+            item_size = lambda item: self._block_size(section, Block(
+                type=BlockType.LIST, ordered=block.ordered, items=[item])) - 1 + digits
+            pieces = [Block(type=BlockType.LIST, ordered=block.ordered, items=items)
+                      for items in _pack(block.items, max(limit - 1, 1), item_size)]
+        elif block.type == BlockType.TABLE and len(block.rows) > 2:
+            header, rows = block.rows[0], block.rows[1:]
+            width = max(table_width(row) for row in block.rows)
+            # "\n" + hàng tiêu đề và dòng "---" đều đủ width cột như _write_table
+            fixed = 1 + _row_size(section, header, width) + 6 * width + 2
+            pieces = [Block(type=BlockType.TABLE, rows=[header] + group,
+                            metadata=dict(block._metadata) if block._metadata else None)
+                      for group in _pack(rows, max(limit - fixed, 1),
+                                         lambda row: _row_size(section, row, width))]
+        else:
+            return [(block, self._block_size(section, block))]
+        
+        return [(piece, self._block_size(section, piece)) for piece in pieces]
+    
+    def _split_runs(self, section: Section, runs: List[Run], limit: int) -> List[List[Run]]:
+        """
+        Tách runs của 1 paragraph ở ranh giới câu (câu quá dài: ở khoảng trắng,
+        từ quá dài: cắt cứng) thành các nhóm có markdown không quá limit
+        """
+        text = "".join(run.text for run in runs)
+        # Markdown của 1 đoạn text ≤ text + markup của mỗi run nằm trong đoạn
+        text_limit = max(limit - _RUN_MARKUP, 1)
+        
+        cuts = []
+        bounds = sentence_starts(text) + [len(text)]
+        start = 0
+        for end in bounds:
+            while end - start > text_limit:
+                space = text.rfind(" ", start + 1, start + text_limit)
+                cut = space + 1 if space > start else start + text_limit
+                cuts.append(cut)
+                start = cut
+            if end < len(text):
+                cuts.append(end)
+            start = end
+        
+        # Gom các câu liền nhau (theo kích thước markdown) rồi cắt runs 1 lần
+        units = _slice_runs(runs, cuts)
+        sizes = [len(section._runs_to_text(unit)) for unit in units]
+        chosen = []
+        used = 0
+        for cut, size, next_size in zip(cuts, sizes, sizes[1:]):
+            used += size
+            if used + next_size > limit:
+                chosen.append(cut)
+                used = 0
+        return _slice_runs(runs, chosen)
+    
+    # ===== PACKING =====
+    
+    def _pack_chunks(self, chunks: Iterable[Section]) -> Iterator[Section]:
+        """
+        Gom các chunk liền nhau (giữ thứ tự) thành chunk gần pack_target
+        
+        Tham lam 1 lượt: thêm chunk kế tiếp nếu tổng vẫn trong giới hạn, nếu
+        không thì xuất nhóm hiện tại. Chunk gom vào giữ tiêu đề dưới dạng
+        heading block (xem _packed_heading), kích thước tính lại theo đó.
+        """
+        limit = self.pack_target
+        if self.pack_unit == "tokens":
+            limit *= CHARS_PER_TOKEN
+        if self.max_chars:
+            limit = min(limit, self.max_chars)
+        
+        self.sizes = []
+        group: List[Section] = []
+        used = 0
+        
+        for chunk in chunks:
+            size = self._section_size(chunk)
+            # Kích thước khi nối vào sau chunk khác: dòng tiêu đề thay bằng heading block
+            packed = (size - _header_size(chunk.title, chunk.level)
+                      + self._block_size(chunk, _packed_heading(chunk)))
+            if group and used + packed > limit:
+                self.sizes.append(used)
+                yield _merge_chunks(group)
+                group = []
+                used = 0
+            used += packed if group else size
+            group.append(chunk)
+        
+        if group:
+            self.sizes.append(used)
+            yield _merge_chunks(group)
+    
+    def size_stats(self) -> Dict[str, int]:
+        """
+        Phân bố kích thước các chunk đã gom, theo pack_unit
+        
+        Returns:
+            {"chunks", "min", "median", "p90", "max", "mean"}
+        """
+        sizes = sorted(self.sizes)
+        if self.pack_unit == "tokens":
+            sizes = [estimate_tokens(size) for size in sizes]
+        if not sizes:
+            return {"chunks": 0, "min": 0, "median": 0, "p90": 0, "max": 0, "mean": 0}
+        return {
+            "chunks": len(sizes),
+            "min": sizes[0],
+            "median": sizes[len(sizes) // 2],
+            "p90": sizes[min(len(sizes) - 1, len(sizes) * 9 // 10)],
+            "max": sizes[-1],
+            "mean": round(sum(sizes) / len(sizes)),
+        }
+    
+    def save_chunks(self, chunks: Iterable[Section], output_dir: str,
+                    format: str = "md", workers: int = 4, store: bool = False) -> List[str]:
         """
-        Save chunks to files
+        Save chunks to files + index chunks.json (chỉ ghi lại chunk thay đổi,
+        xem ChunkWriter)
         
         Args:
-            chunks: List sections to save
+            chunks: Sections to save
             output_dir: Output directory
             format: Output format (md | txt)
+            workers: Số thread ghi file
+            store: Ghi thêm chunks.store (mọi chunk nối lại, đọc bằng ChunkIndex)
         
         Returns:
-            List đường dẫn các files đã tạo
+            List đường dẫn các files của chunks
         """
-        os.makedirs(output_dir, exist_ok=True)
-        saved_files = []
+        render = self._to_plain_text if format == "txt" else None
+        with ChunkWriter(output_dir, format, render=render, workers=workers,
+                         store=store) as writer:
+            saved_files = [writer.write(chunk) for chunk in chunks]
         
-        for i, chunk in enumerate(chunks, 1):
-            # Generate filename
-            safe_title = "".join(c if c.isalnum() or c in " -_" else "_" 
-                                for c in chunk.title[:30])
-            filename = f"chunk_{i:03d}_{safe_title.strip()}.{format}"
-            filepath = os.path.join(output_dir, filename)
-            
-            # Convert to format
+        counts = writer.counts
+        print(f"\n✅ Total: {len(saved_files)} chunks ({counts['written']} written, "
+              f"{counts['unchanged']} unchanged, {counts['removed']} removed)")
+        return saved_files
+    
+    def save_chunk(self, chunk: Section, output_dir: str, index: int,
+                   format: str = "md") -> str:
+        """
+        Save 1 chunk to file (output_dir phải tồn tại, không cập nhật manifest)
+        
+        Args:
+            chunk: Section to save
+            output_dir: Output directory
+            index: Số thứ tự chunk (bắt đầu từ 1)
+            format: Output format (md | txt)
+        
+        Returns:
+            Đường dẫn file đã tạo
+        """
+        filename = chunk_filename(chunk, index, format)
+        filepath = os.path.join(output_dir, filename)
+        
+        # Convert to format (md: ghi thẳng từng block vào file)
+        with open(filepath, 'w', encoding='utf-8') as f:
             if format == "md":
-                content = chunk.to_markdown()
+                chunk.write_markdown(f)
             else:
-                content = self._to_plain_text(chunk)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            saved_files.append(filepath)
-            print(f"✓ Saved: {filename}")
+                f.write(self._to_plain_text(chunk))
         
-        print(f"\n✅ Total: {len(saved_files)} chunks saved")
-        return saved_files
+        print(f"✓ Saved: {filename}")
+        return filepath
     
     def _to_plain_text(self, section: Section) -> str:
         """Convert section to plain text"""
@@ -124,6 +402,97 @@ class Splitter:
         return "\n".join(lines)
 
 
+def _header_size(title: str, level: int) -> int:
+    """Số ký tự của dòng tiêu đề chunk ("# title\\n")"""
+    return level + len(title) + 2
+
+
+def _row_size(section: Section, row, width: int) -> int:
+    """Số ký tự của 1 hàng bảng GFM có width cột ("| a | b |\n", ô thiếu để rỗng)"""
+    return sum(len(section._cell_to_text(cell.content)) for cell in row.cells) + 3 * width + 2
+
+
+def _pack(items: list, limit: int, size_of) -> List[list]:
+    """Gom items liền nhau thành các nhóm có tổng kích thước ≤ limit (tham lam)"""
+    groups = []
+    group = []
+    used = 0
+    for item in items:
+        size = size_of(item)
+        if group and used + size > limit:
+            groups.append(group)
+            group = []
+            used = 0
+        group.append(item)
+        used += size
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _packed_heading(chunk: Section) -> Block:
+    """
+    Heading block thay cho tiêu đề của chunk được nối vào chunk khác
+    
+    Cấp ≥ 2: LaTeX không có lệnh cho heading block cấp 1, Markdown không có
+    "#" thứ 2 trong 1 chunk. Giữ trang bắt đầu của chunk (nếu có).
+    """
+    page = chunk.metadata.get("page")
+    return Block(type=BlockType.HEADING, level=max(chunk.level, 2), runs=[Run(chunk.title)],
+                 metadata={"page": page} if page is not None else None)
+
+
+def _block_page(block: Block, page: Optional[int]) -> Optional[int]:
+    """Trang của block: metadata["page"] nếu có, không thì trang của block trước"""
+    if block._metadata and "page" in block._metadata:
+        return block._metadata["page"]
+    return page
+
+
+def _merge_chunks(group: List[Section]) -> Section:
+    """Nối các chunk thành 1 section; tiêu đề chunk sau thành heading block"""
+    if len(group) == 1:
+        return group[0]
+    
+    first = group[0]
+    blocks = list(first.blocks)
+    for chunk in group[1:]:
+        blocks.append(_packed_heading(chunk))
+        blocks.extend(chunk.blocks)
+    
+    return Section(
+        title=first.title,
+        level=first.level,
+        blocks=blocks,
+        metadata={**first.metadata, "packed": [chunk.title for chunk in group]},
+    )
+
+
+def _slice_runs(runs: List[Run], cuts: List[int]) -> List[List[Run]]:
+    """Cắt danh sách runs tại các vị trí ký tự cuts (tăng dần), giữ formatting"""
+    groups: List[List[Run]] = [[]]
+    cuts = iter(cuts)
+    cut = next(cuts, None)
+    offset = 0
+    
+    for run in runs:
+        end = offset + len(run.text)
+        start = 0
+        while cut is not None and cut < end:
+            if cut - offset > start:
+                groups[-1].append(replace(run, text=run.text[start:cut - offset]))
+            groups.append([])
+            start = cut - offset
+            cut = next(cuts, None)
+        if start == 0:
+            groups[-1].append(run)
+        elif start < len(run.text):
+            groups[-1].append(replace(run, text=run.text[start:]))
+        offset = end
+    
+    return groups
+
+
 def split_document(document: Document, output_dir: str,
                    split_level: int = 1, max_chars: int = 6000) -> List[str]:
     """
@@ -10,6 +10,8 @@ from docx import Document
 from docx.shared import Pt, Cm, Mm
 import os
 
+from function1.parsers.docx_styles import StyleResolver
+
 
 @dataclass
 class ValidationResult:
@@ -147,12 +149,18 @@ class ND30Validator:
         fonts_found = set()
         sizes_found = set()
         
+        # Font/cỡ chữ hiệu lực: run → character style → paragraph style → docDefaults
+        styles = StyleResolver.from_docx(doc)
         for para in doc.paragraphs:
+            fmt = styles.paragraph(para._p)
             for run in para.runs:
-                if run.font.name:
-                    fonts_found.add(run.font.name)
-                if run.font.size:
-                    sizes_found.add(run.font.size.pt)
+                if not run.text:
+                    continue
+                _, _, font_name, font_size = styles.run(run._r, fmt)
+                if font_name:
+                    fonts_found.add(font_name)
+                if font_size:
+                    sizes_found.add(font_size)
         
         # Check font name
         if expected_font not in fonts_found and fonts_found:
@@ -18,12 +18,22 @@ try:
 except ImportError:
     fitz = None
 
+from function1.parsers.docx_styles import StyleResolver
+from function1.parsers.heading_classifier import FontStats, HeadingClassifier
+from function1.parsers.headers_footers import (
+    RepeatDetector, repeat_key, is_repeat, estimate_tokens
+)
+
 
 class ContentExtractor:
     """Trích xuất nội dung gốc từ file để AI dùng regenerate"""
     
-    def __init__(self):
-        pass
+    def __init__(self, strip_repeats: bool = True):
+        """
+        Args:
+            strip_repeats: Bỏ header/footer/số trang lặp lại trên nhiều trang PDF
+        """
+        self.strip_repeats = strip_repeats
     
     def extract(self, file_path: str) -> Dict[str, Any]:
         """
@@ -56,21 +66,51 @@ class ContentExtractor:
             "author": doc.metadata.get("author", ""),
             "pages": [],
             "full_text": "",
-            "source_type": "pdf"
+            "source_type": "pdf",
+            "stripped": {"lines": 0, "chars": 0, "tokens": 0}
         }
         
+        # Pass 1: thống kê cỡ chữ, key header/footer của các block ở lề
+        margins = []
+        stats = FontStats()
+        detector = RepeatDetector()
+        for page in doc:
+            page_margins = []
+            for text, key, size in _text_blocks(page, stats):
+                if key is not None:
+                    page_margins.append((key, size))
+            detector.add_page(key for key, _ in page_margins)
+            margins.append(page_margins)
+        
+        repeated = detector.repeated() if self.strip_repeats else set()
+        body_size = (HeadingClassifier.fit(stats).body_key or 0) / 2
+        stripped = content["stripped"]
         full_text_parts = []
         
+        # Pass 2: trang không có header/footer giữ nguyên get_text("text")
         for page_num, page in enumerate(doc, 1):
-            page_text = page.get_text("text")
+            if any(is_repeat(key, size, repeated, body_size)
+                   for key, size in margins[page_num - 1]):
+                kept = []
+                for text, key, size in _text_blocks(page):
+                    if is_repeat(key, size, repeated, body_size):
+                        stripped["lines"] += 1
+                        stripped["chars"] += len(text.strip())
+                    else:
+                        kept.append(text)
+                page_text = "".join(kept)
+            else:
+                page_text = page.get_text("text")
+            
             content["pages"].append({
                 "page": page_num,
                 "text": page_text
             })
             full_text_parts.append(f"--- Page {page_num} ---\n{page_text}")
+        doc.close()
         
+        stripped["tokens"] = estimate_tokens(stripped["chars"])
         content["full_text"] = "\n\n".join(full_text_parts)
-        doc.close()
         
         return content
     
@@ -90,24 +130,21 @@ class ContentExtractor:
         }
         
         text_parts = []
+        styles = StyleResolver.from_docx(doc)
         
         for para in doc.paragraphs:
             if para.text.strip():
-                # Detect style
-                style_name = para.style.name if para.style else "Normal"
+                # Detect style (tra 1 lần cho mỗi style, gồm cả style kế thừa)
+                fmt = styles.paragraph(para._p)
                 
                 content["paragraphs"].append({
-                    "style": style_name,
+                    "style": fmt.name or "Normal",
                     "text": para.text
                 })
                 
                 # Format based on style
-                if "Heading 1" in style_name:
-                    text_parts.append(f"\n# {para.text}\n")
-                elif "Heading 2" in style_name:
-                    text_parts.append(f"\n## {para.text}\n")
-                elif "Heading 3" in style_name:
-                    text_parts.append(f"\n### {para.text}\n")
+                if fmt.heading_level in (1, 2, 3):
+                    text_parts.append(f"\n{'#' * fmt.heading_level} {para.text}\n")
                 else:
                     text_parts.append(para.text)
         
@@ -183,6 +220,34 @@ def extract_content(file_path: str) -> Dict[str, Any]:
     return extractor.extract(file_path)
 
 
+def _text_blocks(page, stats: Optional[FontStats] = None):
+    """
+    Yield (text, repeat_key, cỡ chữ lớn nhất) của từng text block trong trang
+    
+    Args:
+        page: fitz.Page
+        stats: Nếu có, ghi cỡ chữ của từng dòng vào đây
+    """
+    height = page.rect.height
+    for block in page.get_text("dict")["blocks"]:
+        if block["type"] != 0:
+            continue
+        lines = []
+        max_size = 0.0
+        for line in block["lines"]:
+            spans = line["spans"]
+            text = "".join(span["text"] for span in spans)
+            nchars = sum(len(span["text"]) for span in spans) or 1
+            size = sum(span["size"] * len(span["text"]) for span in spans) / nchars
+            if stats is not None and text.strip():
+                stats.add(size, False, len(text))
+            max_size = max(max_size, size)
+            lines.append(text)
+        text = "\n".join(lines) + "\n"
+        bbox = block["bbox"]
+        yield text, repeat_key(text, bbox[1], bbox[3], height), max_size
+
+
 if __name__ == "__main__":
     import sys
     
@@ -195,3 +260,4 @@ if __name__ == "__main__":
         print(content['full_text'][:1000])
     else:
         print("Usage: python content_extractor.py <file.pdf|docx>")
+
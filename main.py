@@ -17,6 +17,7 @@ Usage:
 
 import sys
 import os
+import multiprocessing
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -40,4 +41,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Cần cho worker processes (adm convert --jobs) khi build .exe
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,54 @@
+"""
+ADM Cache Command
+==================
+CLI to inspect/clear the parsed-IR cache used by `adm convert`
+"""
+
+import click
+
+
+def _format_size(num_bytes: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+@click.group()
+def cache():
+    """
+    Manage the parsed-IR cache of adm convert
+    
+    \b
+    Commands:
+      adm cache stats - Show cache location and size
+      adm cache clear - Delete all cached entries
+    """
+    pass
+
+
+@cache.command()
+def stats():
+    """Show cache statistics"""
+    from function1.parsers.ir_cache import IRCache
+    
+    info = IRCache().stats()
+    
+    click.echo("\n📦 ADM IR Cache")
+    click.echo("=" * 40)
+    click.echo(f"📁 Directory: {info['cache_dir']}")
+    click.echo(f"📄 Entries: {info['entries']}")
+    click.echo(f"💾 Size: {_format_size(info['total_bytes'])} / {_format_size(info['max_bytes'])}")
+
+
+@cache.command()
+def clear():
+    """Delete all cached entries"""
+    from function1.parsers.ir_cache import IRCache
+    
+    removed = IRCache().clear()
+    click.echo(f"🗑  Removed {removed} cache entries")
+
+
+if __name__ == "__main__":
+    cache()
@@ -4,8 +4,13 @@ ADM Convert Command
 CLI for Function 1: Convert PDF/DOCX → Markdown → LaTeX
 """
 
+import contextlib
+import io
 import os
+import sys
+import json
 import click
+from functools import partial
 from pathlib import Path
 
 
@@ -14,109 +19,311 @@ from pathlib import Path
               help='Single PDF/DOCX file to convert')
 @click.option('--folder', '-d', type=click.Path(exists=True),
               help='Folder containing files (or use input/ by default)')
-@click.option('--output', '-o', type=click.Path(),
-              help='Output folder')
-@click.option('--format', 'output_format', type=click.Choice(['latex', 'markdown', 'both']),
-              default='latex', help='Output format')
+@click.option('--output', '-o', type=click.Path(allow_dash=True),
+              help='Output folder ("-" with --format jsonl: records to stdout)')
+@click.option('--format', 'output_format',
+              type=click.Choice(['latex', 'markdown', 'both', 'jsonl']),
+              default='latex', help='Output format (jsonl: 1 JSON record per chunk)')
 @click.option('--split-level', type=int, default=1,
               help='Heading level to split (1=H1, 2=H2)')
 @click.option('--max-chars', type=int, default=6000,
-              help='Max characters per chunk')
-def convert(file, folder, output, output_format, split_level, max_chars):
+              help='Max Markdown characters per chunk (0 = no limit)')
+@click.option('--pack-target', type=int, default=0,
+              help='Pack consecutive chunks up to about N chars/tokens (0 = one chunk per heading)')
+@click.option('--pack-unit', type=click.Choice(['chars', 'tokens']), default='chars',
+              help='Unit of --pack-target')
+@click.option('--chunk-store', is_flag=True,
+              help='Also write chunks.store (all Markdown chunks in one file, see chunks.json)')
+@click.option('--no-cache', is_flag=True,
+              help='Always re-parse (skip the parsed-IR cache)')
+@click.option('--jobs', '-j', type=int, default=1,
+              help='Worker processes for PDF parsing (1 = serial)')
+@click.option('--fidelity', type=click.Choice(['full', 'fast']), default='full',
+              help='PDF parsing tier: full formatting, or fast text-only')
+@click.option('--pages', type=str, default=None,
+              help='Only parse these PDF pages, e.g. "10-25,40"')
+@click.option('--section', 'sections', multiple=True,
+              help='Only parse chapters with this title (repeatable), e.g. "Chương 3"')
+@click.option('--columns/--no-columns', default=True,
+              help='Reorder two-column PDF pages into reading order (default: on)')
+@click.option('--tables/--no-tables', default=True,
+              help='Detect ruled PDF tables as table blocks (default: on)')
+@click.option('--normalize/--no-normalize', default=True,
+              help='Merge adjacent runs with identical formatting (default: on)')
+@click.option('--outline-only', is_flag=True,
+              help='Only write heading tree, page count, title/author as JSON')
+def convert(file, folder, output, output_format, split_level, max_chars, pack_target, pack_unit,
+            chunk_store, no_cache, jobs, fidelity, pages, sections, columns, tables, normalize,
+            outline_only):
     """
-    Convert PDF/DOCX files to Markdown/LaTeX
+    Convert PDF/DOCX files to Markdown/LaTeX/JSONL
     
     \b
     Examples:
       adm convert --file thesis.pdf
       adm convert --folder input/ --format latex
       adm convert --file doc.docx --output output/ --split-level 2
+      adm convert --folder input/ --format both --no-cache
+      adm convert --file thesis.pdf --jobs 8
+      adm convert --file thesis.pdf --pack-target 1500 --pack-unit tokens
+      adm convert --file thesis.pdf --format markdown --chunk-store
+      adm convert --folder input/ --format jsonl --output - > chunks.jsonl
+      adm convert --folder input/ --fidelity fast --format markdown
+      adm convert --file thesis.pdf --pages 10-25
+      adm convert --file thesis.pdf --section "Chương 3"
+      adm convert --folder inbox/ --outline-only
     """
-    click.echo("\n🔄 ADM Convert")
-    click.echo("=" * 40)
+    # jsonl ra stdout: chỉ records ghi vào stdout, thông báo chuyển sang stderr
+    to_stdout = output_format == 'jsonl' and output == '-'
+    echo = partial(click.echo, err=True) if to_stdout else click.echo
+    records_fp = None
+    if to_stdout:
+        records_fp = click.get_current_context().with_resource(_stdout_records())
+    
+    echo("\n🔄 ADM Convert")
+    echo("=" * 40)
     
     # Determine input
     if file:
         files = [Path(file)]
-        click.echo(f"📄 Input: {file}")
+        echo(f"📄 Input: {file}")
     elif folder:
         folder_path = Path(folder)
         files = list(folder_path.glob("*.pdf")) + list(folder_path.glob("*.docx"))
-        click.echo(f"📁 Input folder: {folder}")
-        click.echo(f"   Found: {len(files)} files")
+        echo(f"📁 Input folder: {folder}")
+        echo(f"   Found: {len(files)} files")
     else:
         # Default to input/ folder
         input_folder = Path("function1/input")
         if input_folder.exists():
             files = list(input_folder.glob("*.pdf")) + list(input_folder.glob("*.docx"))
-            click.echo(f"📁 Using default: {input_folder}")
-            click.echo(f"   Found: {len(files)} files")
+            echo(f"📁 Using default: {input_folder}")
+            echo(f"   Found: {len(files)} files")
         else:
-            click.echo("⚠ No input specified. Use --file or --folder", err=True)
-            click.echo("  Or drop files into function1/input/", err=True)
+            echo("⚠ No input specified. Use --file or --folder", err=True)
+            echo("  Or drop files into function1/input/", err=True)
             return
     
     if not files:
-        click.echo("⚠ No PDF/DOCX files found", err=True)
+        echo("⚠ No PDF/DOCX files found", err=True)
         return
     
     # Determine output folder
-    if output:
+    if output and not to_stdout:
         output_folder = Path(output)
     else:
         output_folder = Path("function1/output")
     
-    output_folder.mkdir(parents=True, exist_ok=True)
-    click.echo(f"📂 Output: {output_folder}")
-    click.echo(f"📊 Format: {output_format}")
-    click.echo(f"✂️  Split level: H{split_level}")
-    click.echo("")
+    if to_stdout:
+        echo("📂 Output: stdout")
+    else:
+        output_folder.mkdir(parents=True, exist_ok=True)
+        echo(f"📂 Output: {output_folder}")
+    
+    if outline_only:
+        _write_outlines(files, output_folder)
+        return
+    
+    echo(f"📊 Format: {output_format}")
+    echo(f"✂️  Split level: H{split_level}")
+    if pack_target:
+        echo(f"📦 Pack target: {pack_target} {pack_unit}")
+    if jobs > 1:
+        echo(f"⚙️  Jobs: {jobs}")
+    if fidelity != 'full':
+        echo(f"⚡ Fidelity: {fidelity}")
+    if pages:
+        echo(f"📑 Pages: {pages}")
+        if any(f.suffix.lower() != '.pdf' for f in files):
+            echo("⚠ --pages only applies to PDF files", err=True)
+    if sections:
+        echo(f"📑 Sections: {', '.join(sections)}")
+    echo("")
+    
+    ir_cache = None
+    if not no_cache:
+        from function1.parsers.ir_cache import IRCache
+        ir_cache = IRCache()
     
     # Process each file
     for filepath in files:
-        click.echo(f"Processing: {filepath.name}...")
+        echo(f"Processing: {filepath.name}...")
         
         try:
             # Import parsers
             if filepath.suffix.lower() == '.pdf':
-                from function1.parsers.pdf_parser import parse_pdf
-                doc = parse_pdf(str(filepath))
+                from function1.parsers.pdf_parser import PDFParser
+                parser = PDFParser(jobs=jobs, fidelity=fidelity, pages=pages,
+                                   sections=sections, columns=columns, tables=tables,
+                                   normalize=normalize)
             else:
-                from function1.parsers.docx_parser import parse_docx
-                doc = parse_docx(str(filepath))
-            
-            click.echo(f"  ✓ Parsed: {doc.get_section_count()} sections, {doc.get_total_blocks()} blocks")
+                from function1.parsers.docx_parser import DOCXParser
+                parser = DOCXParser(sections=sections, normalize=normalize)
             
-            # Split
             from function1.processors.splitter import Splitter
-            splitter = Splitter(split_level, max_chars)
-            chunks = splitter.split(doc)
-            click.echo(f"  ✓ Split: {len(chunks)} chunks")
+            splitter = Splitter(split_level, max_chars, pack_target, pack_unit)
             
-            # Export
+            if output_format == 'jsonl':
+                # 1 file (hoặc stdout) cho mỗi document, ghi từng chunk một
+                from function1.exporters.jsonl_exporter import JSONLExporter
+                jsonl_path = None if to_stdout else output_folder / f"{filepath.stem}.jsonl"
+                # File: ghi vào file tạm, chỉ đổi tên khi xong (lỗi giữa chừng
+                # không để lại .jsonl dở hoặc ghi đè mất kết quả cũ)
+                tmp_path = None if to_stdout else jsonl_path.with_name(
+                    f"{jsonl_path.name}.{os.getpid()}.tmp")
+                fp = records_fp if to_stdout else open(tmp_path, "w", encoding="utf-8")
+                try:
+                    records = JSONLExporter(fp, source=filepath.name).write_all(
+                        splitter.iter_split(_iter_parsed(parser, filepath, ir_cache, echo))
+                    )
+                    if not to_stdout:
+                        fp.close()
+                        os.replace(tmp_path, jsonl_path)
+                finally:
+                    if to_stdout:
+                        fp.flush()
+                    else:
+                        fp.close()
+                        if tmp_path.exists():
+                            tmp_path.unlink()
+                echo(f"  ✓ Wrote {records} records to {jsonl_path or 'stdout'}")
+                echo(f"  ✅ Done: {filepath.name}")
+                continue
+            
+            # Prepare export folders
             file_output = output_folder / filepath.stem
             file_output.mkdir(parents=True, exist_ok=True)
             
+            md_folder = file_output / "markdown"
+            latex_folder = file_output / "latex"
+            exporter = None
+            
             if output_format in ['markdown', 'both']:
-                md_folder = file_output / "markdown"
-                splitter.save_chunks(chunks, str(md_folder), format="md")
-                click.echo(f"  ✓ Saved: {md_folder}")
+                md_folder.mkdir(parents=True, exist_ok=True)
             
             if output_format in ['latex', 'both']:
                 from function1.exporters.latex_exporter import LaTeXExporter
                 exporter = LaTeXExporter(str(file_output))
-                
-                latex_folder = file_output / "latex"
                 latex_folder.mkdir(exist_ok=True)
-                exporter.export_sections(chunks, str(latex_folder))
-                click.echo(f"  ✓ Saved: {latex_folder}")
             
-            click.echo(f"  ✅ Done: {filepath.name}")
+            # Stream: parse → split → export từng section,
+            # không giữ toàn bộ Document trong bộ nhớ
+            stats = {"sections": 0, "blocks": 0}
+            
+            def counted(sections):
+                for section in sections:
+                    stats["sections"] += 1
+                    stats["blocks"] += len(section.blocks)
+                    yield section
+            
+            sections = _iter_parsed(parser, filepath, ir_cache, echo)
+            
+            chunk_count = 0
+            latex_files = []
+            writer_context = contextlib.nullcontext()
+            if output_format in ['markdown', 'both']:
+                from function1.processors.chunk_writer import ChunkWriter
+                writer_context = ChunkWriter(str(md_folder), format="md", store=chunk_store)
+            
+            # Lỗi giữa chừng: ChunkWriter chờ ghi xong, bỏ store tạm, giữ manifest cũ
+            with writer_context as writer:
+                for chunk in splitter.iter_split(counted(sections)):
+                    chunk_count += 1
+                    
+                    if writer is not None:
+                        writer.write(chunk)
+                    
+                    if exporter is not None:
+                        latex_files.append(
+                            exporter.export_section_file(chunk, str(latex_folder), chunk_count)
+                        )
+            
+            echo(f"  ✓ Parsed: {stats['sections']} sections, {stats['blocks']} blocks")
+            stripped = getattr(parser, "stripped", None)
+            if stripped and stripped["lines"]:
+                echo(f"  ✓ Stripped headers/footers: {stripped['lines']} lines "
+                           f"(~{stripped['tokens']} tokens saved)")
+            normalized = getattr(parser, "normalized", None)
+            if normalized and (normalized["merged"] or normalized["dropped"]):
+                kept = normalized["runs"] - normalized["merged"] - normalized["dropped"]
+                echo(f"  ✓ Merged runs: {normalized['runs']} → {kept} "
+                           f"({normalized['merged']} merged, {normalized['dropped']} empty)")
+            echo(f"  ✓ Split: {chunk_count} chunks")
+            if pack_target:
+                sizes = splitter.size_stats()
+                echo(f"  ✓ Chunk sizes ({pack_unit}): min {sizes['min']}, "
+                           f"median {sizes['median']}, p90 {sizes['p90']}, "
+                           f"max {sizes['max']}, mean {sizes['mean']}")
+            
+            if writer is not None:
+                counts = writer.counts
+                echo(f"  ✓ Saved: {md_folder} ({counts['written']} written, "
+                           f"{counts['unchanged']} unchanged, {counts['removed']} removed)")
+                echo(f"  ✓ Index: {writer.manifest_path}"
+                           + (f" + {writer.store_path.name}" if chunk_store else ""))
+            
+            if exporter is not None:
+                exporter.create_main_include(latex_files, str(latex_folder))
+                echo(f"  ✓ Saved: {latex_folder}")
             
+            echo(f"  ✅ Done: {filepath.name}")
+        
+        except Exception as e:
+            echo(f"  ❌ Error: {e}", err=True)
+    
+    echo(f"\n✅ Processed {len(files)} files")
+
+
+def _write_outlines(files, output_folder):
+    """--outline-only: ghi <tên file>.outline.json cho mỗi file"""
+    from function1.parsers.outline import scan_outline
+    
+    click.echo("🧭 Outline only\n")
+    done = 0
+    for filepath in files:
+        try:
+            outline = scan_outline(str(filepath))
         except Exception as e:
-            click.echo(f"  ❌ Error: {e}", err=True)
+            click.echo(f"  ❌ {filepath.name}: {e}", err=True)
+            continue
+        
+        outline_path = output_folder / f"{filepath.stem}.outline.json"
+        with open(outline_path, "w", encoding="utf-8") as f:
+            json.dump(outline, f, ensure_ascii=False, indent=2)
+        
+        pages = outline["pages"] if outline["pages"] is not None else "?"
+        click.echo(f"  ✓ {filepath.name}: {pages} pages, "
+                   f"{len(outline['headings'])} top-level headings")
+        done += 1
     
-    click.echo(f"\n✅ Processed {len(files)} files")
+    click.echo(f"\n✅ Wrote {done} outlines to {output_folder}")
+
+
+@contextlib.contextmanager
+def _stdout_records():
+    """
+    stdout cho --output -: luôn ghi UTF-8 (không theo codepage của console),
+    mọi print khác (parser, thư viện) chuyển sang stderr
+    """
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    fp = io.TextIOWrapper(buffer, encoding="utf-8", newline="\n") if buffer else sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield fp
+    finally:
+        if buffer is not None:
+            fp.flush()
+            fp.detach()
+
+
+def _iter_parsed(parser, filepath, ir_cache, echo):
+    """Sections của file: từ cache IR nếu có, không thì parse (streaming)"""
+    if ir_cache is None:
+        return parser.iter_sections(str(filepath))
+    if ir_cache.contains(str(filepath), parser):
+        echo("  ⚡ Cached IR (skip parsing)")
+    return ir_cache.iter_sections(str(filepath), parser)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ Main entry point for CLI commands
 
 import click
 
-from . import convert, generate, regenerate
+from . import cache, convert, generate, regenerate
 
 
 @click.group()
@@ -20,6 +20,7 @@ def cli():
       adm convert    - Convert PDF/DOCX → Markdown → LaTeX
       adm generate   - Generate documents from AI content
       adm regenerate - AI regenerate original content
+      adm cache      - Manage parsed-IR cache
     """
     pass
 
@@ -28,6 +29,7 @@ def cli():
 cli.add_command(convert.convert, name="convert")
 cli.add_command(generate.generate, name="generate")
 cli.add_command(regenerate.regenerate, name="regenerate")
+cli.add_command(cache.cache, name="cache")
 
 
 @cli.command()
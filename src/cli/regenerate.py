@@ -90,6 +90,10 @@ def init(source_file, name, project_dir, split_level):
         click.echo(f"📑 Title: {content['title']}")
         click.echo(f"👤 Author: {content['author']}")
         click.echo(f"📄 Type: {content['source_type']}")
+        stripped = content.get("stripped")
+        if stripped and stripped["lines"]:
+            click.echo(f"✂️  Stripped headers/footers: {stripped['lines']} lines "
+                       f"(~{stripped['tokens']} tokens saved)")
         
         # Save source info
         import yaml
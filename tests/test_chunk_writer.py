@@ -0,0 +1,146 @@
+"""
+Chunk Writer Tests
+===================
+Test cases for ChunkWriter (manifest chunks.json, bỏ qua chunk không đổi)
+"""
+
+import pytest
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.ir import Block, BlockType, Run, Section
+from function1.processors.chunk_writer import ChunkIndex, ChunkWriter, MANIFEST_NAME, STORE_NAME
+from function1.processors.splitter import Splitter
+
+
+def chapters(texts):
+    return [Section(title=f"Chương {i}", level=1,
+                    blocks=[Block(type=BlockType.PARAGRAPH, runs=[Run(text)])])
+            for i, text in enumerate(texts, 1)]
+
+
+def write_all(path, sections, workers=4, store=False):
+    with ChunkWriter(str(path), workers=workers, store=store) as writer:
+        for section in sections:
+            writer.write(section)
+    return writer
+
+
+class TestChunkWriter:
+    """Test ChunkWriter"""
+    
+    def test_manifest(self, tmp_path):
+        """Test: manifest có hash, offset liên tiếp, số bytes và token ước lượng"""
+        writer = write_all(tmp_path, chapters(["Một", "Hai", "Ba"]))
+        assert writer.counts == {"written": 3, "unchanged": 0, "removed": 0}
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+        chunks = manifest["chunks"]
+        assert [c["title"] for c in chunks] == ["Chương 1", "Chương 2", "Chương 3"]
+        for chunk, following in zip(chunks, chunks[1:]):
+            assert following["offset"] == chunk["offset"] + chunk["bytes"]
+        for chunk in chunks:
+            assert (tmp_path / chunk["file"]).stat().st_size == chunk["bytes"]
+            assert chunk["tokens"] > 0
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_skips_unchanged_and_removes_stale(self, tmp_path):
+        """Test: chạy lại chỉ ghi chunk đổi nội dung, xóa chunk không còn"""
+        write_all(tmp_path, chapters(["Một", "Hai", "Ba"]))
+        first = tmp_path / "chunk_001_Chương 1.md"
+        os.utime(first, (1, 1))
+        
+        writer = write_all(tmp_path, chapters(["Một", "Hai đã sửa"]))
+        assert writer.counts == {"written": 1, "unchanged": 1, "removed": 1}
+        assert first.stat().st_mtime == 1
+        assert "Hai đã sửa" in (tmp_path / "chunk_002_Chương 2.md").read_text(encoding="utf-8")
+        assert sorted(p.name for p in tmp_path.glob("chunk_*")) == [
+            "chunk_001_Chương 1.md", "chunk_002_Chương 2.md"
+        ]
+    
+    def test_rewrites_missing_or_modified_file(self, tmp_path):
+        """Test: file bị xóa/sửa tay được ghi lại dù manifest không đổi"""
+        write_all(tmp_path, chapters(["Một", "Hai"]))
+        (tmp_path / "chunk_001_Chương 1.md").unlink()
+        (tmp_path / "chunk_002_Chương 2.md").write_text("x", encoding="utf-8")
+        
+        writer = write_all(tmp_path, chapters(["Một", "Hai"]), workers=1)
+        assert writer.counts["written"] == 2
+    
+    def test_error_keeps_previous_manifest(self, tmp_path):
+        """Test: lỗi giữa chừng không xóa chunk cũ, không ghi đè manifest"""
+        write_all(tmp_path, chapters(["Một", "Hai", "Ba"]))
+        before = (tmp_path / MANIFEST_NAME).read_text(encoding="utf-8")
+        
+        with pytest.raises(RuntimeError):
+            with ChunkWriter(str(tmp_path)) as writer:
+                writer.write(chapters(["Mới"])[0])
+                raise RuntimeError("parse failed")
+        
+        assert (tmp_path / MANIFEST_NAME).read_text(encoding="utf-8") == before
+        assert len(list(tmp_path.glob("chunk_*.md"))) == 3
+    
+    def test_splitter_save_chunks(self, tmp_path):
+        """Test: Splitter.save_chunks dùng ChunkWriter, txt cũng có manifest"""
+        splitter = Splitter()
+        files = splitter.save_chunks(chapters(["Một", "Hai"]), str(tmp_path), format="txt")
+        assert [os.path.basename(f) for f in files] == ["chunk_001_Chương 1.txt",
+                                                        "chunk_002_Chương 2.txt"]
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+        assert manifest["format"] == "txt"
+
+
+
+class TestChunkIndex:
+    """Test index trong chunks.json và ChunkIndex"""
+    
+    def test_index_fields(self, tmp_path):
+        """Test: title path, cấp heading, khoảng trang, số ký tự của mỗi chunk"""
+        section = Section(title="Mục 2.1", level=2, metadata={
+            "breadcrumb": ["Chương 2", "Mục 2.1"], "page": 11
+        }, blocks=[
+            Block(type=BlockType.PARAGRAPH, runs=[Run("a")], metadata={"page": 12}),
+            Block(type=BlockType.PARAGRAPH, runs=[Run("b")], metadata={"page": 14}),
+        ])
+        write_all(tmp_path, [section, *chapters(["Không có trang"])])
+        
+        first, second = ChunkIndex(str(tmp_path)).entries
+        assert first["path"] == ["Chương 2", "Mục 2.1"] and first["level"] == 2
+        assert first["pages"] == [12, 15]
+        assert first["chars"] == len(section.to_markdown())
+        assert second["path"] == ["Chương 1"] and second["pages"] is None
+    
+    def test_read_from_store_and_files(self, tmp_path):
+        """Test: đọc chunk theo số/title path, từ chunks.store hoặc từ file"""
+        sections = chapters(["Một", "Hai có dấu tiếng Việt", "Ba"])
+        write_all(tmp_path, sections, store=True)
+        
+        index = ChunkIndex(str(tmp_path))
+        assert index.store == tmp_path / STORE_NAME
+        assert len(index) == 3
+        assert index.read("Chương 2") == sections[1].to_markdown()
+        assert [index.read(i) for i in range(3)] == [s.to_markdown() for s in sections]
+        with pytest.raises(KeyError):
+            index.find("Chương 9")
+        
+        # Tắt store: file cũ bị xóa, đọc từ file chunk
+        write_all(tmp_path, sections)
+        index = ChunkIndex(str(tmp_path))
+        assert index.store is None and not (tmp_path / STORE_NAME).exists()
+        assert index.read(2) == sections[2].to_markdown()
+    
+    def test_failed_run_discards_store(self, tmp_path):
+        """Test: lỗi giữa chừng không để lại store tạm"""
+        with pytest.raises(RuntimeError):
+            with ChunkWriter(str(tmp_path), store=True) as writer:
+                writer.write(chapters(["Một"])[0])
+                raise RuntimeError("parse failed")
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -6,6 +6,7 @@ Test cases for ADM CLI commands
 
 import pytest
 from click.testing import CliRunner
+import json
 import os
 import sys
 
@@ -69,6 +70,157 @@ class TestConvertCommand:
         """Test: convert with nonexistent file shows error"""
         result = self.runner.invoke(cli, ['convert', '--file', 'nonexistent.pdf'])
         assert result.exit_code != 0 or 'Error' in result.output or 'does not exist' in result.output
+    
+    
+    def test_convert_outline_only(self, tmp_path):
+        """Test: --outline-only ghi JSON outline, không convert"""
+        docx = pytest.importorskip("docx")
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        document.add_paragraph("Nội dung")
+        document.save(str(tmp_path / "a.docx"))
+        
+        out = tmp_path / "out"
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', str(out), '--outline-only'])
+        assert result.exit_code == 0
+        
+        outline = json.loads((out / "a.outline.json").read_text(encoding="utf-8"))
+        assert [h["title"] for h in outline["headings"]] == ["Chương 1"]
+        assert not (out / "a").exists()
+    
+    def test_convert_pack_target(self, tmp_path):
+        """Test: --pack-target gom các chương ngắn và báo phân bố kích thước"""
+        docx = pytest.importorskip("docx")
+        document = docx.Document()
+        for i in range(1, 7):
+            document.add_heading(f"Chương {i}", level=1)
+            document.add_paragraph("Nội dung ngắn.")
+        document.save(str(tmp_path / "a.docx"))
+        
+        out = tmp_path / "out"
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', str(out), '--format', 'markdown',
+                                          '--no-cache', '--pack-target', '80'])
+        assert result.exit_code == 0
+        assert "Split: 3 chunks" in result.output
+        assert "Chunk sizes (chars): min" in result.output
+        assert len(list((out / "a" / "markdown").glob("*.md"))) == 3
+    
+    def test_convert_error_cleans_chunk_writer(self, tmp_path, monkeypatch):
+        """Test: lỗi khi đang parse không để lại file tạm của chunks/chunks.store"""
+        docx = pytest.importorskip("docx")
+        from function1.parsers.docx_parser import DOCXParser
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        document.save(str(tmp_path / "a.docx"))
+        
+        def failing(self, path, sections=None):
+            yield from DOCXParser().parse(path).sections
+            raise RuntimeError("parse failed")
+        monkeypatch.setattr(DOCXParser, "iter_sections", failing)
+        
+        out = tmp_path / "out"
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', str(out), '--format', 'markdown',
+                                          '--no-cache', '--chunk-store'])
+        assert "parse failed" in result.output
+        md_folder = out / "a" / "markdown"
+        assert len(list(md_folder.glob("*.md"))) == 1
+        assert not list(md_folder.glob("*.tmp")) and not (md_folder / "chunks.json").exists()
+    
+    def test_convert_jsonl(self, tmp_path):
+        """Test: --format jsonl ghi 1 file/ document, --output - ghi ra stdout"""
+        docx = pytest.importorskip("docx")
+        document = docx.Document()
+        for i in range(1, 4):
+            document.add_heading(f"Chương {i}", level=1)
+            document.add_paragraph(f"Nội dung chương {i}.")
+        document.save(str(tmp_path / "a.docx"))
+        
+        out = tmp_path / "out"
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', str(out), '--format', 'jsonl',
+                                          '--no-cache'])
+        assert result.exit_code == 0
+        lines = (out / "a.jsonl").read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["title"] for r in records] == ["Chương 1", "Chương 2", "Chương 3"]
+        assert records[0]["source"] == "a.docx"
+        assert not (out / "a").exists()
+        
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', '-', '--format', 'jsonl', '--no-cache'])
+        assert result.exit_code == 0
+        assert [json.loads(line) for line in result.stdout.splitlines()] == records
+        assert "3 records" in result.stderr
+    
+    def test_convert_jsonl_error_keeps_previous_file(self, tmp_path, monkeypatch):
+        """Test: lỗi khi đang ghi jsonl không để lại file dở, giữ file cũ"""
+        docx = pytest.importorskip("docx")
+        from function1.parsers.docx_parser import DOCXParser
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        document.add_heading("Chương 2", level=1)
+        document.save(str(tmp_path / "a.docx"))
+        
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "a.jsonl").write_text("previous\n", encoding="utf-8")
+        
+        def failing(self, path, sections=None):
+            yield from DOCXParser().parse(path).sections
+            raise RuntimeError("parse failed")
+        monkeypatch.setattr(DOCXParser, "iter_sections", failing)
+        
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', str(out), '--format', 'jsonl',
+                                          '--no-cache'])
+        assert "parse failed" in result.output
+        assert (out / "a.jsonl").read_text(encoding="utf-8") == "previous\n"
+        assert not list(out.glob("*.tmp"))
+    
+    def test_convert_jsonl_stdout_only_records(self, tmp_path, monkeypatch):
+        """Test: --output - ghi records UTF-8, print của parser/thư viện sang stderr"""
+        docx = pytest.importorskip("docx")
+        from function1.parsers.docx_parser import DOCXParser
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        document.add_paragraph("Tiếng Việt có dấu")
+        document.save(str(tmp_path / "a.docx"))
+        
+        iter_sections = DOCXParser.iter_sections
+        
+        def noisy(self, path, sections=None):
+            print("warning: noise from a library")
+            yield from iter_sections(self, path, sections)
+        monkeypatch.setattr(DOCXParser, "iter_sections", noisy)
+        
+        result = self.runner.invoke(cli, ['convert', '--file', str(tmp_path / "a.docx"),
+                                          '--output', '-', '--format', 'jsonl', '--no-cache'])
+        assert result.exit_code == 0
+        record, = [json.loads(line) for line in result.stdout_bytes.decode("utf-8").splitlines()]
+        assert "Tiếng Việt có dấu" in record["plain"]
+        assert "noise" in result.stderr
+
+
+class TestCacheCommand:
+    """Test cache command"""
+    
+    def setup_method(self):
+        self.runner = CliRunner()
+    
+    def test_cache_stats_and_clear(self, tmp_path):
+        """Test: cache stats / clear dùng ADM_CACHE_DIR"""
+        env = {"ADM_CACHE_DIR": str(tmp_path)}
+        
+        result = self.runner.invoke(cli, ['cache', 'stats'], env=env)
+        assert result.exit_code == 0
+        assert str(tmp_path) in result.output
+        
+        result = self.runner.invoke(cli, ['cache', 'clear'], env=env)
+        assert result.exit_code == 0
+        assert 'Removed 0' in result.output
 
 
 class TestGenerateCommand:
@@ -131,6 +283,7 @@ class TestCLIIntegration:
         commands = [
             ['--help'],
             ['convert', '--help'],
+            ['cache', '--help'],
             ['generate', '--help'],
             ['generate', 'init', '--help'],
             ['generate', 'sections', '--help'],
@@ -0,0 +1,147 @@
+"""
+DOCX Stream Reader Tests
+=========================
+Test cases for DOCXParser(reader="stream") — phải cho cùng IR với python-docx
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+docx = pytest.importorskip("docx")
+from docx.oxml import OxmlElement
+
+from function1.parsers import DOCXParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_hyperlink(para, text):
+    """Hyperlink thủ công (python-docx không có API)"""
+    link = OxmlElement("w:hyperlink")
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    link.append(run)
+    para._p.append(link)
+
+
+def make_tricky_docx(path):
+    """DOCX có các trường hợp khó: hyperlink, tab/break, run tắt bold, ô gộp"""
+    document = docx.Document()
+    document.add_heading("Tiêu đề luận văn", level=0)
+    document.add_paragraph("Đoạn trước chương 1")
+    document.add_heading("Chương 1", level=1)
+    
+    para = document.add_paragraph("Xem ")
+    add_hyperlink(para, "trang web")
+    para.add_run(" và\ttab").italic = True
+    run = para.add_run("dòng mới")
+    run.add_break()
+    run.add_break(docx.enum.text.WD_BREAK.PAGE)
+    run.bold = False
+    run.font.size = docx.shared.Pt(11.5)
+    run.font.name = "Times New Roman"
+    para.add_run(" gạch").underline = True
+    para.add_run(" bỏ gạch").underline = False
+    
+    document.add_paragraph("   ")
+    document.add_paragraph("Bước 1", style="List Number")
+    document.add_paragraph("Bước 2", style="List Number")
+    document.add_paragraph("Ý", style="List Bullet")
+    document.add_heading("Mục 1.1", level=2)
+    document.add_heading("Mục 1.1.1", level=3)
+    document.add_heading("Chương 2", level=1)
+    document.add_paragraph("Trích dẫn", style="Quote")
+    
+    table = document.add_table(rows=4, cols=4)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"{r}.{c}"
+    table.cell(0, 0).merge(table.cell(0, 1))        # gridSpan
+    table.cell(1, 2).merge(table.cell(3, 2))        # vMerge
+    table.cell(2, 0).merge(table.cell(3, 1))        # cả 2
+    table.cell(1, 3).add_paragraph("dòng 2")
+    
+    document.save(str(path))
+    return str(path)
+
+
+class TestStreamReader:
+    """Test reader="stream" so với reader="python-docx" trên bộ fixture"""
+    
+    @pytest.fixture(params=["tricky", "synthetic", "repo"])
+    def docx_path(self, request, tmp_path):
+        if request.param == "tricky":
+            return make_tricky_docx(tmp_path / "tricky.docx")
+        if request.param == "synthetic":
+            from benchmarks.synthetic import make_docx
+            return make_docx(str(tmp_path / "thesis.docx"), pages=6, pages_per_chapter=3,
+                             tables_every=2)
+        path = os.path.join(ROOT, "De-Cuong-Thuc-Tap-WENet.docx")
+        if not os.path.exists(path):
+            pytest.skip("fixture DOCX not found")
+        return path
+    
+    def test_same_ir(self, docx_path):
+        """Test: parse() cho cùng Document (title, author, sections, blocks)"""
+        expected = DOCXParser().parse(docx_path)
+        actual = DOCXParser(reader="stream").parse(docx_path)
+        assert actual.sections == expected.sections
+        assert (actual.title, actual.author) == (expected.title, expected.author)
+    
+    def test_iter_sections_and_select(self, docx_path):
+        """Test: iter_sections và sections=[...] giống reader mặc định"""
+        stream = DOCXParser(reader="stream")
+        assert list(stream.iter_sections(docx_path)) == DOCXParser().parse(docx_path).sections
+        
+        title = DOCXParser().parse(docx_path).sections[-1].title
+        assert (DOCXParser(sections=[title], reader="stream").parse(docx_path).sections
+                == DOCXParser(sections=[title]).parse(docx_path).sections)
+    
+    def test_merged_cells(self, tmp_path):
+        """Test: ô gộp ngang/dọc lặp lại text như row.cells của python-docx"""
+        document = DOCXParser(reader="stream").parse(make_tricky_docx(tmp_path / "t.docx"))
+        table = document.sections[-1].blocks[-1]
+        texts = [[cell.content[0].text for cell in row.cells] for row in table.rows]
+        assert texts[0][:2] == ["0.0\n0.1", "0.0\n0.1"]
+        assert texts[3][2] == texts[1][2]
+        assert texts[3][:2] == texts[2][:2]
+    
+    def test_unknown_reader(self):
+        """Test: reader không hợp lệ báo lỗi"""
+        with pytest.raises(ValueError):
+            DOCXParser(reader="lxml")
+
+
+
+class TestBodyOrder:
+    """Test paragraph và bảng được duyệt theo đúng thứ tự trong w:body"""
+    
+    @pytest.mark.parametrize("reader", ["python-docx", "stream"])
+    def test_table_stays_in_its_chapter(self, tmp_path, reader):
+        """Test: bảng nằm ở chương chứa nó, giữa các đoạn văn xung quanh"""
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        document.add_paragraph("Trước bảng")
+        table = document.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "A"
+        document.add_paragraph("Sau bảng")
+        document.add_heading("Chương 2", level=1)
+        document.add_paragraph("Kết luận")
+        path = str(tmp_path / "order.docx")
+        document.save(path)
+        
+        chapters = DOCXParser(reader=reader).parse(path).sections
+        assert [s.title for s in chapters] == ["Chương 1", "Chương 2"]
+        assert [b.type.value for b in chapters[0].blocks] == ["paragraph", "table", "paragraph"]
+        assert chapters[0].blocks[1].rows[0].cells[0].content[0].text == "A"
+        assert [b.type.value for b in chapters[1].blocks] == ["paragraph"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
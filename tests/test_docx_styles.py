@@ -0,0 +1,177 @@
+"""
+DOCX Style Resolver Tests
+==========================
+Test cases for StyleResolver (định dạng hiệu lực theo chuỗi style)
+"""
+
+import pytest
+import os
+import sys
+from xml.etree.ElementTree import fromstring
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.docx_styles import StyleResolver
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+STYLES = f"""<w:styles xmlns:w="{W_NS}">
+  <w:docDefaults><w:rPrDefault><w:rPr>
+    <w:rFonts w:ascii="Times New Roman"/><w:sz w:val="26"/>
+  </w:rPr></w:rPrDefault></w:docDefaults>
+  <w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+  <w:style w:type="paragraph" w:styleId="Heading1">
+    <w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>
+    <w:pPr><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="28"/></w:rPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="Heading2">
+    <w:name w:val="heading 2"/><w:basedOn w:val="Heading1"/>
+    <w:pPr><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:i/></w:rPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="Chuong">
+    <w:name w:val="Chuong"/><w:basedOn w:val="Heading1"/>
+    <w:rPr><w:rFonts w:ascii="Arial"/></w:rPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="Muc">
+    <w:name w:val="Muc"/><w:basedOn w:val="Normal"/><w:pPr><w:outlineLvl w:val="2"/></w:pPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="Buoc">
+    <w:name w:val="Buoc"/><w:pPr><w:numPr><w:numId w:val="3"/></w:numPr></w:pPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="BuocTat">
+    <w:name w:val="BuocTat"/><w:basedOn w:val="Buoc"/>
+    <w:pPr><w:numPr><w:numId w:val="0"/></w:numPr></w:pPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="A"><w:name w:val="A"/><w:basedOn w:val="B"/></w:style>
+  <w:style w:type="paragraph" w:styleId="B"><w:name w:val="B"/><w:basedOn w:val="A"/></w:style>
+  <w:style w:type="character" w:styleId="Strong">
+    <w:name w:val="Strong"/><w:rPr><w:b/><w:rFonts w:ascii="Courier New"/></w:rPr>
+  </w:style>
+</w:styles>"""
+
+
+def paragraph(style_id=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+    return fromstring(f'<w:p xmlns:w="{W_NS}">{ppr}</w:p>')
+
+
+def run(rpr=""):
+    return fromstring(f'<w:r xmlns:w="{W_NS}"><w:rPr>{rpr}</w:rPr><w:t>x</w:t></w:r>')
+
+
+@pytest.fixture
+def styles():
+    return StyleResolver(fromstring(STYLES))
+
+
+class TestStyleResolver:
+    """Test StyleResolver"""
+    
+    def test_inherits_doc_defaults_and_based_on(self, styles):
+        """Test: font/cỡ chữ/đậm kế thừa qua basedOn và docDefaults"""
+        normal = styles.paragraph(paragraph())
+        assert (normal.name, normal.font_name, normal.font_size) == ("Normal", "Times New Roman", 13.0)
+        
+        h2 = styles.style("Heading2")
+        assert h2.name == "Heading 2"
+        assert (h2.font_name, h2.font_size, h2.bold, h2.italic) == ("Times New Roman", 14.0, True, True)
+    
+    def test_heading_levels(self, styles):
+        """Test: cấp heading theo tên, style kế thừa và outline level"""
+        assert styles.style("Heading1").heading_level == 1
+        assert styles.style("Heading2").heading_level == 2
+        assert styles.style("Chuong").heading_level == 1
+        assert styles.style("Muc").heading_level == 3
+        assert styles.style("Normal").heading_level is None
+    
+    def test_list_styles(self, styles):
+        """Test: style có numPr là list, numId=0 tắt numbering kế thừa"""
+        assert styles.style("Buoc").is_list
+        assert not styles.style("BuocTat").is_list
+        assert not styles.style("Normal").is_list
+    
+    def test_unknown_and_cyclic_styles(self, styles):
+        """Test: style không tồn tại → mặc định, vòng basedOn không treo"""
+        assert styles.paragraph(paragraph("Missing")) == styles.style("Normal")
+        assert styles.style("A").name == "A"
+        assert StyleResolver().style(None).name == ""
+    
+    def test_memoized(self, styles):
+        """Test: mỗi style chỉ tính 1 lần"""
+        assert styles.style("Chuong") is styles.paragraph(paragraph("Chuong"))
+    
+    def test_run_precedence(self, styles):
+        """Test: rPr của run > character style > paragraph style"""
+        h1 = styles.style("Heading1")
+        assert styles.run(run(), h1) == (True, False, "Times New Roman", 14.0)
+        assert styles.run(run('<w:b w:val="0"/><w:sz w:val="24"/>'), h1) == (
+            False, False, "Times New Roman", 12.0)
+        
+        normal = styles.style("Normal")
+        strong = '<w:rStyle w:val="Strong"/>'
+        assert styles.run(run(strong), normal) == (True, False, "Courier New", 13.0)
+        assert styles.run(run(strong + '<w:rFonts w:ascii="Arial"/>'), normal).font_name == "Arial"
+    
+    def test_from_docx_matches_archive(self, tmp_path):
+        """Test: đọc từ python-docx và từ zip cho cùng kết quả"""
+        docx = pytest.importorskip("docx")
+        import zipfile
+        
+        path = str(tmp_path / "a.docx")
+        docx.Document().save(path)
+        from_docx = StyleResolver.from_docx(docx.Document(path))
+        with zipfile.ZipFile(path) as archive:
+            from_archive = StyleResolver.from_archive(archive)
+        
+        ids = from_docx.style_ids()
+        assert ids == from_archive.style_ids()
+        assert [from_docx.style(i) for i in ids] == [from_archive.style(i) for i in ids]
+
+
+class TestConsumers:
+    """Test DOCXParser/ND30Validator dùng định dạng kế thừa"""
+    
+    def test_parser_inherited_heading_and_fonts(self, tmp_path):
+        """Test: style kế thừa Heading 1 mở chương mới, run lấy font của style"""
+        docx = pytest.importorskip("docx")
+        from docx.enum.style import WD_STYLE_TYPE
+        from function1.parsers import DOCXParser
+        
+        document = docx.Document()
+        chapter = document.styles.add_style("Chuong", WD_STYLE_TYPE.PARAGRAPH)
+        chapter.base_style = document.styles["Heading 1"]
+        document.styles["Normal"].font.name = "Times New Roman"
+        document.styles["Normal"].font.size = docx.shared.Pt(13)
+        document.add_paragraph("Chương 1", style="Chuong")
+        document.add_paragraph("Nội dung")
+        path = str(tmp_path / "a.docx")
+        document.save(path)
+        
+        for reader in ("python-docx", "stream"):
+            sections = DOCXParser(reader=reader).parse(path).sections
+            assert [s.title for s in sections] == ["Chương 1"]
+            run = sections[0].blocks[0].runs[0]
+            assert (run.font_name, run.font_size) == ("Times New Roman", 13.0)
+    
+    def test_validator_sees_style_fonts(self, tmp_path):
+        """Test: ND30Validator kiểm tra font khai báo ở style, không chỉ ở run"""
+        docx = pytest.importorskip("docx")
+        from function2.validators.nd30_validator import ND30Validator
+        
+        document = docx.Document()
+        document.styles["Normal"].font.name = "Arial"
+        document.styles["Normal"].font.size = docx.shared.Pt(13)
+        document.add_paragraph("Nội dung")
+        path = str(tmp_path / "a.docx")
+        document.save(path)
+        
+        validator = ND30Validator()
+        validator._validate_fonts(docx.Document(path))
+        font = next(r for r in validator.results if r.category == "font")
+        assert not font.passed
+        assert "Arial" in font.message
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
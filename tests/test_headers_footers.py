@@ -0,0 +1,116 @@
+"""
+Header/Footer Tests
+====================
+Test cases for repeated header/footer detection
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.headers_footers import (
+    RepeatDetector, repeat_key, is_repeat, estimate_tokens
+)
+
+
+class TestRepeatDetector:
+    """Test repeat_key / RepeatDetector"""
+    
+    def test_key_only_in_margins(self):
+        """Test: chỉ dòng ở lề trên/dưới mới có key"""
+        assert repeat_key("Báo cáo", 20, 30, 800) is not None
+        assert repeat_key("Trang 3", 770, 780, 800) is not None
+        assert repeat_key("Nội dung", 400, 410, 800) is None
+    
+    def test_page_numbers_share_key(self):
+        """Test: chữ số được chuẩn hóa, "Trang 3" và "TRANG  12" cùng key"""
+        assert repeat_key("Trang 3", 770, 780, 800) == repeat_key("TRANG  12", 770, 780, 800)
+        assert repeat_key("Trang 3", 770, 780, 800) != repeat_key("Trang 3", 20, 30, 800)
+    
+    def test_repeated(self):
+        """Test: key có trên > 50% số trang là lặp lại"""
+        detector = RepeatDetector()
+        for page in range(10):
+            keys = [repeat_key(f"Trang {page + 1}", 770, 780, 800), None]
+            if page < 3:
+                keys.append(repeat_key("Chương 1", 20, 30, 800))
+            detector.add_page(keys)
+        
+        assert detector.repeated() == {repeat_key("Trang 1", 770, 780, 800)}
+    
+    def test_short_document(self):
+        """Test: document quá ít trang thì không bỏ gì"""
+        detector = RepeatDetector()
+        for _ in range(2):
+            detector.add_page([repeat_key("Header", 20, 30, 800)])
+        assert detector.repeated() == set()
+    
+    def test_is_repeat_keeps_large_lines(self):
+        """Test: dòng lặp lại nhưng lớn hơn body text (heading) không bị bỏ"""
+        key = repeat_key("Chương 1", 20, 30, 800)
+        assert is_repeat(key, 11, {key}, 11)
+        assert not is_repeat(key, 18, {key}, 11)
+        assert not is_repeat(None, 11, {key}, 11)
+    
+    def test_estimate_tokens(self):
+        """Test: ước lượng token ~ 4 ký tự/token"""
+        assert estimate_tokens(0) == 0
+        assert estimate_tokens(9) == 3
+
+
+class TestStripping:
+    """Test PDFParser / ContentExtractor bỏ header/footer"""
+    
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        pytest.importorskip("fitz")
+        from benchmarks.synthetic import make_text_pdf
+        return make_text_pdf(str(tmp_path / "a.pdf"), pages=12, pages_per_chapter=4,
+                             running_headers=True)
+    
+    def test_pdf_parser(self, pdf_path):
+        """Test: header/số trang bị bỏ, headings chương vẫn giữ"""
+        from function1.parsers import PDFParser
+        
+        parser = PDFParser()
+        markdown = parser.parse(pdf_path).to_markdown()
+        assert "Bao cao thuc tap" not in markdown
+        assert "Trang 5" not in markdown
+        assert "# Chuong 3" in markdown
+        assert parser.stripped["lines"] == 24
+        assert parser.stripped["tokens"] > 0
+        
+        kept = PDFParser(strip_repeats=False).parse(pdf_path).to_markdown()
+        assert "Trang 5" in kept
+    
+    def test_content_extractor(self, pdf_path):
+        """Test: ContentExtractor dùng cùng logic"""
+        pytest.importorskip("docx")
+        from function3.extractors import ContentExtractor
+        
+        content = ContentExtractor().extract(pdf_path)
+        assert "Bao cao thuc tap" not in content["full_text"]
+        assert "Trang 5" not in content["full_text"]
+        assert "Chuong 3" in content["full_text"]
+        assert content["stripped"]["lines"] == 24
+    
+    def test_content_extractor_keeps_headings(self, tmp_path):
+        """Test: heading 18pt đầu mỗi trang được giữ, trang giữ nguyên get_text("text")"""
+        pytest.importorskip("docx")
+        import fitz
+        from benchmarks.synthetic import make_text_pdf
+        from function3.extractors import ContentExtractor
+        
+        path = make_text_pdf(str(tmp_path / "b.pdf"), pages=12, pages_per_chapter=1)
+        content = ContentExtractor().extract(path)
+        assert content["stripped"]["lines"] == 0
+        assert "Chuong 3" in content["full_text"]
+        with fitz.open(path) as doc:
+            assert content["pages"][0]["text"] == doc[0].get_text("text")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
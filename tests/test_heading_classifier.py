@@ -0,0 +1,87 @@
+"""
+Heading Classifier Tests
+=========================
+Test cases for adaptive PDF heading detection
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.heading_classifier import FontStats, HeadingClassifier
+
+
+def fit(lines):
+    stats = FontStats()
+    for size, bold, nchars in lines:
+        stats.add(size, bold, nchars)
+    return HeadingClassifier.fit(stats)
+
+
+class TestHeadingClassifier:
+    """Test HeadingClassifier.fit / classify"""
+    
+    def test_levels_from_size_distribution(self):
+        """Test: body 13pt, heading 15pt/14pt không đậm vẫn được nhận"""
+        classifier = fit(
+            [(13, False, 80)] * 500 + [(15, False, 20)] * 5 + [(14, False, 25)] * 20
+        )
+        assert classifier.classify(15, False, "CHƯƠNG 1") == 1
+        assert classifier.classify(14, False, "1.1 Mục tiêu") == 2
+        assert classifier.classify(13, False, "Nội dung") == 0
+    
+    def test_single_cover_title_shares_h1(self):
+        """Test: cỡ chữ bìa xuất hiện 1 lần không chiếm mất H1 của chương"""
+        classifier = fit([(24, True, 30)] + [(16, True, 20)] * 5 + [(12, False, 80)] * 500)
+        assert classifier.classify(24, True, "LUẬN VĂN") == 1
+        assert classifier.classify(16, True, "Chương 1") == 1
+    
+    def test_bold_body_lines(self):
+        """Test: dòng đậm ngắn cỡ body là heading cấp kế tiếp khi hiếm"""
+        classifier = fit([(16, True, 20)] * 5 + [(12, True, 20)] * 10 + [(12, False, 80)] * 500)
+        assert classifier.classify(12, True, "1.1 Giới thiệu") == 2
+        assert classifier.classify(12, True, "Câu in đậm kết thúc.") == 0
+    
+    def test_bold_labels_without_size_tiers(self):
+        """Test: không có cỡ heading, nhiều dòng đậm ngắn → H2, không tách chương"""
+        labels = fit([(12, True, 8)] * 40 + [(12, False, 80)] * 1000)
+        assert labels.classify(12, True, "Bước 1") == 2
+        
+        chapters = fit([(12, True, 20)] * 3 + [(12, False, 80)] * 1000)
+        assert chapters.classify(12, True, "CHƯƠNG 1") == 1
+    
+    def test_long_text_is_never_heading(self):
+        """Test: đoạn dài không phải heading"""
+        classifier = fit([(16, True, 20)] * 5 + [(12, False, 80)] * 500)
+        assert classifier.classify(16, True, "x" * 400) == 0
+    
+    def test_empty(self):
+        """Test: document rỗng"""
+        assert fit([]).classify(20, True, "Title") == 0
+    
+    def test_pure_python_fallback(self, monkeypatch):
+        """Test: không có numpy cho kết quả giống hệt"""
+        from function1.parsers import heading_classifier
+        
+        lines = [(24, True, 30)] + [(16, True, 20)] * 5 + [(12, True, 10)] * 3 + [(12, False, 80)] * 50
+        labels = [(12, True, 8)] * 40 + [(12, False, 80)] * 1000
+        expected = [fit(lines), fit(labels)]
+        monkeypatch.setattr(heading_classifier, "NUMPY_AVAILABLE", False)
+        
+        for result, want in zip([fit(lines), fit(labels)], expected):
+            assert result.size_levels == want.size_levels
+            assert (result.body_key, result.bold_level) == (want.body_key, want.bold_level)
+    
+    def test_fixed(self):
+        """Test: ngưỡng cố định cũ"""
+        classifier = HeadingClassifier.fixed()
+        assert classifier.classify(16, True, "A") == 1
+        assert classifier.classify(14, True, "A") == 2
+        assert classifier.classify(18, False, "A") == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
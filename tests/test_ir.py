@@ -0,0 +1,126 @@
+"""
+IR Tests
+=========
+Test cases for function1 Intermediate Representation
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.ir import (
+    Document, Section, Block, BlockType, Run, ListItem, TableRow, TableCell,
+    create_paragraph, create_heading, create_list
+)
+
+
+class TestCompactBlock:
+    """Test slotted Block/Run"""
+    
+    def test_block_has_no_dict(self):
+        """Test: Block và Run không giữ __dict__"""
+        block = create_paragraph("text")
+        assert not hasattr(block, "__dict__")
+        assert not hasattr(block.runs[0], "__dict__")
+    
+    def test_lazy_containers(self):
+        """Test: list/dict chỉ được tạo khi truy cập và có thể append"""
+        block = Block(type=BlockType.LIST)
+        assert block.items == []
+        block.items.append(ListItem(content=[Run(text="a")]))
+        assert len(block.items) == 1
+        block.metadata["page"] = 3
+        assert block.metadata == {"page": 3}
+    
+    def test_block_equality(self):
+        """Test: Block so sánh theo giá trị như dataclass"""
+        assert create_heading("A", 2) == create_heading("A", 2)
+        assert create_heading("A", 2) != create_heading("A", 3)
+        assert Block(type=BlockType.IMAGE) == Block(type=BlockType.IMAGE, metadata={})
+    
+    def test_font_name_interned(self):
+        """Test: font_name được intern"""
+        a = Run(text="a", font_name="".join(["Times ", "New Roman"]))
+        b = Run(text="b", font_name="".join(["Times New ", "Roman"]))
+        assert a.font_name is b.font_name
+
+
+class TestSectionMarkdown:
+    """Test Section.to_markdown"""
+    
+    def test_to_markdown(self):
+        """Test: markdown output"""
+        section = Section(title="Chapter 1", level=1)
+        section.blocks.append(create_heading("Intro", 2))
+        section.blocks.append(create_paragraph("Bold", bold=True))
+        section.blocks.append(create_list(["a", "b"], ordered=True))
+        
+        md = section.to_markdown()
+        assert md.startswith("# Chapter 1\n")
+        assert "## **Intro**" in md
+        assert "**Bold**" in md
+        assert "1. a\n2. b" in md
+    
+    def test_document_to_markdown(self):
+        """Test: document nối sections bằng ---"""
+        doc = Document(sections=[Section(title="A", level=1), Section(title="B", level=1)])
+        assert doc.to_markdown() == "# A\n\n---\n\n# B\n"
+
+
+
+class TestMarkdownWriter:
+    """Test write_markdown (stream từng block)"""
+    
+    def test_table(self):
+        """Test: TABLE → bảng GFM, escape "|", xuống dòng → <br>, bù ô thiếu"""
+        table = Block(type=BlockType.TABLE, rows=[
+            TableRow(cells=[TableCell(content=[Run(text="A")]),
+                            TableCell(content=[Run(text="B", bold=True)])], is_header=True),
+            TableRow(cells=[TableCell(content=[Run(text="x|y")]),
+                            TableCell(content=[Run(text="1\n2")])]),
+            TableRow(cells=[TableCell(content=[Run(text="z")])]),
+        ])
+        section = Section(title="T", level=1, blocks=[table])
+        assert section.to_markdown() == (
+            "# T\n\n| A | **B** |\n| --- | --- |\n| x\\|y | 1<br>2 |\n| z |  |\n"
+        )
+    
+    def test_table_col_span(self):
+        """Test: ô col_span giữ chỗ ngay sau nó, các cột thẳng hàng"""
+        table = Block(type=BlockType.TABLE, rows=[
+            TableRow(cells=[TableCell(content=[Run(text="Nhóm")], col_span=2),
+                            TableCell(content=[Run(text="Ghi chú")])], is_header=True),
+            TableRow(cells=[TableCell(content=[Run(text=t)]) for t in "abc"]),
+        ])
+        section = Section(title="T", level=1, blocks=[table])
+        assert section.to_markdown() == (
+            "# T\n\n| Nhóm |  | Ghi chú |\n| --- | --- | --- |\n| a | b | c |\n"
+        )
+    
+    def test_code_and_pagebreak(self):
+        """Test: CODE → fenced block (fence dài hơn ``` trong code), PAGEBREAK"""
+        code = Block(type=BlockType.CODE, content="print('```')\n",
+                     metadata={"language": "python"})
+        section = Section(title="T", level=1, blocks=[code, Block(type=BlockType.PAGEBREAK)])
+        assert section.to_markdown() == (
+            "# T\n\n````python\nprint('```')\n````\n\n<!-- pagebreak -->\n"
+        )
+    
+    def test_write_matches_to_markdown(self, tmp_path):
+        """Test: ghi vào file cho cùng nội dung với to_markdown()"""
+        section = Section(title="Chapter 1", level=1)
+        section.blocks.append(create_heading("Intro", 2))
+        section.blocks.append(create_list(["a", "b"]))
+        doc = Document(sections=[section, Section(title="B", level=1)])
+        
+        path = tmp_path / "doc.md"
+        with open(path, "w", encoding="utf-8") as f:
+            doc.write_markdown(f)
+        assert path.read_text(encoding="utf-8") == doc.to_markdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
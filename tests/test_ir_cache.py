@@ -0,0 +1,201 @@
+"""
+IR Cache Tests
+===============
+Test cases for IR codec and on-disk IR cache
+"""
+
+import pytest
+import io
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.ir import (
+    Document, Section, Block, BlockType, Run, TableRow, TableCell,
+    create_paragraph, create_heading, create_list
+)
+from function1.parsers.ir_codec import SectionStore, dump_document, load_document
+from function1.parsers.ir_cache import IRCache
+
+
+def sample_document(title="Doc"):
+    section = Section(title="Chương 1", level=1, metadata={"k": 1})
+    section.blocks.append(create_heading("Mục 1", 2))
+    section.blocks.append(create_paragraph("Đậm", bold=True))
+    section.blocks.append(create_list(["a", "b"], ordered=True))
+    section.blocks.append(Block(
+        type=BlockType.TABLE,
+        rows=[TableRow(cells=[TableCell(content=[Run(text="x", font_size=13.0)])],
+                       is_header=True)]
+    ))
+    section.blocks.append(Block(type=BlockType.IMAGE,
+                                metadata={"page": 0, "bbox": (1.0, 2.0, 3.0, 4.0)}))
+    return Document(title=title, author="A", sections=[section],
+                    source_path="x.pdf", source_type="pdf")
+
+
+class SectionsOnlyParser:
+    """Parser giả, đếm số lần parse (không có document_info)"""
+    
+    VERSION = "1"
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def cache_options(self):
+        return {}
+    
+    def parse(self, path):
+        self.calls += 1
+        return sample_document()
+    
+    def iter_sections(self, path):
+        self.calls += 1
+        yield from sample_document().sections
+
+
+class FakeParser(SectionsOnlyParser):
+    """Parser giả có document_info như PDFParser/DOCXParser"""
+    
+    def document_info(self, path):
+        doc = sample_document(title="Real Title")
+        doc.sections = []
+        return doc
+
+
+class TestIRCodec:
+    """Test ir_codec"""
+    
+    def test_roundtrip(self):
+        """Test: dump → load giữ nguyên Document"""
+        doc = sample_document()
+        buf = io.BytesIO()
+        dump_document(doc, buf)
+        buf.seek(0)
+        loaded = load_document(buf)
+        
+        assert loaded == doc
+        assert loaded.to_markdown() == doc.to_markdown()
+    
+    def test_section_store(self):
+        """Test: SectionStore lưu sections ra file tạm, đọc lại như list"""
+        doc = sample_document()
+        sections = doc.sections * 3
+        store = SectionStore(sections[:2])
+        store.append(sections[2])
+        
+        assert len(store) == 3
+        assert list(store) == sections
+        assert store[-1] == sections[2]
+        assert store[1:] == sections[1:]
+        
+        doc.sections = store
+        assert doc.to_markdown().count("# Chương 1") == 3
+        store.close()
+
+
+class TestIRCache:
+    """Test IRCache"""
+    
+    def make_source(self, tmp_path, content=b"source"):
+        path = tmp_path / "a.pdf"
+        path.write_bytes(content)
+        return str(path)
+    
+    def test_hit_skips_parsing(self, tmp_path):
+        """Test: lần 2 đọc từ cache, không gọi parser"""
+        cache = IRCache(str(tmp_path / "cache"))
+        parser = FakeParser()
+        source = self.make_source(tmp_path)
+        
+        first = list(cache.iter_sections(source, parser))
+        second = list(cache.iter_sections(source, parser))
+        
+        assert parser.calls == 1
+        assert first == second
+        assert cache.parse(source, parser).sections == first
+        assert (cache.hits, cache.misses) == (2, 1)
+    
+    def test_streamed_entry_keeps_document_info(self, tmp_path):
+        """Test: entry ghi từ iter_sections có title/author thật cho parse()"""
+        cache = IRCache(str(tmp_path / "cache"))
+        parser = FakeParser()
+        source = self.make_source(tmp_path)
+        
+        list(cache.iter_sections(source, parser))
+        document = cache.parse(source, parser)
+        assert (document.title, document.author) == ("Real Title", "A")
+        assert parser.calls == 1
+    
+    def test_sections_only_entry_not_reused_by_parse(self, tmp_path):
+        """Test: parser không có document_info → parse() không dùng entry placeholder"""
+        cache = IRCache(str(tmp_path / "cache"))
+        parser = SectionsOnlyParser()
+        source = self.make_source(tmp_path)
+        
+        list(cache.iter_sections(source, parser))
+        assert cache.contains(source, parser)
+        assert cache.parse(source, parser).title == "Doc"
+        assert parser.calls == 2
+    
+    def test_key_depends_on_content_and_options(self, tmp_path):
+        """Test: đổi nội dung file hoặc options → key khác"""
+        cache = IRCache(str(tmp_path / "cache"))
+        parser = FakeParser()
+        source = self.make_source(tmp_path)
+        key = cache.make_key(source, parser)
+        
+        parser.cache_options = lambda: {"fidelity": "fast"}
+        assert cache.make_key(source, parser) != key
+        
+        self.make_source(tmp_path, b"changed content")
+        assert cache.make_key(source, FakeParser()) != key
+    
+    def test_missing_images_are_regenerated(self, tmp_path):
+        """Test: cache hit nhưng images đã bị xóa → parse lại, ghi lại images"""
+        pytest.importorskip("fitz")
+        from benchmarks.synthetic import make_image_pdf
+        from function1.parsers import PDFParser
+        
+        source = make_image_pdf(str(tmp_path / "a.pdf"), pages=4, figures_every=2)
+        images_dir = tmp_path / "images"
+        cache = IRCache(str(tmp_path / "cache"))
+        parser = PDFParser(images_dir=str(images_dir))
+        
+        first = cache.parse(source, parser)
+        files = sorted(p.name for p in images_dir.iterdir())
+        assert cache.contains(source, parser)
+        
+        (images_dir / files[0]).unlink()
+        assert not cache.contains(source, parser)
+        assert cache.parse(source, parser).sections == first.sections
+        assert sorted(p.name for p in images_dir.iterdir()) == files
+        assert (cache.hits, cache.misses) == (0, 2)
+        
+        assert cache.parse(source, parser).sections == first.sections
+        assert cache.hits == 1
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test: vượt max_bytes thì xóa entry cũ nhất"""
+        cache = IRCache(str(tmp_path / "cache"), max_bytes=1)
+        parser = FakeParser()
+        
+        cache.parse(self.make_source(tmp_path, b"one"), parser)
+        cache.parse(self.make_source(tmp_path, b"two"), parser)
+        
+        assert cache.stats()["entries"] <= 1
+    
+    def test_clear(self, tmp_path):
+        """Test: clear xóa mọi entry"""
+        cache = IRCache(str(tmp_path / "cache"))
+        cache.parse(self.make_source(tmp_path), FakeParser())
+        
+        assert cache.stats()["entries"] == 1
+        assert cache.clear() == 1
+        assert cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
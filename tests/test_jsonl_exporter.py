@@ -0,0 +1,65 @@
+"""
+JSONL Exporter Tests
+=====================
+Test cases for JSONLExporter (mỗi chunk 1 record JSON)
+"""
+
+import pytest
+import io
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.exporters.jsonl_exporter import JSONLExporter, chunk_record, plain_text
+from function1.parsers.ir import Block, BlockType, Run, ListItem, TableRow, TableCell, Section
+
+
+def chapter():
+    return Section(title="Mục 1.1", level=2, metadata={
+        "breadcrumb": ["Chương 1", "Mục 1.1"], "page": 3
+    }, blocks=[
+        Block(type=BlockType.PARAGRAPH, runs=[Run("Đoạn "), Run("đậm", bold=True)],
+              metadata={"page": 4}),
+        Block(type=BlockType.LIST, items=[ListItem(content=[Run("Ý *một*")])]),
+        Block(type=BlockType.TABLE, rows=[TableRow(cells=[
+            TableCell(content=[Run("A")]), TableCell(content=[Run("B|C")])
+        ])]),
+        Block(type=BlockType.PAGEBREAK),
+    ])
+
+
+class TestJSONLExporter:
+    """Test JSONLExporter"""
+    
+    def test_record(self):
+        """Test: record có markdown, title path, khoảng trang, text bỏ formatting"""
+        section = chapter()
+        record = chunk_record(section, 1, source="a.pdf")
+        assert record["path"] == ["Chương 1", "Mục 1.1"]
+        assert (record["id"], record["source"], record["level"]) == (1, "a.pdf", 2)
+        assert record["pages"] == [4, 5]
+        assert record["text"] == section.to_markdown()
+        assert "**đậm**" in record["text"]
+        assert record["plain"] == "Mục 1.1\n\nĐoạn đậm\n\nÝ *một*\n\nA\tB|C"
+    
+    def test_one_line_per_chunk(self):
+        """Test: mỗi chunk 1 dòng JSON, id tăng dần, không có trang → null"""
+        buffer = io.StringIO()
+        exporter = JSONLExporter(buffer)
+        plain = Section(title="Kết luận\nphần 2", level=1,
+                        blocks=[Block(type=BlockType.PARAGRAPH, runs=[Run("x")])])
+        assert exporter.write_all([chapter(), plain]) == 2
+        
+        lines = buffer.getvalue().splitlines()
+        records = [json.loads(line) for line in lines]
+        assert len(lines) == 2
+        assert [r["id"] for r in records] == [1, 2]
+        assert records[1]["pages"] is None and records[1]["path"] == ["Kết luận\nphần 2"]
+        assert plain_text(plain) == "Kết luận\nphần 2\n\nx"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
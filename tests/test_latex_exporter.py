@@ -0,0 +1,110 @@
+"""
+LaTeX Exporter Tests
+=====================
+Test cases for LaTeXExporter (escape 1 lượt, ghi stream)
+"""
+
+import pytest
+import io
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.exporters.latex_exporter import LaTeXExporter, escape_latex
+from function1.parsers.ir import (
+    Block, BlockType, Run, ListItem, TableRow, TableCell, Section, Document, create_heading
+)
+
+
+def chapter():
+    return Section(title="Chương 1: Chi phí 100%", level=1, blocks=[
+        create_heading("Mục 1.1", 2),
+        Block(type=BlockType.PARAGRAPH, runs=[Run("Đoạn "), Run("đậm", bold=True),
+                                              Run(" và ", italic=True)]),
+        Block(type=BlockType.LIST, ordered=True, items=[ListItem(content=[Run("a_b")])]),
+        Block(type=BlockType.TABLE, rows=[TableRow(cells=[
+            TableCell(content=[Run("A")]), TableCell(content=[Run("B & C")])
+        ])]),
+        Block(type=BlockType.IMAGE, image_path="hinh.png"),
+    ])
+
+
+class TestEscape:
+    """Test escape_latex"""
+    
+    def test_special_characters(self):
+        """Test: mọi ký tự đặc biệt được escape"""
+        assert escape_latex("50% & $5 #1 a_b ~ ^") == (
+            "50\\% \\& \\$5 \\#1 a\\_b \\textasciitilde{} \\textasciicircum{}"
+        )
+        assert escape_latex("Tiếng Việt có dấu") == "Tiếng Việt có dấu"
+        assert escape_latex("") == ""
+    
+    def test_backslash_braces_not_escaped_twice(self):
+        """Test: {} của \\textbackslash{} không bị escape lại"""
+        assert escape_latex("C:\\dir{x}") == "C:\\textbackslash{}dir\\{x\\}"
+        assert LaTeXExporter()._escape_latex("\\") == "\\textbackslash{}"
+
+
+class TestWriter:
+    """Test ghi LaTeX stream"""
+    
+    def test_section(self):
+        """Test: write_section ghi đúng nội dung như _export_section"""
+        exporter = LaTeXExporter()
+        buffer = io.StringIO()
+        exporter.write_section(buffer, chapter())
+        latex = buffer.getvalue()
+        
+        assert latex == exporter._export_section(chapter())
+        assert latex.startswith("\\chapter{Chương 1: Chi phí 100\\%}\n\\label{ch:")
+        assert "\n\n\\section{\\textbf{Mục 1.1}}\n" in latex
+        assert "Đoạn \\textbf{đậm}\\textit{ và }\n" in latex
+        assert "\\begin{enumerate}\n\\item a\\_b\n\\end{enumerate}\n" in latex
+        assert "A & B \\& C \\\\\n\\hline\n" in latex
+        assert latex.endswith("\\includegraphics[width=0.8\\textwidth]{hinh.png}\n")
+    
+    def test_split_parts_share_one_chapter(self):
+        """Test: các phần tách theo max_chars chỉ có 1 \\chapter/\\label"""
+        from function1.processors.splitter import Splitter
+        section = Section(title="Chương 1", level=1, blocks=[
+            Block(type=BlockType.PARAGRAPH, runs=[Run(f"Đoạn văn số {i}. " * 5)])
+            for i in range(10)
+        ])
+        parts = Splitter(max_chars=200).split(Document(sections=[section]))
+        assert len(parts) > 1
+        
+        exporter = LaTeXExporter()
+        latex = "".join(exporter._export_section(part) for part in parts)
+        assert latex.count("\\chapter{") == 1 and latex.count("\\label{") == 1
+        assert all(f"Đoạn văn số {i}." in latex for i in range(10))
+    
+    def test_packed_chapters_get_sections(self):
+        """Test: chương được gom (pack_target) thành \\section, không phải \\paragraph"""
+        from function1.processors.splitter import Splitter
+        chapters = [Section(title=f"Chương {i}", level=1, blocks=[
+            Block(type=BlockType.PARAGRAPH, runs=[Run("Nội dung.")])
+        ]) for i in (1, 2)]
+        packed, = Splitter(pack_target=1000).split(Document(sections=chapters))
+        
+        latex = LaTeXExporter()._export_section(packed)
+        assert latex.startswith("\\chapter{Chương 1}")
+        assert "\\section{Chương 2}" in latex and "\\paragraph" not in latex
+    
+    def test_export_document(self, tmp_path):
+        """Test: export ghi template + các section cách nhau 1 dòng trống"""
+        exporter = LaTeXExporter()
+        document = Document(title="Luận văn 50%", author="A_B", sections=[chapter(), chapter()])
+        path = exporter.export(document, str(tmp_path / "main.tex"))
+        
+        latex = open(path, encoding="utf-8").read()
+        body = exporter._export_section(chapter())
+        assert f"{body}\n\n{body}" in latex
+        assert "Luận văn 50\\%" in latex and "A\\_B" in latex
+        assert "$content" not in latex and latex.rstrip().endswith("\\end{document}")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+IR Normalization Tests
+=======================
+Test cases for run coalescing (function1.parsers.normalize)
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.ir import Block, BlockType, Run, ListItem, TableRow, TableCell, Section
+from function1.parsers.normalize import coalesce_runs, new_counts, normalize_section
+
+
+class TestCoalesceRuns:
+    """Test coalesce_runs"""
+    
+    def test_merges_identical_formatting(self):
+        """Test: runs liền nhau cùng formatting được gộp, khác formatting thì giữ"""
+        runs = [Run("Xin "), Run("chào "), Run("bạn", bold=True), Run(" đọc", bold=True),
+                Run(" tiếp")]
+        merged, count, dropped = coalesce_runs(runs)
+        assert [(r.text, r.bold) for r in merged] == [
+            ("Xin chào ", False), ("bạn đọc", True), (" tiếp", False)
+        ]
+        assert (count, dropped) == (2, 0)
+    
+    def test_drops_empty_runs(self):
+        """Test: runs rỗng bị bỏ, kể cả khi nằm giữa 2 runs gộp được"""
+        merged, count, dropped = coalesce_runs([Run(""), Run("a"), Run("", italic=True), Run("b")])
+        assert [r.text for r in merged] == ["ab"]
+        assert (count, dropped) == (1, 2)
+    
+    def test_font_must_match(self):
+        """Test: khác font/cỡ chữ/gạch chân thì không gộp"""
+        runs = [Run("a", font_size=13.0), Run("b", font_size=14.0),
+                Run("c", font_name="Arial"), Run("d", underline=True)]
+        merged, count, _ = coalesce_runs(runs)
+        assert len(merged) == 4 and count == 0
+
+
+class TestNormalizeSection:
+    """Test normalize_section"""
+    
+    def test_paragraphs_lists_and_tables(self):
+        """Test: gộp runs trong paragraph, list items và ô bảng, cộng dồn counters"""
+        section = Section(title="Chương 1", level=1, blocks=[
+            Block(type=BlockType.PARAGRAPH, runs=[Run("a"), Run("b"), Run("")]),
+            Block(type=BlockType.LIST, items=[ListItem(content=[Run("x"), Run("y")])]),
+            Block(type=BlockType.TABLE, rows=[TableRow(cells=[
+                TableCell(content=[Run("1"), Run("2")]), TableCell(content=[Run("3")])
+            ])]),
+            Block(type=BlockType.PAGEBREAK),
+        ])
+        counts = new_counts()
+        normalize_section(section, counts)
+        
+        assert [r.text for r in section.blocks[0].runs] == ["ab"]
+        assert [r.text for r in section.blocks[1].items[0].content] == ["xy"]
+        assert [r.text for r in section.blocks[2].rows[0].cells[0].content] == ["12"]
+        assert section.blocks[3]._runs is None
+        assert counts == {"runs": 8, "merged": 3, "dropped": 1}
+
+
+class TestParsers:
+    """Test chuẩn hóa mặc định sau khi parse"""
+    
+    def test_docx_merges_by_default(self, tmp_path):
+        """Test: DOCXParser gộp runs và báo counters, normalize=False giữ nguyên"""
+        docx = pytest.importorskip("docx")
+        from function1.parsers import DOCXParser
+        
+        document = docx.Document()
+        para = document.add_paragraph()
+        for word in ("Một ", "đoạn ", "văn"):
+            para.add_run(word)
+        path = str(tmp_path / "a.docx")
+        document.save(path)
+        
+        parser = DOCXParser()
+        runs = parser.parse(path).sections[0].blocks[0].runs
+        assert [r.text for r in runs] == ["Một đoạn văn"]
+        assert parser.normalized == {"runs": 3, "merged": 2, "dropped": 0}
+        
+        raw = DOCXParser(normalize=False)
+        assert len(raw.parse(path).sections[0].blocks[0].runs) == 3
+        assert raw.cache_options() == {"normalize": False}
+        assert parser.cache_options() == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,318 @@
+"""
+Parser Tests
+=============
+Test cases for function1 PDF/DOCX parsers
+"""
+
+import pytest
+import os
+import re
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+fitz = pytest.importorskip("fitz")
+docx = pytest.importorskip("docx")
+
+from function1.parsers import PDFParser, DOCXParser, BlockType, Section, scan_outline
+from function1.parsers.pdf_parser import _table_block, parse_page_spec, ruling_bbox
+
+
+def make_pdf(path, chapters=3, lines=10, toc=True):
+    """Tạo PDF: mỗi chương 1 trang, heading 18pt bold + các dòng 11pt"""
+    doc = fitz.open()
+    for c in range(chapters):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {c + 1}", fontsize=18, fontname="hebo")
+        y = 110
+        for i in range(lines):
+            page.insert_text((72, y), f"Line {i} of chapter {c + 1}", fontsize=11)
+            y += 14
+    if toc:
+        doc.set_toc([[1, f"Chapter {c + 1}", c + 1] for c in range(chapters)])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def make_docx(path, chapters=3, paragraphs=3):
+    """Tạo DOCX: Heading 1 / Heading 2 / paragraphs / list / table"""
+    document = docx.Document()
+    for c in range(chapters):
+        document.add_heading(f"Chương {c + 1}", level=1)
+        document.add_heading(f"Mục {c + 1}.1", level=2)
+        for i in range(paragraphs):
+            para = document.add_paragraph(f"Đoạn {i} ")
+            para.add_run("in đậm").bold = True
+        document.add_paragraph("Ý thứ nhất", style="List Bullet")
+        document.add_paragraph("Ý thứ hai", style="List Bullet")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "A"
+    table.cell(1, 1).text = "D"
+    document.save(str(path))
+    return str(path)
+
+
+class TestDOCXParser:
+    """Test DOCXParser"""
+    
+    def test_parse_sections(self, tmp_path):
+        """Test: mỗi Heading 1 là 1 section"""
+        doc = DOCXParser().parse(make_docx(tmp_path / "a.docx"))
+        assert [s.title for s in doc.sections] == ["Chương 1", "Chương 2", "Chương 3"]
+        types = [b.type for b in doc.sections[0].blocks]
+        assert types[0] == BlockType.HEADING
+        assert BlockType.LIST in types
+    
+    def test_iter_sections_matches_parse(self, tmp_path):
+        """Test: iter_sections yield cùng sections với parse"""
+        path = make_docx(tmp_path / "a.docx")
+        parser = DOCXParser()
+        streamed = parser.iter_sections(path)
+        assert not isinstance(streamed, list)
+        assert list(streamed) == parser.parse(path).sections
+    
+    def test_select_sections(self, tmp_path):
+        """Test: sections=[...] chỉ giữ các chương khớp tiêu đề"""
+        path = make_docx(tmp_path / "a.docx")
+        doc = DOCXParser(sections=["chương 2"]).parse(path)
+        assert [s.title for s in doc.sections] == ["Chương 2"]
+        with pytest.raises(ValueError):
+            DOCXParser().parse(path, sections=["Chương 9"])
+
+
+class TestPDFParser:
+    """Test PDFParser"""
+    
+    def test_iter_sections_matches_parse(self, tmp_path):
+        """Test: iter_sections yield cùng sections với parse"""
+        path = make_pdf(tmp_path / "a.pdf")
+        parser = PDFParser()
+        assert list(parser.iter_sections(path)) == parser.parse(path).sections
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test: --jobs 2 cho output giống hệt serial (kể cả qua ranh giới khoảng trang)"""
+        path = make_pdf(tmp_path / "a.pdf", chapters=20, lines=5)
+        serial = PDFParser().parse(path)
+        parallel = PDFParser(jobs=2).parse(path)
+        assert len(serial.sections) == 20
+        assert parallel.sections == serial.sections
+    
+    def test_adaptive_headings(self, tmp_path):
+        """Test: heading 18pt đậm → H1 theo phân bố cỡ chữ của document"""
+        doc = PDFParser().parse(make_pdf(tmp_path / "a.pdf"))
+        assert [s.title for s in doc.sections] == ["Chapter 1", "Chapter 2", "Chapter 3"]
+        assert all(b.type == BlockType.PARAGRAPH for b in doc.sections[0].blocks)
+    
+    def test_fast_fidelity_uses_outline(self, tmp_path):
+        """Test: fidelity fast lấy headings từ outline, text theo block"""
+        doc = PDFParser(fidelity="fast").parse(make_pdf(tmp_path / "a.pdf"))
+        assert [s.title for s in doc.sections] == ["Chapter 1", "Chapter 2", "Chapter 3"]
+        assert all(b.type == BlockType.PARAGRAPH for s in doc.sections for b in s.blocks)
+        assert "Line 0 of chapter 1" in doc.sections[0].to_markdown()
+    
+    def test_page_metadata(self, tmp_path):
+        """Test: section mang số trang nguồn, block chỉ có metadata khi sang trang mới"""
+        from function1.processors.chunk_writer import page_range
+        path = make_pdf(tmp_path / "a.pdf")
+        for fidelity in ("full", "fast"):
+            doc = PDFParser(fidelity=fidelity).parse(path)
+            for page, section in enumerate(doc.sections):
+                assert section.metadata["page"] == page
+                assert not any(block._metadata for block in section.blocks)
+                assert page_range(section) == (page + 1, page + 1)
+    
+    def test_page_range_across_pages(self, tmp_path):
+        """Test: chương nhiều trang, tách theo max_chars: khoảng trang mỗi chunk đúng"""
+        from function1.processors.chunk_writer import page_range
+        from function1.processors.splitter import Splitter
+        doc = fitz.open()
+        for p in range(1, 4):
+            page = doc.new_page()
+            if p == 1:
+                page.insert_text((72, 72), "Chapter 1", fontsize=18, fontname="hebo")
+            for i in range(8):
+                page.insert_text((72, 110 + 40 * i), f"Page {p} paragraph {i}.", fontsize=11)
+        doc.save(str(tmp_path / "a.pdf"))
+        doc.close()
+        
+        section, = PDFParser().parse(str(tmp_path / "a.pdf")).sections
+        assert [b.metadata["page"] for b in section.blocks if b._metadata] == [1, 2]
+        assert page_range(section) == (1, 3)
+        
+        chunks = list(Splitter(max_chars=120).iter_split([section]))
+        assert len(chunks) > 3
+        for chunk in chunks:
+            pages = [int(m) for m in re.findall(r"Page (\d)", chunk.to_markdown())]
+            assert page_range(chunk) == (min(pages), max(pages))
+    
+    def test_fast_fidelity_without_outline(self, tmp_path):
+        """Test: không có outline → không có heading"""
+        doc = PDFParser(fidelity="fast").parse(make_pdf(tmp_path / "a.pdf", toc=False))
+        assert [s.title for s in doc.sections] == ["Document"]
+        assert "Chapter 2" in doc.sections[0].to_markdown()
+    
+    def test_bounded_memory_matches_normal(self, tmp_path, monkeypatch):
+        """Test: memory="bounded" (mở lại PDF, pass 1 ra file tạm) cho cùng output"""
+        from benchmarks.synthetic import make_image_pdf, make_text_pdf
+        from function1.parsers import pdf_parser
+        
+        text = make_text_pdf(str(tmp_path / "t.pdf"), pages=12, pages_per_chapter=4,
+                             running_headers=True, tables_every=5)
+        images = make_image_pdf(str(tmp_path / "i.pdf"), pages=12, figures_every=5)
+        for path in (text, images):
+            normal = PDFParser().parse(path)
+            bounded = PDFParser(memory="bounded", spill=True).parse(path)
+            assert list(bounded.sections) == normal.sections
+        
+        # Nhiều khoảng trang: mỗi khoảng mở lại PDF
+        monkeypatch.setattr(pdf_parser, "REOPEN_PAGES", 5)
+        parser = PDFParser(memory="bounded")
+        assert parser.parse(text).sections == PDFParser().parse(text).sections
+        assert parser.stripped["lines"] == 24
+    
+    def test_parse_page_spec(self):
+        """Test: chuỗi --pages"""
+        assert parse_page_spec("1-3,5, 8-", 10) == [1, 2, 3, 5, 8, 9, 10]
+        assert parse_page_spec("2,2,40", 5) == [2]
+        with pytest.raises(ValueError):
+            parse_page_spec("5-2", 10)
+    
+    def test_select_pages(self, tmp_path):
+        """Test: pages=... chỉ parse các trang được chọn"""
+        path = make_pdf(tmp_path / "a.pdf", chapters=5)
+        full = PDFParser().parse(path)
+        doc = PDFParser().parse(path, pages="2-3")
+        assert [s.title for s in doc.sections] == ["Chapter 2", "Chapter 3"]
+        assert doc.sections == full.sections[1:3]
+    
+    def test_select_sections_by_outline(self, tmp_path):
+        """Test: sections=[...] dùng outline để chỉ parse trang của chương đó"""
+        path = make_pdf(tmp_path / "a.pdf", chapters=20, lines=5)
+        doc = PDFParser(sections=["chapter 2"]).parse(path)
+        assert [s.title for s in doc.sections] == ["Chapter 2"]
+        
+        parallel = PDFParser(jobs=2).parse(path, sections=["Chapter 1", "Chapter 12"])
+        assert [s.title for s in parallel.sections] == ["Chapter 1", "Chapter 12"]
+    
+    def test_select_sections_without_outline(self, tmp_path):
+        """Test: không có outline hoặc không tìm thấy chương → ValueError"""
+        with pytest.raises(ValueError):
+            PDFParser().parse(make_pdf(tmp_path / "a.pdf", toc=False), sections=["Chapter 1"])
+        with pytest.raises(ValueError):
+            PDFParser().parse(make_pdf(tmp_path / "b.pdf"), sections=["Chapter 9"])
+    
+    def test_two_column_reading_order(self, tmp_path):
+        """Test: PDF 2 cột được đọc hết cột trái rồi tới cột phải"""
+        from benchmarks.synthetic import make_two_column_pdf
+        path = make_two_column_pdf(str(tmp_path / "a.pdf"), pages=2, paragraphs_per_column=3)
+        
+        markdown = PDFParser().parse(path).to_markdown()
+        markers = re.findall(r"\[(\d)\.(\d)\.(\d)\]", markdown)
+        assert markers == sorted(markers)
+        assert len(markers) == 12
+        
+        raw = PDFParser(columns=False).parse(path).to_markdown()
+        assert re.findall(r"\[(\d)\.(\d)\.(\d)\]", raw) != markers
+    
+    def test_tables(self, tmp_path):
+        """Test: bảng kẻ ô → TABLE block, text trong bảng không lặp lại thành paragraph"""
+        from benchmarks.synthetic import make_text_pdf
+        path = make_text_pdf(str(tmp_path / "a.pdf"), pages=4, paragraphs_per_page=2,
+                             tables_every=2)
+        
+        doc = PDFParser().parse(path)
+        blocks = [b for s in doc.sections for b in s.blocks]
+        tables = [b for b in blocks if b.type == BlockType.TABLE]
+        assert len(tables) == 2
+        assert tables[0].metadata["page"] == 1
+        assert tables[0].rows[0].is_header
+        assert [c.content[0].text for c in tables[0].rows[0].cells] == [
+            "Cot 1", "Cot 2", "Cot 3", "Cot 4"
+        ]
+        assert len(tables[0].rows) == 5
+        # Text của bảng chỉ xuất hiện trong bảng GFM, không lặp thành paragraph
+        markdown = doc.to_markdown()
+        assert markdown.count("Cot 1") == 2
+        assert "| Cot 1 | Cot 2 | Cot 3 | Cot 4 |\n| --- | --- | --- | --- |" in markdown
+        
+        plain = PDFParser(tables=False).parse(path)
+        assert not any(b.type == BlockType.TABLE for s in plain.sections for b in s.blocks)
+        assert "Cot 1" in plain.to_markdown()
+    
+    def test_merged_table_cells(self):
+        """Test: ô gộp (None) lặp lại text như DOCX, mọi hàng đủ số cột"""
+        block = _table_block((("Nhóm", None, "Ghi chú"), ("a", "b", "c")), 0, (0, 0, 1, 1))
+        assert [[c.content[0].text for c in row.cells] for row in block.rows] == [
+            ["Nhóm", "Nhóm", "Ghi chú"], ["a", "b", "c"]
+        ]
+        section = Section(title="Bảng", level=1, blocks=[block])
+        assert "| Nhóm | Nhóm | Ghi chú |\n| --- | --- | --- |\n| a | b | c |" in \
+            section.to_markdown()
+    
+    def test_ruling_precheck(self):
+        """Test: pre-check chỉ nhận trang có cả đường kẻ ngang và dọc"""
+        def vector(bbox):
+            return {"type": 3, "bbox": bbox}
+        
+        grid = [vector((72, y, 400, y + 1)) for y in (100, 120, 140)]
+        grid += [vector((x, 100, x + 1, 140)) for x in (72, 400)]
+        assert ruling_bbox(grid) == (72, 100, 401, 141)
+        
+        underlines = [vector((72, y, 300, y + 1)) for y in range(100, 400, 20)]
+        assert ruling_bbox(underlines) is None
+        assert ruling_bbox([]) is None
+    
+    def test_missing_file(self):
+        """Test: file không tồn tại"""
+        with pytest.raises(FileNotFoundError):
+            list(PDFParser().iter_sections("missing.pdf"))
+
+
+class TestOutline:
+    """Test scan_outline"""
+    
+    def test_pdf_outline(self, tmp_path):
+        """Test: PDF outline từ bookmarks"""
+        outline = scan_outline(make_pdf(tmp_path / "a.pdf"))
+        assert outline["type"] == "pdf"
+        assert outline["pages"] == 3
+        assert [(h["title"], h["page"]) for h in outline["headings"]] == [
+            ("Chapter 1", 1), ("Chapter 2", 2), ("Chapter 3", 3)
+        ]
+    
+    def test_docx_outline_matches_parser(self, tmp_path):
+        """Test: heading tree của DOCX khớp sections của DOCXParser"""
+        path = make_docx(tmp_path / "a.docx")
+        outline = scan_outline(path)
+        doc = DOCXParser().parse(path)
+        
+        assert outline["title"] == doc.title
+        assert [h["title"] for h in outline["headings"]] == [s.title for s in doc.sections]
+        assert outline["headings"][0]["children"][0]["title"] == "Mục 1.1"
+        assert outline["headings"][0]["children"][0]["level"] == 2
+    
+    def test_docx_outline_skips_table_headings(self, tmp_path):
+        """Test: paragraph heading trong ô bảng không thành mục outline"""
+        document = docx.Document()
+        document.add_heading("Chương 1", level=1)
+        table = document.add_table(rows=1, cols=1)
+        table.cell(0, 0).paragraphs[0].style = document.styles["Heading 1"]
+        table.cell(0, 0).paragraphs[0].text = "Tiêu đề trong bảng"
+        document.add_heading("Chương 2", level=1)
+        path = str(tmp_path / "a.docx")
+        document.save(path)
+        
+        outline = scan_outline(path)
+        assert [h["title"] for h in outline["headings"]] == ["Chương 1", "Chương 2"]
+        assert [s.title for s in DOCXParser().parse(path).sections] == ["Chương 1", "Chương 2"]
+    
+    def test_unsupported(self, tmp_path):
+        """Test: loại file không hỗ trợ"""
+        with pytest.raises(ValueError):
+            scan_outline(str(tmp_path / "a.txt"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
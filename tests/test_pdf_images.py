@@ -0,0 +1,112 @@
+"""
+PDF Image Tests
+================
+Test cases for deduplicated PDF image extraction
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+fitz = pytest.importorskip("fitz")
+
+from benchmarks.synthetic import make_image_pdf
+from function1.parsers.ir import BlockType
+from function1.parsers.pdf_images import (
+    MANIFEST_NAME, PILLOW_AVAILABLE, extract_images, image_for, load_manifest
+)
+from function1.parsers.pdf_parser import PDFParser
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    # 3 phần ghép lại: logo có 3 xref cùng nội dung, hình ở trang 1, 6, 11
+    return make_image_pdf(str(tmp_path / "images.pdf"), pages=12, parts=3, figures_every=5)
+
+
+class TestExtractImages:
+    """Test extract_images / images.json"""
+    
+    def test_deduplicated(self, pdf_path, tmp_path):
+        """Test: logo lặp lại trên mọi trang chỉ ghi 1 file"""
+        out = str(tmp_path / "images")
+        with fitz.open(pdf_path) as doc:
+            manifest = extract_images(doc, out)
+        
+        assert len(manifest["images"]) == 4
+        assert sorted(os.listdir(out)) == sorted(list(manifest["images"]) + [MANIFEST_NAME])
+        
+        logo = manifest["pages"]["2"][0]["file"]
+        info = manifest["images"][logo]
+        assert len(info["xrefs"]) == 3
+        assert info["pages"] == list(range(1, 13))
+        assert [len(manifest["pages"][str(p)]) for p in (1, 2, 6)] == [2, 1, 2]
+        assert load_manifest(out) == manifest
+    
+    def test_rerun_keeps_files(self, pdf_path, tmp_path):
+        """Test: chạy lại không ghi lại file đã có"""
+        out = str(tmp_path / "images")
+        with fitz.open(pdf_path) as doc:
+            first = extract_images(doc, out)
+            mtimes = {name: os.stat(os.path.join(out, name)).st_mtime_ns
+                      for name in first["images"]}
+            second = extract_images(doc, out)
+        
+        assert second == first
+        assert all(os.stat(os.path.join(out, name)).st_mtime_ns == mtime
+                   for name, mtime in mtimes.items())
+    
+    def test_image_for(self, pdf_path, tmp_path):
+        """Test: tìm image theo trang (0-based) và bbox gần nhất"""
+        with fitz.open(pdf_path) as doc:
+            manifest = extract_images(doc, str(tmp_path / "images"), page_numbers=[0])
+        
+        logo, figure = (entry["file"] for entry in manifest["pages"]["1"])
+        assert image_for(manifest, 0, (72, 140, 372, 340)) == figure
+        assert image_for(manifest, 0, (72.1, 24, 162, 54)) == logo
+        assert image_for(manifest, 1, (72, 24, 162, 54)) is None
+    
+    @pytest.mark.skipif(PILLOW_AVAILABLE, reason="Pillow installed")
+    def test_max_dpi_needs_pillow(self, pdf_path, tmp_path):
+        """Test: max_dpi báo lỗi rõ ràng khi thiếu Pillow"""
+        with fitz.open(pdf_path) as doc, pytest.raises(ImportError):
+            extract_images(doc, str(tmp_path / "images"), max_dpi=150)
+    
+    @pytest.mark.skipif(not PILLOW_AVAILABLE, reason="Pillow not installed")
+    def test_max_dpi(self, pdf_path, tmp_path):
+        """Test: hình 1200px hiển thị rộng 300pt → 625px ở 150 DPI"""
+        with fitz.open(pdf_path) as doc:
+            manifest = extract_images(doc, str(tmp_path / "images"), max_dpi=150)
+        
+        figure = manifest["pages"]["1"][1]["file"]
+        assert manifest["images"][figure]["width"] == 625
+
+
+class TestImagePaths:
+    """Test PDFParser(images_dir=...) gán Block.image_path"""
+    
+    def test_image_path(self, pdf_path, tmp_path):
+        """Test: IMAGE blocks trỏ tới file đã extract, logo dùng chung 1 file"""
+        out = str(tmp_path / "images")
+        document = PDFParser(images_dir=out).parse(pdf_path)
+        
+        images = [block for section in document.sections for block in section.blocks
+                  if block.type == BlockType.IMAGE]
+        assert len(images) == 15
+        assert all(block.image_path and os.path.exists(block.image_path) for block in images)
+        assert len({block.image_path for block in images}) == 4
+        assert f"]({images[0].image_path})" in document.to_markdown()
+    
+    def test_default_no_images(self, pdf_path):
+        """Test: mặc định không extract, image_path để trống"""
+        document = PDFParser().parse(pdf_path)
+        images = [block for section in document.sections for block in section.blocks
+                  if block.type == BlockType.IMAGE]
+        assert images and all(block.image_path is None for block in images)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
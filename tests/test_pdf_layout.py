@@ -0,0 +1,119 @@
+"""
+PDF Layout Tests
+=================
+Test cases for PDF line geometry helpers
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.pdf_layout import reflow_lines, column_order, find_gutters
+
+
+def line(y, text, x0=72.0, x1=520.0, size=12.0, bold=False):
+    """Dòng giả lập cao 14pt tại toạ độ y"""
+    return (x0, y, x1, y + 14, size, bold, text.strip(), ((text, 0),))
+
+
+class TestReflow:
+    """Test reflow_lines"""
+    
+    def test_merge_paragraph(self):
+        """Test: các dòng liền nhau gộp thành 1 đoạn"""
+        result = reflow_lines([
+            line(100, "Dòng thứ nhất của đoạn"),
+            line(116, "dòng thứ hai", x1=300),
+        ])
+        assert len(result) == 1
+        assert result[0][6] == "Dòng thứ nhất của đoạn dòng thứ hai"
+        assert "".join(t for t, _ in result[0][7]) == result[0][6]
+    
+    def test_hyphen_repair(self):
+        """Test: sửa ngắt từ bằng gạch nối cuối dòng"""
+        result = reflow_lines([
+            line(100, "ứng dụng công nghệ thông-"),
+            line(116, "tin hiện đại", x1=200),
+        ])
+        assert result[0][6] == "ứng dụng công nghệ thôngtin hiện đại"
+    
+    def test_hyphen_repair_trailing_space_span(self):
+        """Test: sửa ngắt từ khi dòng kết thúc bằng span chỉ có khoảng trắng"""
+        first = line(100, "công nghệ thông-")
+        first = first[:7] + ((("công nghệ thông-", 0), (" ", 0)),)
+        result = reflow_lines([first, line(116, "tin hiện đại", x1=200)])
+        assert result[0][6] == "công nghệ thôngtin hiện đại"
+        assert "".join(t for t, _ in result[0][7]) == result[0][6]
+    
+    def test_keep_real_hyphen_before_uppercase(self):
+        """Test: giữ gạch nối khi dòng sau viết hoa"""
+        result = reflow_lines([
+            line(100, "Hà Nội -"),
+            line(116, "Việt Nam"),
+        ])
+        assert len(result) == 1
+        assert result[0][6] == "Hà Nội - Việt Nam"
+    
+    def test_paragraph_breaks(self):
+        """Test: tách đoạn khi lùi đầu dòng, dòng ngắn, đổi font, bullet, khoảng cách lớn"""
+        result = reflow_lines([
+            line(100, "Đoạn một"),
+            line(116, "kết thúc ở đây.", x1=200),
+            line(132, "Đoạn hai lùi đầu dòng", x0=100),
+            line(148, "Tiêu đề đậm", bold=True),
+            line(164, "- một bullet"),
+            line(220, "Đoạn cách xa"),
+        ])
+        assert [r[6] for r in result] == [
+            "Đoạn một kết thúc ở đây.",
+            "Đoạn hai lùi đầu dòng",
+            "Tiêu đề đậm",
+            "- một bullet",
+            "Đoạn cách xa",
+        ]
+
+
+
+class TestColumnOrder:
+    """Test column_order"""
+    
+    def test_single_column_keeps_order(self):
+        """Test: trang 1 cột (kể cả heading + số trang hẹp) giữ nguyên thứ tự"""
+        bboxes = [
+            (72, 60, 200, 80),      # heading
+            (72, 90, 520, 300),     # đoạn
+            (72, 310, 520, 500),
+            (280, 760, 320, 772),   # số trang
+        ]
+        assert find_gutters(bboxes) == []
+        assert column_order(bboxes) is None
+    
+    def test_two_columns(self):
+        """Test: cột trái đọc hết rồi mới tới cột phải"""
+        bboxes = [
+            (72, 100, 290, 300),    # trái 1
+            (310, 100, 520, 300),   # phải 1
+            (72, 310, 290, 500),    # trái 2
+            (310, 310, 520, 500),   # phải 2
+        ]
+        assert len(find_gutters(bboxes)) == 1
+        assert column_order(bboxes) == [0, 2, 1, 3]
+    
+    def test_spanning_blocks(self):
+        """Test: block trải cả trang chia vùng, mỗi vùng đọc theo cột"""
+        bboxes = [
+            (310, 100, 520, 300),   # phải, vùng 1
+            (72, 60, 520, 90),      # tiêu đề
+            (72, 100, 290, 300),    # trái, vùng 1
+            (72, 320, 520, 360),    # hình rộng
+            (310, 370, 520, 600),   # phải, vùng 2
+            (72, 370, 290, 600),    # trái, vùng 2
+        ]
+        assert column_order(bboxes) == [1, 2, 0, 3, 5, 4]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,206 @@
+"""
+Splitter Tests
+===============
+Test cases for Splitter (chia chunk theo heading và theo max_chars) và tách câu
+"""
+
+import pytest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from function1.parsers.ir import Block, BlockType, Run, ListItem, TableRow, TableCell, Section, Document
+from function1.processors.sentences import split_sentences
+from function1.processors.splitter import Splitter
+
+
+def paragraph(*runs):
+    return Block(type=BlockType.PARAGRAPH, runs=list(runs))
+
+
+def heading(text, level=2):
+    return Block(type=BlockType.HEADING, level=level, runs=[Run(text)])
+
+
+def plain(section):
+    """Text của section không tính markup (để so sánh nội dung)"""
+    parts = []
+    for block in section.blocks:
+        if block.type == BlockType.TABLE:
+            parts.extend(r.text for row in block.rows for c in row.cells for r in c.content)
+        elif block.type == BlockType.LIST:
+            parts.extend(r.text for item in block.items for r in item.content)
+        else:
+            parts.extend(r.text for r in block.runs)
+    return "".join(parts)
+
+
+class TestSentences:
+    """Test split_sentences"""
+    
+    def test_vietnamese_sentences(self):
+        """Test: tách câu trước chữ hoa có dấu, chữ số, ngoặc mở"""
+        text = "Đề tài được chọn. Ứng dụng rất rộng! 3 chương được trình bày? “Kết luận” ở cuối."
+        assert split_sentences(text) == [
+            "Đề tài được chọn. ", "Ứng dụng rất rộng! ", "3 chương được trình bày? ",
+            "“Kết luận” ở cuối.",
+        ]
+    
+    def test_abbreviations_and_initials(self):
+        """Test: không tách sau viết tắt, chữ cái đầu tên, chữ thường"""
+        text = "TP. Hồ Chí Minh và PGS. TS. Nguyễn V. An, v.v. và e.g. tiếp. còn nữa. Hết"
+        assert split_sentences(text) == [
+            "TP. Hồ Chí Minh và PGS. TS. Nguyễn V. An, v.v. và e.g. tiếp. còn nữa. ", "Hết",
+        ]
+    
+    def test_roundtrip(self):
+        """Test: nối các câu lại đúng bằng text ban đầu"""
+        text = "  Câu một...  Câu hai.\nCâu ba (trích dẫn). "
+        assert "".join(split_sentences(text)) == text
+        assert split_sentences("") == []
+
+
+class TestSizeSplit:
+    """Test Splitter tách theo max_chars"""
+    
+    def test_small_section_unchanged(self):
+        """Test: section vừa max_chars giữ nguyên, max_chars=0 tắt giới hạn"""
+        section = Section(title="Chương 1", level=1, blocks=[paragraph(Run("Ngắn."))])
+        assert Splitter(max_chars=100).split(Document(sections=[section])) == [section]
+        
+        big = Section(title="Chương 2", level=1, blocks=[paragraph(Run("x" * 500))])
+        assert Splitter(max_chars=0).split(Document(sections=[big])) == [big]
+    
+    def test_honors_max_chars_and_keeps_text(self):
+        """Test: mọi chunk ≤ max_chars, nội dung và formatting giữ nguyên"""
+        sentence = "Luận văn trình bày phương pháp mới. "
+        runs = [Run(sentence * 3), Run("Phần này in đậm rất quan trọng. " * 4, bold=True),
+                Run(sentence * 20)]
+        section = Section(title="Chương 1", level=1, blocks=[
+            paragraph(Run("Mở đầu.")),
+            paragraph(*runs),
+            Block(type=BlockType.LIST, ordered=True,
+                  items=[ListItem(content=[Run(f"Mục {i} của danh sách")]) for i in range(30)]),
+            Block(type=BlockType.TABLE, rows=[
+                TableRow(cells=[TableCell(content=[Run(f"Ô {i}-{j}")]) for j in range(3)])
+                for i in range(40)
+            ]),
+        ])
+        original = plain(section)
+        header = section.blocks[3].rows[0]
+        
+        chunks = Splitter(max_chars=200).split(Document(sections=[section]))
+        assert len(chunks) > 5
+        assert all(len(chunk.to_markdown()) <= 200 for chunk in chunks)
+        assert [chunk.metadata["part"] for chunk in chunks] == list(range(1, len(chunks) + 1))
+        
+        # Hàng tiêu đề bảng lặp lại ở mỗi phần
+        tables = [b for c in chunks for b in c.blocks if b.type == BlockType.TABLE]
+        assert len(tables) > 1 and all(t.rows[0] is header for t in tables)
+        text = "".join(plain(chunk) for chunk in chunks)
+        repeated = "".join(r.text for c in header.cells for r in c.content)
+        assert text.replace(repeated, "") == original.replace(repeated, "")
+        
+        # Đoạn dài tách ở ranh giới câu, phần in đậm vẫn in đậm
+        pieces = [b for c in chunks for b in c.blocks
+                  if b.type == BlockType.PARAGRAPH and b.runs[0].text != "Mở đầu."]
+        assert all(p.runs[-1].text.endswith(". ") or p is pieces[-1] for p in pieces)
+        assert "**Phần này in đậm" in "".join(c.to_markdown() for c in chunks)
+    
+    def test_table_with_short_header(self):
+        """Test: header ít ô hơn bảng (ô gộp) được tính đủ width cột khi tách"""
+        section = Section(title="Bảng", level=1, blocks=[
+            Block(type=BlockType.TABLE, rows=[
+                TableRow(cells=[TableCell(content=[Run("Nhóm")])], is_header=True),
+                *[TableRow(cells=[TableCell(content=[Run(f"{i}-{j}")]) for j in range(6)])
+                  for i in range(30)],
+            ]),
+            Block(type=BlockType.TABLE, rows=[
+                TableRow(cells=[TableCell(content=[Run("Gộp")], col_span=4)], is_header=True),
+                *[TableRow(cells=[TableCell(content=[Run(f"{i}")]) for _ in range(4)])
+                  for i in range(30)],
+            ]),
+        ])
+        chunks = Splitter(max_chars=150).split(Document(sections=[section]))
+        assert len(chunks) > 2
+        assert all(len(chunk.to_markdown()) <= 150 for chunk in chunks)
+    
+    def test_long_sentence_and_word(self):
+        """Test: câu quá dài tách ở khoảng trắng, từ quá dài cắt cứng"""
+        section = Section(title="A", level=1, blocks=[
+            paragraph(Run("từ " * 100 + "y" * 150))
+        ])
+        chunks = Splitter(max_chars=60).split(Document(sections=[section]))
+        assert all(len(chunk.to_markdown()) <= 60 for chunk in chunks)
+        assert "".join(plain(chunk) for chunk in chunks) == plain(section)
+    
+    def test_breadcrumb(self):
+        """Test: mỗi phần mang breadcrumb của heading cha tại điểm tách"""
+        filler = [paragraph(Run("Nội dung của mục con. " * 3)) for _ in range(3)]
+        section = Section(title="Chương 2", level=1, blocks=[
+            heading("Mục 2.1"), *filler,
+            heading("Mục 2.1.1", level=3), *filler,
+            heading("Mục 2.2"), *filler,
+        ])
+        chunks = Splitter(split_level=1, max_chars=160).split(Document(sections=[section]))
+        crumbs = [chunk.metadata["breadcrumb"] for chunk in chunks]
+        
+        assert crumbs[0] == ["Chương 2"]
+        assert ["Chương 2", "Mục 2.1", "Mục 2.1.1"] in crumbs
+        assert crumbs[-1] == ["Chương 2", "Mục 2.2"]
+        assert chunks[-1].title == "Chương 2 > Mục 2.2"
+    
+    def test_heading_split_then_size(self):
+        """Test: split_level=2 rồi tách theo kích thước, breadcrumb bắt đầu từ chương"""
+        section = Section(title="Chương 3", level=1, blocks=[
+            heading("Mục 3.1"), *[paragraph(Run("Một câu khá dài ở đây. " * 3))] * 4,
+        ])
+        chunks = Splitter(split_level=2, max_chars=120).split(Document(sections=[section]))
+        assert len(chunks) > 1
+        assert all(c.metadata["breadcrumb"] == ["Chương 3", "Mục 3.1"] for c in chunks)
+        assert all(c.title == "Mục 3.1" for c in chunks)
+
+
+
+class TestPacking:
+    """Test Splitter gom chunk theo pack_target"""
+    
+    def chapters(self, sizes):
+        return Document(sections=[
+            Section(title=f"Chương {i}", level=1, blocks=[paragraph(Run("x" * size))])
+            for i, size in enumerate(sizes, 1)
+        ])
+    
+    def test_packs_in_order_under_target(self):
+        """Test: gom chương liền nhau, giữ thứ tự và tiêu đề, không vượt target"""
+        document = self.chapters([15, 15, 15, 90, 10, 10])
+        splitter = Splitter(max_chars=0, pack_target=100)
+        chunks = splitter.split(document)
+        
+        assert [c.metadata.get("packed") for c in chunks] == [
+            ["Chương 1", "Chương 2", "Chương 3"], None, ["Chương 5", "Chương 6"]
+        ]
+        assert splitter.sizes == [len(c.to_markdown()) for c in chunks]
+        assert splitter.sizes[0] <= 100 and splitter.sizes[2] <= 100
+        markdown = chunks[0].to_markdown()
+        assert markdown.startswith("# Chương 1\n") and "\n## Chương 3\n" in markdown
+        assert markdown.count("\n# ") == 0
+        
+        stats = splitter.size_stats()
+        assert (stats["chunks"], stats["min"], stats["max"]) == (3, 48, 103)
+    
+    def test_tokens_and_max_chars(self):
+        """Test: pack_unit=tokens, max_chars vẫn là giới hạn cứng"""
+        document = self.chapters([30] * 10)
+        chunks = Splitter(max_chars=100, pack_target=1000, pack_unit="tokens").split(document)
+        assert all(len(c.to_markdown()) <= 100 for c in chunks)
+        assert len(chunks) == 5
+        
+        with pytest.raises(ValueError):
+            Splitter(pack_unit="words")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])